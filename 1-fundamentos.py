@@ -1,8 +1,7 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from estadistica.datos import obtener
+from estadistica.figuras import figura_a_bytes
+from estadistica.importaciones import importar
 
 # Configuración inicial
 st.set_page_config(page_title="Conceptos Básicos de Estadística", page_icon="📈", layout="centered")
@@ -56,6 +55,169 @@ st.markdown(
 )
 
 
+# --- Gráficos de las preguntas ---
+def dibujar_grafico(tipo_grafico):
+    """Dibuja con matplotlib el gráfico explicativo de una pregunta y devuelve la figura."""
+    # matplotlib solo se carga cuando hay un gráfico que mostrar
+    plt = importar('matplotlib.pyplot')
+    
+    if tipo_grafico == "poblacion_muestra":
+        # Visualización mejorada: círculo grande con círculo pequeño extraído
+        fig, ax = plt.subplots(figsize=(10, 8))
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        ax.axis('off')
+        
+        # Círculo grande (población)
+        circle_poblacion = plt.Circle((3.5, 5), 2.5, color='#3498db', alpha=0.3, linewidth=3, edgecolor='#2980b9')
+        ax.add_patch(circle_poblacion)
+        ax.text(3.5, 5, 'POBLACIÓN\n(Todos los elementos\nde interés)', 
+               ha='center', va='center', fontsize=13, fontweight='bold', color='#2c3e50')
+        
+        # Círculo pequeño (muestra) - dentro del grande
+        circle_muestra_dentro = plt.Circle((4.5, 6), 0.8, color='#e74c3c', alpha=0.5, 
+                                           linewidth=2, edgecolor='#c0392b')
+        ax.add_patch(circle_muestra_dentro)
+        
+        # Flecha indicando extracción
+        ax.annotate('', xy=(7.5, 6), xytext=(5.3, 6),
+                   arrowprops=dict(arrowstyle='->', lw=3, color='#e74c3c'))
+        
+        # Círculo pequeño (muestra) - extraído
+        circle_muestra = plt.Circle((8.2, 6), 0.8, color='#e74c3c', alpha=0.7, 
+                                   linewidth=3, edgecolor='#c0392b')
+        ax.add_patch(circle_muestra)
+        ax.text(8.2, 6, 'MUESTRA\n(Subconjunto\nrepresentativo)', 
+               ha='center', va='center', fontsize=8, fontweight='bold', color='white')
+        
+        # Etiquetas
+        ax.text(3.5, 1.5, 'N = Tamaño de la población', ha='center', fontsize=11, 
+               style='italic', color='#2980b9')
+        ax.text(8.2, 4.5, 'n = Tamaño de la muestra', ha='center', fontsize=11, 
+               style='italic', color='#c0392b')
+        
+        ax.set_title('Relación entre Población y Muestra', fontsize=15, fontweight='bold', pad=20)
+
+    elif tipo_grafico == "parametro_estadistico_ingresos":
+        # Comparación visual con datos de ingresos
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+        
+        # Población completa - Ingresos
+        poblacion_datos = obtener('ingresos_hogares', semilla=42, tamano=10000)  # Distribución de ingresos más realista
+        media_poblacion = poblacion_datos.mean()
+        
+        ax1.hist(poblacion_datos, bins=40, color='#3498db', alpha=0.7, edgecolor='black')
+        ax1.axvline(media_poblacion, color='red', linestyle='--', linewidth=3, 
+                   label=f'μ (parámetro) = ${media_poblacion:,.0f}')
+        ax1.set_title('POBLACIÓN COMPLETA\n(Todos los hogares de Barranquilla)', fontweight='bold', fontsize=12)
+        ax1.set_xlabel('Ingreso mensual (pesos)', fontsize=10)
+        ax1.set_ylabel('Frecuencia (número de hogares)', fontsize=10)
+        ax1.legend(fontsize=10)
+        ax1.grid(alpha=0.3)
+        
+        # Muestra - Ingresos
+        muestra_datos = obtener('muestra_ingresos', semilla=42, tamano=500)
+        media_muestra = muestra_datos.mean()
+        
+        ax2.hist(muestra_datos, bins=25, color='#e74c3c', alpha=0.7, edgecolor='black')
+        ax2.axvline(media_muestra, color='darkred', linestyle='--', linewidth=3,
+                   label=f'x̄ (estadístico) = ${media_muestra:,.0f}')
+        ax2.set_title('MUESTRA\n(500 hogares encuestados)', fontweight='bold', fontsize=12)
+        ax2.set_xlabel('Ingreso mensual (pesos)', fontsize=10)
+        ax2.set_ylabel('Frecuencia (número de hogares)', fontsize=10)
+        ax2.legend(fontsize=10)
+        ax2.grid(alpha=0.3)
+        
+        plt.tight_layout()
+
+    elif tipo_grafico == "parametro_estadistico_presion":
+        # Comparación visual con datos de presión arterial
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+        
+        # Población completa - Presión arterial
+        # Presión arterial sistólica de pacientes hipertensos (140-180 mmHg típicamente)
+        poblacion_datos = obtener('presion_arterial', semilla=42, tamano=5000)
+        media_poblacion = poblacion_datos.mean()
+        
+        ax1.hist(poblacion_datos, bins=35, color='#3498db', alpha=0.7, edgecolor='black')
+        ax1.axvline(media_poblacion, color='red', linestyle='--', linewidth=3, 
+                   label=f'μ (parámetro) = {media_poblacion:.1f} mmHg')
+        ax1.set_title('POBLACIÓN COMPLETA\n(Todos los pacientes hipertensos en Colombia)', 
+                     fontweight='bold', fontsize=11)
+        ax1.set_xlabel('Presión arterial sistólica (mmHg)', fontsize=10)
+        ax1.set_ylabel('Frecuencia (número de pacientes)', fontsize=10)
+        ax1.legend(fontsize=10)
+        ax1.grid(alpha=0.3)
+        
+        # Muestra - Presión arterial
+        muestra_datos = obtener('muestra_presion', semilla=42, tamano=250)
+        media_muestra = muestra_datos.mean()
+        
+        ax2.hist(muestra_datos, bins=20, color='#e74c3c', alpha=0.7, edgecolor='black')
+        ax2.axvline(media_muestra, color='darkred', linestyle='--', linewidth=3,
+                   label=f'x̄ (estadístico) = {media_muestra:.1f} mmHg')
+        ax2.set_title('MUESTRA\n(250 pacientes del estudio)', fontweight='bold', fontsize=11)
+        ax2.set_xlabel('Presión arterial sistólica (mmHg)', fontsize=10)
+        ax2.set_ylabel('Frecuencia (número de pacientes)', fontsize=10)
+        ax2.legend(fontsize=10)
+        ax2.grid(alpha=0.3)
+        
+        plt.tight_layout()
+
+    elif tipo_grafico == "descriptiva_inferencial":
+        # Ilustración del proceso inferencial
+        fig = plt.figure(figsize=(10, 6))
+        ax = fig.add_subplot(111)
+        ax.axis('off')
+        
+        # Población
+        circle1 = plt.Circle((0.25, 0.5), 0.15, color='#3498db', alpha=0.3)
+        ax.add_patch(circle1)
+        ax.text(0.25, 0.5, 'POBLACIÓN\n(Desconocida)', 
+               ha='center', va='center', fontsize=11, fontweight='bold')
+        
+        # Flecha de muestreo
+        ax.annotate('', xy=(0.45, 0.5), xytext=(0.4, 0.5),
+                   arrowprops=dict(arrowstyle='->', lw=2, color='black'))
+        ax.text(0.425, 0.55, 'Muestreo', ha='center', fontsize=9)
+        
+        # Muestra
+        circle2 = plt.Circle((0.55, 0.5), 0.08, color='#e74c3c', alpha=0.5)
+        ax.add_patch(circle2)
+        ax.text(0.55, 0.5, 'Muestra', ha='center', va='center', 
+               fontsize=10, fontweight='bold')
+        
+        # Flecha de análisis
+        ax.annotate('', xy=(0.7, 0.5), xytext=(0.63, 0.5),
+                   arrowprops=dict(arrowstyle='->', lw=2, color='black'))
+        ax.text(0.665, 0.55, 'Análisis', ha='center', fontsize=9)
+        
+        # Resultados
+        rect = plt.Rectangle((0.7, 0.4), 0.2, 0.2, 
+                            fill=True, facecolor='#2ecc71', alpha=0.3, edgecolor='black')
+        ax.add_patch(rect)
+        ax.text(0.8, 0.5, 'Estadística\nDescriptiva', 
+               ha='center', va='center', fontsize=10, fontweight='bold')
+        
+        # Flecha de inferencia
+        ax.annotate('', xy=(0.25, 0.3), xytext=(0.75, 0.35),
+                   arrowprops=dict(arrowstyle='->', lw=3, color='#9b59b6', linestyle='dashed'))
+        ax.text(0.5, 0.25, 'INFERENCIA\n(Generalización)', 
+               ha='center', fontsize=11, fontweight='bold', color='#9b59b6')
+        
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_title('Estadística Descriptiva vs Inferencial', 
+                   fontsize=14, fontweight='bold', pad=20)
+
+    return fig
+
+@st.cache_data
+def grafico_png(tipo_grafico):
+    """PNG del gráfico de una pregunta: se dibuja una vez y se reutiliza en cada interacción."""
+    return figura_a_bytes(dibujar_grafico(tipo_grafico))
+
+
 # --- Función general de pregunta ---
 def pregunta(
     texto_pregunta, 
@@ -77,165 +239,9 @@ def pregunta(
 
             # Mostrar gráfico si corresponde
             if mostrar_grafico and tipo_grafico:
-                
-                if tipo_grafico == "poblacion_muestra":
-                    # Visualización mejorada: círculo grande con círculo pequeño extraído
-                    fig, ax = plt.subplots(figsize=(10, 8))
-                    ax.set_xlim(0, 10)
-                    ax.set_ylim(0, 10)
-                    ax.axis('off')
-                    
-                    # Círculo grande (población)
-                    circle_poblacion = plt.Circle((3.5, 5), 2.5, color='#3498db', alpha=0.3, linewidth=3, edgecolor='#2980b9')
-                    ax.add_patch(circle_poblacion)
-                    ax.text(3.5, 5, 'POBLACIÓN\n(Todos los elementos\nde interés)', 
-                           ha='center', va='center', fontsize=13, fontweight='bold', color='#2c3e50')
-                    
-                    # Círculo pequeño (muestra) - dentro del grande
-                    circle_muestra_dentro = plt.Circle((4.5, 6), 0.8, color='#e74c3c', alpha=0.5, 
-                                                       linewidth=2, edgecolor='#c0392b')
-                    ax.add_patch(circle_muestra_dentro)
-                    
-                    # Flecha indicando extracción
-                    ax.annotate('', xy=(7.5, 6), xytext=(5.3, 6),
-                               arrowprops=dict(arrowstyle='->', lw=3, color='#e74c3c'))
-                    
-                    # Círculo pequeño (muestra) - extraído
-                    circle_muestra = plt.Circle((8.2, 6), 0.8, color='#e74c3c', alpha=0.7, 
-                                               linewidth=3, edgecolor='#c0392b')
-                    ax.add_patch(circle_muestra)
-                    ax.text(8.2, 6, 'MUESTRA\n(Subconjunto\nrepresentativo)', 
-                           ha='center', va='center', fontsize=8, fontweight='bold', color='white')
-                    
-                    # Etiquetas
-                    ax.text(3.5, 1.5, 'N = Tamaño de la población', ha='center', fontsize=11, 
-                           style='italic', color='#2980b9')
-                    ax.text(8.2, 4.5, 'n = Tamaño de la muestra', ha='center', fontsize=11, 
-                           style='italic', color='#c0392b')
-                    
-                    ax.set_title('Relación entre Población y Muestra', fontsize=15, fontweight='bold', pad=20)
-                    st.pyplot(fig)
-
-                elif tipo_grafico == "parametro_estadistico_ingresos":
-                    st.markdown("📊 **Este gráfico se llama HISTOGRAMA** y muestra la distribución de una variable numérica.")
-                    
-                    # Comparación visual con datos de ingresos
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-                    
-                    # Población completa - Ingresos
-                    np.random.seed(42)
-                    poblacion_datos = np.random.gamma(3, 950000, 10000)  # Distribución de ingresos más realista
-                    media_poblacion = poblacion_datos.mean()
-                    
-                    ax1.hist(poblacion_datos, bins=40, color='#3498db', alpha=0.7, edgecolor='black')
-                    ax1.axvline(media_poblacion, color='red', linestyle='--', linewidth=3, 
-                               label=f'μ (parámetro) = ${media_poblacion:,.0f}')
-                    ax1.set_title('POBLACIÓN COMPLETA\n(Todos los hogares de Barranquilla)', fontweight='bold', fontsize=12)
-                    ax1.set_xlabel('Ingreso mensual (pesos)', fontsize=10)
-                    ax1.set_ylabel('Frecuencia (número de hogares)', fontsize=10)
-                    ax1.legend(fontsize=10)
-                    ax1.grid(alpha=0.3)
-                    
-                    # Muestra - Ingresos
-                    muestra_datos = np.random.choice(poblacion_datos, 500)
-                    media_muestra = muestra_datos.mean()
-                    
-                    ax2.hist(muestra_datos, bins=25, color='#e74c3c', alpha=0.7, edgecolor='black')
-                    ax2.axvline(media_muestra, color='darkred', linestyle='--', linewidth=3,
-                               label=f'x̄ (estadístico) = ${media_muestra:,.0f}')
-                    ax2.set_title('MUESTRA\n(500 hogares encuestados)', fontweight='bold', fontsize=12)
-                    ax2.set_xlabel('Ingreso mensual (pesos)', fontsize=10)
-                    ax2.set_ylabel('Frecuencia (número de hogares)', fontsize=10)
-                    ax2.legend(fontsize=10)
-                    ax2.grid(alpha=0.3)
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig)
-
-                elif tipo_grafico == "parametro_estadistico_presion":
+                if tipo_grafico.startswith("parametro_estadistico"):
                     st.markdown("📊 **Este gráfico se llama HISTOGRAMA** y muestra la distribución de una variable numérica.")
-                    
-                    # Comparación visual con datos de presión arterial
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-                    
-                    # Población completa - Presión arterial
-                    np.random.seed(42)
-                    # Presión arterial sistólica de pacientes hipertensos (140-180 mmHg típicamente)
-                    poblacion_datos = np.random.normal(155, 15, 5000)
-                    media_poblacion = poblacion_datos.mean()
-                    
-                    ax1.hist(poblacion_datos, bins=35, color='#3498db', alpha=0.7, edgecolor='black')
-                    ax1.axvline(media_poblacion, color='red', linestyle='--', linewidth=3, 
-                               label=f'μ (parámetro) = {media_poblacion:.1f} mmHg')
-                    ax1.set_title('POBLACIÓN COMPLETA\n(Todos los pacientes hipertensos en Colombia)', 
-                                 fontweight='bold', fontsize=11)
-                    ax1.set_xlabel('Presión arterial sistólica (mmHg)', fontsize=10)
-                    ax1.set_ylabel('Frecuencia (número de pacientes)', fontsize=10)
-                    ax1.legend(fontsize=10)
-                    ax1.grid(alpha=0.3)
-                    
-                    # Muestra - Presión arterial
-                    muestra_datos = np.random.choice(poblacion_datos, 250)
-                    media_muestra = muestra_datos.mean()
-                    
-                    ax2.hist(muestra_datos, bins=20, color='#e74c3c', alpha=0.7, edgecolor='black')
-                    ax2.axvline(media_muestra, color='darkred', linestyle='--', linewidth=3,
-                               label=f'x̄ (estadístico) = {media_muestra:.1f} mmHg')
-                    ax2.set_title('MUESTRA\n(250 pacientes del estudio)', fontweight='bold', fontsize=11)
-                    ax2.set_xlabel('Presión arterial sistólica (mmHg)', fontsize=10)
-                    ax2.set_ylabel('Frecuencia (número de pacientes)', fontsize=10)
-                    ax2.legend(fontsize=10)
-                    ax2.grid(alpha=0.3)
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig)
-
-                elif tipo_grafico == "descriptiva_inferencial":
-                    # Ilustración del proceso inferencial
-                    fig = plt.figure(figsize=(10, 6))
-                    ax = fig.add_subplot(111)
-                    ax.axis('off')
-                    
-                    # Población
-                    circle1 = plt.Circle((0.25, 0.5), 0.15, color='#3498db', alpha=0.3)
-                    ax.add_patch(circle1)
-                    ax.text(0.25, 0.5, 'POBLACIÓN\n(Desconocida)', 
-                           ha='center', va='center', fontsize=11, fontweight='bold')
-                    
-                    # Flecha de muestreo
-                    ax.annotate('', xy=(0.45, 0.5), xytext=(0.4, 0.5),
-                               arrowprops=dict(arrowstyle='->', lw=2, color='black'))
-                    ax.text(0.425, 0.55, 'Muestreo', ha='center', fontsize=9)
-                    
-                    # Muestra
-                    circle2 = plt.Circle((0.55, 0.5), 0.08, color='#e74c3c', alpha=0.5)
-                    ax.add_patch(circle2)
-                    ax.text(0.55, 0.5, 'Muestra', ha='center', va='center', 
-                           fontsize=10, fontweight='bold')
-                    
-                    # Flecha de análisis
-                    ax.annotate('', xy=(0.7, 0.5), xytext=(0.63, 0.5),
-                               arrowprops=dict(arrowstyle='->', lw=2, color='black'))
-                    ax.text(0.665, 0.55, 'Análisis', ha='center', fontsize=9)
-                    
-                    # Resultados
-                    rect = plt.Rectangle((0.7, 0.4), 0.2, 0.2, 
-                                        fill=True, facecolor='#2ecc71', alpha=0.3, edgecolor='black')
-                    ax.add_patch(rect)
-                    ax.text(0.8, 0.5, 'Estadística\nDescriptiva', 
-                           ha='center', va='center', fontsize=10, fontweight='bold')
-                    
-                    # Flecha de inferencia
-                    ax.annotate('', xy=(0.25, 0.3), xytext=(0.75, 0.35),
-                               arrowprops=dict(arrowstyle='->', lw=3, color='#9b59b6', linestyle='dashed'))
-                    ax.text(0.5, 0.25, 'INFERENCIA\n(Generalización)', 
-                           ha='center', fontsize=11, fontweight='bold', color='#9b59b6')
-                    
-                    ax.set_xlim(0, 1)
-                    ax.set_ylim(0, 1)
-                    ax.set_title('Estadística Descriptiva vs Inferencial', 
-                               fontsize=14, fontweight='bold', pad=20)
-                    st.pyplot(fig)
+                st.image(grafico_png(tipo_grafico), width="stretch")
 
         else:
             st.error(f"❌ Incorrecto. {explicacion_mal}")
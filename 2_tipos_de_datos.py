@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from estadistica.figuras import figura_a_bytes
+from estadistica.importaciones import importar
 
 # Configuración inicial
 st.set_page_config(page_title="Tipos de Datos Interactivos", page_icon="📊", layout="centered")
@@ -12,6 +13,77 @@ Este módulo interactivo te permitirá **reconocer los distintos tipos y escalas
 a través de ejemplos, retroalimentación y gráficos explicativos.
 """)
 
+# --- Gráficos de ejemplo por tipo de variable ---
+def dibujar_grafico(tipo_variable):
+    """Dibuja con matplotlib el gráfico de ejemplo de un tipo de variable y devuelve la figura."""
+    # Semilla fija: la imagen queda en caché y debe ser la misma para todos
+    rng = np.random.default_rng(0)
+    # matplotlib solo se carga al responder bien
+    plt = importar('matplotlib.pyplot')
+    fig, ax = plt.subplots()
+
+    if tipo_variable == "cualitativa":
+        datos = pd.Series(["A", "B", "C", "A", "B", "A"])
+        datos.value_counts().plot(kind="bar", color="skyblue", ax=ax)
+        ax.set_title("Gráfico de barras - Variable cualitativa")
+        ax.set_xlabel("Categorías")
+        ax.set_ylabel("Frecuencia")
+
+    elif tipo_variable == "cuantitativa":
+        datos = rng.integers(1, 100, 50)
+        ax.hist(datos, bins=10, color="salmon", edgecolor="black")
+        ax.set_title("Histograma - Variable cuantitativa")
+        ax.set_xlabel("Valores")
+        ax.set_ylabel("Frecuencia")
+
+    elif tipo_variable == "nominal":
+        datos = pd.Series(["Rojo", "Azul", "Verde", "Rojo", "Azul", "Rojo"])
+        datos.value_counts().plot(kind="pie", autopct="%1.0f%%", ax=ax)
+        ax.set_ylabel("")
+        ax.set_title("Gráfico de pastel - Variable nominal")
+
+    elif tipo_variable == "ordinal":
+        categorias = ["Bajo", "Medio", "Alto"]
+        datos = pd.Categorical(rng.choice(categorias, 30), categories=categorias, ordered=True)
+        pd.Series(datos).value_counts().reindex(categorias).plot(kind="bar", color="gold", ax=ax)
+        ax.set_title("Gráfico de barras ordenadas - Variable ordinal")
+
+    elif tipo_variable == "discreta":
+        datos = rng.poisson(3, 50)
+        pd.Series(datos).value_counts().sort_index().plot(kind="bar", color="lightgreen", ax=ax)
+        ax.set_title("Gráfico de barras - Variable discreta")
+        ax.set_xlabel("Valores enteros")
+        ax.set_ylabel("Frecuencia")
+
+    elif tipo_variable == "continua":
+        datos = rng.normal(50, 10, 100)
+        ax.boxplot(datos, vert=False)
+        ax.set_title("Boxplot - Variable continua")
+        ax.set_xlabel("Valores")
+
+    elif tipo_variable == "intervalo":
+        datos = rng.normal(100, 15, 100)
+        ax.hist(datos, bins=10, color="lightblue", edgecolor="black")
+        ax.set_title("Histograma - Escala de intervalo")
+        ax.set_xlabel("Valores (no hay cero absoluto)")
+        ax.set_ylabel("Frecuencia")
+
+    elif tipo_variable == "razon":
+        x = rng.uniform(0, 100, 50)
+        y = x * 1.5 + rng.normal(0, 10, 50)
+        ax.scatter(x, y, color="purple")
+        ax.set_title("Gráfico de dispersión - Escala de razón")
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+
+    return fig
+
+@st.cache_data
+def grafico_png(tipo_variable):
+    """PNG del gráfico de ejemplo: se dibuja una vez y se reutiliza en cada interacción."""
+    return figura_a_bytes(dibujar_grafico(tipo_variable))
+
+
 # --- Función general de pregunta ---
 def pregunta(
     texto_pregunta, 
@@ -35,64 +107,8 @@ def pregunta(
                 "para representar sus valores y patrones de comportamiento:"
             )
 
-            # Mostrar gráfico
-            fig, ax = plt.subplots()
-
-            if tipo_variable == "cualitativa":
-                datos = pd.Series(["A", "B", "C", "A", "B", "A"])
-                datos.value_counts().plot(kind="bar", color="skyblue", ax=ax)
-                ax.set_title("Gráfico de barras - Variable cualitativa")
-                ax.set_xlabel("Categorías")
-                ax.set_ylabel("Frecuencia")
-
-            elif tipo_variable == "cuantitativa":
-                datos = np.random.randint(1, 100, 50)
-                ax.hist(datos, bins=10, color="salmon", edgecolor="black")
-                ax.set_title("Histograma - Variable cuantitativa")
-                ax.set_xlabel("Valores")
-                ax.set_ylabel("Frecuencia")
-
-            elif tipo_variable == "nominal":
-                datos = pd.Series(["Rojo", "Azul", "Verde", "Rojo", "Azul", "Rojo"])
-                datos.value_counts().plot(kind="pie", autopct="%1.0f%%", ax=ax)
-                ax.set_ylabel("")
-                ax.set_title("Gráfico de pastel - Variable nominal")
-
-            elif tipo_variable == "ordinal":
-                categorias = ["Bajo", "Medio", "Alto"]
-                datos = pd.Categorical(np.random.choice(categorias, 30), categories=categorias, ordered=True)
-                pd.Series(datos).value_counts().reindex(categorias).plot(kind="bar", color="gold", ax=ax)
-                ax.set_title("Gráfico de barras ordenadas - Variable ordinal")
-
-            elif tipo_variable == "discreta":
-                datos = np.random.poisson(3, 50)
-                pd.Series(datos).value_counts().sort_index().plot(kind="bar", color="lightgreen", ax=ax)
-                ax.set_title("Gráfico de barras - Variable discreta")
-                ax.set_xlabel("Valores enteros")
-                ax.set_ylabel("Frecuencia")
-
-            elif tipo_variable == "continua":
-                datos = np.random.normal(50, 10, 100)
-                ax.boxplot(datos, vert=False)
-                ax.set_title("Boxplot - Variable continua")
-                ax.set_xlabel("Valores")
-
-            elif tipo_variable == "intervalo":
-                datos = np.random.normal(100, 15, 100)
-                ax.hist(datos, bins=10, color="lightblue", edgecolor="black")
-                ax.set_title("Histograma - Escala de intervalo")
-                ax.set_xlabel("Valores (no hay cero absoluto)")
-                ax.set_ylabel("Frecuencia")
-
-            elif tipo_variable == "razon":
-                x = np.random.uniform(0, 100, 50)
-                y = x * 1.5 + np.random.normal(0, 10, 50)
-                ax.scatter(x, y, color="purple")
-                ax.set_title("Gráfico de dispersión - Escala de razón")
-                ax.set_xlabel("X")
-                ax.set_ylabel("Y")
-
-            st.pyplot(fig)
+            # Mostrar gráfico (se dibuja una sola vez por tipo de variable)
+            st.image(grafico_png(tipo_variable), width="stretch")
 
         else:
             st.error(f"❌ Incorrecto. {explicacion_mal}")
@@ -4,6 +4,11 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import random
+from estadistica import perfil
+from estadistica.datos import obtener, solo_lectura
+from estadistica.frecuencias import generar_tabla_frecuencia
+
+generar_tabla_frecuencia = perfil.medido(generar_tabla_frecuencia)
 
 # === CONFIGURACIÓN ===
 st.set_page_config(page_title="Tablas de Frecuencia", page_icon="📊", layout="wide")
@@ -12,9 +17,9 @@ st.set_page_config(page_title="Tablas de Frecuencia", page_icon="📊", layout="
 ORDEN_SATISFACCION = ['Muy Insatisfecho', 'Insatisfecho', 'Neutral', 'Satisfecho', 'Muy Satisfecho']
 COLORES_NOMINAL = ['Rojo', 'Azul', 'Verde', 'Amarillo']
 # Se añade el dataset 'Tiempo de Reacción (Continua)' para tener la referencia continua.
-DATA_CONTINUA = pd.Series(np.random.normal(loc=40, scale=8, size=200).round(1), name='Tiempo de Reacción (seg)')
+DATA_CONTINUA = pd.Series(obtener('tiempo_reaccion', semilla=40, tamano=200), name='Tiempo de Reacción (seg)')
 
-@st.cache_data
+@st.cache_resource
 def load_datasets():
     """Carga y genera datasets para diferentes tipos de variables."""
     datasets = {
@@ -35,37 +40,10 @@ def load_datasets():
             "tipo": "Continua", "orden": "ascendente", "descripcion": "Variable cuantitativa con muchos valores únicos. **No Agrupada** es inadecuada para el análisis."
         },
     }
+    for info in datasets.values():
+        info["data"] = pd.Series(solo_lectura(info["data"]), name=info["data"].name)
     return datasets
 
-def generar_tabla_frecuencia(data, order=None):
-    """Genera una DataFrame de tabla de frecuencia completa con orden de columnas corregido."""
-    if data is None or data.empty:
-        return pd.DataFrame()
-        
-    if isinstance(order, list):
-        categories = pd.Categorical(data, categories=order, ordered=True)
-        frecuencia_abs = categories.value_counts()
-    elif order == 'ascendente':
-        frecuencia_abs = data.value_counts().sort_index(ascending=True)
-    else:
-        frecuencia_abs = data.value_counts().sort_index()
-        
-    df = pd.DataFrame({'Frecuencia Absoluta': frecuencia_abs})
-    N = len(data)
-
-    # 1. Frecuencia Acumulada
-    df['Frecuencia Acumulada'] = df['Frecuencia Absoluta'].cumsum()
-    # 2. Frecuencia Relativa
-    df['Frecuencia Relativa'] = df['Frecuencia Absoluta'] / N
-    # 3. Frecuencia Relativa Acumulada
-    df['Frecuencia Relativa Acumulada'] = df['Frecuencia Acumulada'] / N
-    # 4. Porcentaje
-    df['Porcentaje (%)'] = df['Frecuencia Relativa'] * 100
-    
-    df = df.reset_index()
-    df = df.rename(columns={df.columns[0]: 'Clase/Categoría'})
-    return df
-
 def generar_figura_pastel(data_dict, title, show_text=True):
     """Genera una figura de Plotly para el cuestionario (controlando si muestra el porcentaje)."""
     labels = list(data_dict.keys())
@@ -85,6 +63,25 @@ def generar_figura_pastel(data_dict, title, show_text=True):
     fig.update_traces(textinfo=text_info, textfont_size=14)
     return fig
 
+def generar_ejercicio(semilla):
+    """Datos del ejercicio de frecuencias (la misma semilla siempre da los mismos datos)."""
+    rng = np.random.default_rng(semilla)
+
+    # 70% Nominal/Ordinal, 30% Discreta
+    if rng.random() < 0.7:
+        tipo = rng.choice(['Letras (Nominal)', 'Niveles (Ordinal)'])
+    else:
+        tipo = 'Números (Discreta)'
+
+    N = int(rng.integers(25, 56))
+
+    if tipo == 'Letras (Nominal)':
+        return pd.Series(rng.choice(['A','B','C','D','E'], size=N), name='Calificaciones de Encuesta')
+    elif tipo == 'Niveles (Ordinal)':
+        return pd.Series(rng.choice(ORDEN_SATISFACCION, size=N, p=[0.1, 0.2, 0.3, 0.3, 0.1]), name='Valoración de Producto')
+    else: # Números (Discreta)
+        return pd.Series(rng.integers(0, 6, size=N), name='Veces Compradas')
+
 # === DATOS CUESTIONARIO Y CASOS REALES ===
 
 # Datos para Pregunta 5 (Gráfico) del Cuestionario
@@ -195,8 +192,9 @@ PREGUNTAS_CUESTIONARIO = [
 ]
 
 # === INICIALIZACIÓN ===
-if 'ejercicio_data' not in st.session_state:
-    st.session_state['ejercicio_data'] = None
+# Del ejercicio solo se guarda la semilla; los datos se regeneran en cada rerun
+if 'ejercicio_semilla' not in st.session_state:
+    st.session_state['ejercicio_semilla'] = None
 if 'form_counter' not in st.session_state:
     st.session_state['form_counter'] = 0
 if 'mostrar_solucion_ej' not in st.session_state:
@@ -222,6 +220,7 @@ with st.sidebar:
         "🎲 Generador de Ejercicios y Validación",
         "❓ Cuestionario"
     ], label_visibility="collapsed")
+    perfil.seccion(page)
 
 selected_data_info = datasets.get(selected_dataset_name, {"data": None, "orden": None, "tipo": None, "descripcion": ""})
 data = selected_data_info['data']
@@ -757,29 +756,13 @@ elif page == "🎲 Generador de Ejercicios y Validación":
     
     # Botón fuera del formulario
     if st.button("Generar Nuevo Ejercicio", key='gen_new_exercise'):
-        
-        # 70% Nominal/Ordinal, 30% Discreta
-        if random.random() < 0.7: 
-            tipo = random.choice(['Letras (Nominal)', 'Niveles (Ordinal)'])
-        else:
-            tipo = 'Números (Discreta)'
-            
-        N = random.randint(25, 55)
-        
-        if tipo == 'Letras (Nominal)':
-            new_data = pd.Series(np.random.choice(['A','B','C','D','E'], size=N), name='Calificaciones de Encuesta')
-        elif tipo == 'Niveles (Ordinal)':
-            new_data = pd.Series(np.random.choice(ORDEN_SATISFACCION, size=N, p=[0.1, 0.2, 0.3, 0.3, 0.1]), name='Valoración de Producto')
-        else: # Números (Discreta)
-            new_data = pd.Series(np.random.randint(0, 6, size=N), name='Veces Compradas')
-            
-        st.session_state['ejercicio_data'] = new_data
+        st.session_state['ejercicio_semilla'] = random.getrandbits(32)
         st.session_state['form_counter'] += 1
         st.session_state['mostrar_solucion_ej'] = False
         st.rerun()
         
-    if st.session_state['ejercicio_data'] is not None:
-        data_ej = st.session_state['ejercicio_data']
+    if st.session_state['ejercicio_semilla'] is not None:
+        data_ej = generar_ejercicio(st.session_state['ejercicio_semilla'])
         
         # Determinar el orden correcto para la tabla
         order_ej = ORDEN_SATISFACCION if data_ej.name == 'Valoración de Producto' else 'ascendente'
@@ -3,7 +3,17 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import math
+import os
 import plotly.graph_objects as go
+from estadistica import perfil
+from estadistica.datos import solo_lectura
+from estadistica.agrupadas import (
+    sturges_rule, calculate_amplitude, generar_tabla_agrupada, generar_tabla_agrupada_desde_archivo,
+    estilo_tabla_agrupada, columnas_archivo, leer_columna_por_bloques, resumen_por_bloques,
+    archivos_datos, resolver_ruta_datos
+)
+
+generar_tabla_agrupada = perfil.medido(generar_tabla_agrupada)
 
 
 # --- CONFIGURACIÓN DE PÁGINA ---
@@ -11,118 +21,21 @@ st.set_page_config(layout="wide", page_title="Estadística: Datos Agrupados")
 
 # --- FUNCIONES DE AGRUPACIÓN ---
 
-def sturges_rule(n):
-    """Calcula el número de intervalos sugerido por la Regla de Sturges."""
-    if n <= 1:
-        return 1
-    return int(1 + 3.322 * math.log10(n))
-
-def calculate_amplitude(min_val, max_val, k):
-    """Calcula la amplitud de clase."""
-    if k <= 0:
-        return 1.0
-    return (max_val - min_val) / k
-
-def generar_tabla_agrupada(data, k=None, amplitud=None):
-    """
-    Genera la tabla de frecuencia para datos agrupados.
-    
-    Ajusta ligeramente los límites para asegurar que el mínimo y el máximo caigan
-    dentro de un intervalo cerrado/abierto de manera estándar.
-    """
-    n = len(data)
-    
-    if k is None:
-        k = sturges_rule(n)
-    
-    data_min = data.min()
-    data_max = data.max()
-    
-    # Asegurar que el límite inferior sea un poco menor que el mínimo
-    # y el superior un poco mayor que el máximo, para incluir todos los datos
-    # y evitar problemas de límites exactos.
-    rango = data_max - data_min
-    
-    if amplitud is None:
-        amplitud = calculate_amplitude(data_min, data_max, k)
-        # Redondear la amplitud a una cifra conveniente (ej: 1 decimal más que el dato)
-        if rango > 0:
-            decimal_places = max(0, -int(math.floor(math.log10(amplitud)))) + 1
-            amplitud = round(amplitud, decimal_places)
-            
-    # Calcular límites de los bins
-    # Ajustar el punto de inicio para ser ligeramente menor al mínimo
-    start_point = data_min - (data_min % amplitud) if data_min % amplitud != 0 else data_min
-    if start_point + amplitud * k < data_max:
-         k += 1 # Ajuste si no cubrimos el máximo con la amplitud calculada
-         
-    bins = np.arange(data_min, data_max + amplitud, amplitud)
-    
-    # Corregir la definición de los bins si es necesario
-    if bins[-1] < data_max:
-        bins = np.append(bins, bins[-1] + amplitud)
-    
-    # Asegurar que los bins son únicos y ordenados
-    bins = np.unique(bins)
-    k = len(bins) - 1 # Número real de intervalos
-
-    # Generar intervalos (bins)
-    # Por convención, (a, b] o [a, b)
-    # Usaremos [a, b) para todos menos el último para evitar errores comunes
-    # Se ajusta el límite derecho del último intervalo para ser cerrado
-    
-    intervals = pd.cut(data, bins=bins, include_lowest=True, right=False)
-    
-    # Contar frecuencias
-    freq_abs = intervals.value_counts().sort_index()
-    
-    # Crear DataFrame de la tabla
-    tabla = pd.DataFrame({
-        'Clase/Intervalo': freq_abs.index.astype(str),
-        'Frecuencia Absoluta': freq_abs.values
-    }).reset_index(drop=True)
-    
-    # Calcular Marca de Clase ($x_i$)
-    # Para la visualización: punto medio del intervalo
-    tabla['Límite Inferior'] = [i.left for i in freq_abs.index]
-    tabla['Límite Superior'] = [i.right for i in freq_abs.index]
-    tabla['Marca de Clase ($x_i$)'] = (tabla['Límite Inferior'] + tabla['Límite Superior']) / 2
-    
-    # Calcular Frecuencias Relativas y Porcentajes
-    tabla['Frecuencia Relativa'] = tabla['Frecuencia Absoluta'] / n
-    tabla['Porcentaje (%)'] = tabla['Frecuencia Relativa'] * 100
-    
-    # Calcular Frecuencias Acumuladas
-    tabla['Frecuencia Acumulada'] = tabla['Frecuencia Absoluta'].cumsum()
-    tabla['Frecuencia Relativa Acumulada'] = tabla['Frecuencia Relativa'].cumsum()
-    
-    # Formato de los nombres de columnas
-    tabla.columns = ['Clase/Intervalo', 'Frecuencia Absoluta', 'Límite Inferior', 'Límite Superior', 'Marca de Clase ($x_i$)',
-                     'Frecuencia Relativa', 'Porcentaje (%)', 'Frecuencia Acumulada', 'Frecuencia Relativa Acumulada']
-    
-    # Redondeo final para la tabla
-    format_mapping = {
-        'Frecuencia Relativa': '{:.4f}',
-        'Porcentaje (%)': '{:.2f}',
-        'Frecuencia Relativa Acumulada': '{:.4f}'
-    }
-    
-    # Aplicar formato a una copia para evitar SettingWithCopyWarning
-    tabla_display = tabla.copy()
-    for col, fmt in format_mapping.items():
-        if col in tabla_display.columns:
-            tabla_display[col] = tabla_display[col].apply(lambda x: fmt.format(x))
-            
-    # Asegurar que el total de f_r y % sea 1.0000 y 100.00
-    if 'Frecuencia Relativa' in tabla_display.columns:
-        tabla_display.loc['Total'] = ['TOTAL', tabla['Frecuencia Absoluta'].sum(), '', '', '', 
-                                       1.0, 100.0, '', '']
+@st.cache_data
+def resumir_archivo(ruta, columna, modificado):
+    """Resumen (mínimo, máximo, n) de la columna; 'modificado' invalida la caché si el archivo cambia."""
+    return resumen_por_bloques(leer_columna_por_bloques(ruta, columna))
 
-    return tabla, tabla_display, amplitud, k
+@st.cache_data
+def agrupar_archivo(ruta, columna, modificado, k):
+    """Tabla agrupada (numérica), amplitud y k de la columna: el archivo se recorre una vez por cada k."""
+    tabla, _, amplitud, k_real = generar_tabla_agrupada_desde_archivo(
+        ruta, columna, k=k, resumen=resumir_archivo(ruta, columna, modificado))
+    return tabla, amplitud, k_real
 
 # --- SIMULACIÓN DE DATASETS ---
 
-@st.cache_data
+@st.cache_resource
 def load_datasets():
     """Genera datasets simulados para datos agrupados."""
     np.random.seed(42)
@@ -147,7 +60,7 @@ def load_datasets():
     color = pd.Series(np.random.choice(['Rojo', 'Azul', 'Verde', 'Amarillo'], size=100), name='Color Favorito')
     hermanos = pd.Series(np.random.randint(0, 5, size=100), name='Número de Hermanos')
     
-    return {
+    datasets = {
         "Estaturas de Estudiantes (Continuo)": estaturas,
         "Edades de Empleados (Discreto Alto)": edades,
         "Tiempos de Reacción (Continuo)": tiempos,
@@ -155,6 +68,7 @@ def load_datasets():
         "Color Favorito (Nominal Bajo)": color,
         "Número de Hermanos (Discreto Bajo)": hermanos
     }
+    return {nombre: pd.Series(solo_lectura(serie), name=serie.name) for nombre, serie in datasets.items()}
 
 # --- BARRA LATERAL (CONTROL DE PÁGINAS) ---
 
@@ -173,6 +87,7 @@ page = st.sidebar.radio("Navegar a:", [
     "8. Cuestionario Final",
     "9. Ventajas y Desventajas",
 ], index=0)
+perfil.seccion(page)
 
 # --- EJECUCIÓN DEL MÓDULO SELECCIONADO ---
 
@@ -737,71 +652,100 @@ elif page == "5. Explorador de Datos Agrupados":
     st.title("📊 Explorador de Datos Agrupados")
     st.markdown("Visualiza cómo la elección del número de intervalos afecta la tabla de frecuencia y el histograma.")
 
-    selected_data_key = st.selectbox("Selecciona un Dataset Agrupable:", dataset_keys[:4], index=0)
-    data_explore = datasets[selected_data_key]
-    n_explore = len(data_explore)
+    opcion_archivo = "Archivo propio (CSV/Parquet)"
+    # Solo se ofrecen archivos del directorio de datos del servidor (ESTADISTICA_DATOS)
+    archivos = archivos_datos()
+    selected_data_key = st.selectbox("Selecciona un Dataset Agrupable:",
+                                     dataset_keys[:4] + ([opcion_archivo] if archivos else []), index=0)
+    
+    if selected_data_key == opcion_archivo:
+        # Archivos grandes: se leen por bloques desde el servidor, nunca completos
+        nombre_archivo = st.selectbox("Archivo (.csv o .parquet):", archivos, key="archivo_datos")
+        try:
+            ruta_archivo = resolver_ruta_datos(nombre_archivo)
+        except ValueError as error:
+            st.error(str(error))
+            st.stop()
+        columna_archivo = st.selectbox("Columna numérica:", columnas_archivo(ruta_archivo), key="columna_archivo")
+        with st.spinner("Leyendo el archivo por bloques..."):
+            resumen_archivo = resumir_archivo(ruta_archivo, columna_archivo, os.path.getmtime(ruta_archivo))
+        n_explore = resumen_archivo[2]
+        if n_explore == 0:
+            st.error(f"La columna '{columna_archivo}' no tiene datos numéricos.")
+            st.stop()
+    else:
+        data_explore = datasets[selected_data_key]
+        n_explore = len(data_explore)
     
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Control de Intervalos")
-
     k_suggested = sturges_rule(n_explore)
-    k_explore = st.sidebar.slider("Número de Intervalos ($k$):", min_value=2, max_value=15, value=k_suggested, step=1)
-    
-    st.sidebar.info(f"Regla de Sturges sugiere: $k \\approx {k_suggested}$")
 
-    # Generar tabla con k seleccionado
-    tabla_raw_exp, tabla_display_exp, A_calc_exp, k_calc_exp = generar_tabla_agrupada(data_explore, k=k_explore)
-    
-    st.markdown(f"**Dataset:** {selected_data_key} ($N={n_explore}$)")
-    st.markdown(f"**Intervalos Usados ($k$):** {k_calc_exp} | **Amplitud ($A$):** {A_calc_exp:.4f}")
-
-    col_t, col_g = st.columns(2)
-    
-    with col_t:
-        st.subheader("Tabla de Frecuencia Agrupada")
-        st.dataframe(tabla_display_exp, use_container_width=True, hide_index=True)
-    
-    with col_g:
-        st.subheader("Histograma de Frecuencia")
-        
-        # Extraer datos DIRECTAMENTE de la tabla para que coincidan
-        limites_inf = tabla_raw_exp['Límite Inferior'].tolist()
-        limites_sup = tabla_raw_exp['Límite Superior'].tolist()
-        frecuencias = tabla_raw_exp['Frecuencia Absoluta'].tolist()
-        x_centers = tabla_raw_exp['Marca de Clase ($x_i$)'].tolist()
-        widths = [sup - inf for inf, sup in zip(limites_inf, limites_sup)]
-        
-        # Crear el gráfico usando barras con los datos de la tabla
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=x_centers,
-            y=frecuencias,
-            width=widths,
-            marker=dict(
-                color='steelblue',
-                line=dict(color='black', width=1)
-            ),
-            opacity=0.7,
-            hovertemplate='[%{customdata[0]:.2f}, %{customdata[1]:.2f})<br>Frecuencia: %{y}<extra></extra>',
-            customdata=[[inf, sup] for inf, sup in zip(limites_inf, limites_sup)]
-        ))
-        
-        # Agregar líneas verticales en cada límite
-        todos_limites = [limites_inf[0]] + limites_sup
-        for limite in todos_limites:
-            fig.add_vline(x=limite, line_dash="dash", line_color="red", opacity=0.4, line_width=1)
-        
-        fig.update_layout(
-            title=f"Histograma ({k_calc_exp} Clases, A={A_calc_exp:.4f})",
-            xaxis_title="Valores",
-            yaxis_title="Frecuencia Absoluta",
-            showlegend=False,
-            bargap=0,
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    @perfil.fragmento
+    def explorar_intervalos():
+        """Tabla e histograma del dataset con el número de intervalos elegido."""
+        k_explore = st.slider("Número de Intervalos ($k$):", min_value=2, max_value=15, value=k_suggested, step=1)
+        st.info(f"Regla de Sturges sugiere: $k \\approx {k_suggested}$")
+
+        # Generar tabla con k seleccionado
+        if selected_data_key == opcion_archivo:
+            with st.spinner("Contando los intervalos por bloques..."):
+                tabla_raw_exp, A_calc_exp, k_calc_exp = agrupar_archivo(
+                    ruta_archivo, columna_archivo, os.path.getmtime(ruta_archivo), k_explore)
+            tabla_display_exp = estilo_tabla_agrupada(tabla_raw_exp)
+        else:
+            tabla_raw_exp, tabla_display_exp, A_calc_exp, k_calc_exp = generar_tabla_agrupada(data_explore, k=k_explore)
+
+        st.markdown(f"**Dataset:** {selected_data_key} ($N={n_explore}$)")
+        st.markdown(f"**Intervalos Usados ($k$):** {k_calc_exp} | **Amplitud ($A$):** {A_calc_exp:.4f}")
+
+        col_t, col_g = st.columns(2)
+
+        with col_t:
+            st.subheader("Tabla de Frecuencia Agrupada")
+            st.dataframe(tabla_display_exp, use_container_width=True, hide_index=True)
+
+        with col_g:
+            st.subheader("Histograma de Frecuencia")
+
+            # Extraer datos DIRECTAMENTE de la tabla para que coincidan
+            limites_inf = tabla_raw_exp['Límite Inferior'].tolist()
+            limites_sup = tabla_raw_exp['Límite Superior'].tolist()
+            frecuencias = tabla_raw_exp['Frecuencia Absoluta'].tolist()
+            x_centers = tabla_raw_exp['Marca de Clase ($x_i$)'].tolist()
+            widths = [sup - inf for inf, sup in zip(limites_inf, limites_sup)]
+
+            # Crear el gráfico usando barras con los datos de la tabla
+            fig = go.Figure()
+
+            fig.add_trace(go.Bar(
+                x=x_centers,
+                y=frecuencias,
+                width=widths,
+                marker=dict(
+                    color='steelblue',
+                    line=dict(color='black', width=1)
+                ),
+                opacity=0.7,
+                hovertemplate='[%{customdata[0]:.2f}, %{customdata[1]:.2f})<br>Frecuencia: %{y}<extra></extra>',
+                customdata=[[inf, sup] for inf, sup in zip(limites_inf, limites_sup)]
+            ))
+
+            # Agregar líneas verticales en cada límite
+            todos_limites = [limites_inf[0]] + limites_sup
+            for limite in todos_limites:
+                fig.add_vline(x=limite, line_dash="dash", line_color="red", opacity=0.4, line_width=1)
+
+            fig.update_layout(
+                title=f"Histograma ({k_calc_exp} Clases, A={A_calc_exp:.4f})",
+                xaxis_title="Valores",
+                yaxis_title="Frecuencia Absoluta",
+                showlegend=False,
+                bargap=0,
+                height=400
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+
+    explorar_intervalos()
 
 
 elif page == "6. Comparador de Gráficos":
@@ -1239,7 +1183,7 @@ elif page == "9. Ventajas y Desventajas":
         st.markdown("**Tabla Agrupada (Manejable):**")
         k_final = sturges_rule(len(data_no_agrupado))
         tabla_raw_a, tabla_display_a, A_calc_a, k_calc_a = generar_tabla_agrupada(data_no_agrupado, k=k_final)
-        st.dataframe(tabla_display_a.drop(columns=['Límite Inferior', 'Límite Superior', 'Marca de Clase ($x_i$)']).head(10), hide_index=True, height=300)
+        st.dataframe(estilo_tabla_agrupada(tabla_raw_a.drop(columns=['Límite Inferior', 'Límite Superior', 'Marca de Clase ($x_i$)']).head(10), total=False), hide_index=True, height=300)
         st.success(f"La tabla tiene **{k_calc_a}** filas. Es mucho más fácil ver dónde se concentran las calificaciones.")
     
     st.markdown("---")
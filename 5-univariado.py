@@ -1,42 +1,50 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from scipy import stats
 import random
+from estadistica import descriptiva, perfil, sesion
+from estadistica.datos import obtener, solo_lectura
+from estadistica.importaciones import importar
+from estadistica.descriptiva import IndiceCuantiles
 
 # === CONFIGURACIÓN ===
 st.set_page_config(page_title="Medidas Descriptivas", page_icon="📊", layout="wide")
 
 # === FUNCIONES AUXILIARES ===
-def calcular_medidas(data):
+# Clases del histograma (los gráficos envían agregados, no los datos)
+BINS_HISTOGRAMA = 20
+
+@st.cache_resource(max_entries=32)
+def indice_dataset(nombre, semilla=None, tamano=None):
+    """IndiceCuantiles compartido de un dataset: de load_datasets() sin semilla, de estadistica.datos con ella"""
+    data = load_datasets()[nombre]['data'] if semilla is None else obtener(nombre, semilla, tamano)
+    return IndiceCuantiles(data)
+
+def indice_cuantiles(data, clave=None):
+    """IndiceCuantiles de data; con la clave (nombre, semilla, tamaño) de su dataset se reutiliza entre reruns"""
+    return indice_dataset(*clave) if clave else IndiceCuantiles(data)
+
+@perfil.medido
+def calcular_medidas(data, clave=None):
     """Calcula todas las medidas descriptivas"""
-    if len(data) == 0:
-        return None
-    return {
-        'media': np.mean(data),
-        'mediana': np.median(data),
-        'moda': stats.mode(data, keepdims=True)[0][0] if len(stats.mode(data, keepdims=True)[0]) > 0 else None,
-        'rango': np.max(data) - np.min(data),
-        'varianza': np.var(data, ddof=1),
-        'desv_std': np.std(data, ddof=1),
-        'cv': (np.std(data, ddof=1) / np.mean(data) * 100) if np.mean(data) != 0 else 0,
-        'q1': np.percentile(data, 25),
-        'q2': np.percentile(data, 50),
-        'q3': np.percentile(data, 75),
-        'iqr': np.percentile(data, 75) - np.percentile(data, 25),
-        'asimetria': stats.skew(data),
-        'curtosis': stats.kurtosis(data),
-        'minimo': np.min(data),
-        'maximo': np.max(data),
-        'n': len(data)
-    }
+    return descriptiva.calcular_medidas(data, indice=indice_cuantiles(data, clave))
 
-def crear_boxplot(data, title="Diagrama de Cajas"):
+def crear_boxplot(data, title="Diagrama de Cajas", clave=None):
     """Crea un boxplot con Plotly"""
+    caja = descriptiva.resumen_boxplot(data, indice=indice_cuantiles(data, clave))
     fig = go.Figure()
-    fig.add_trace(go.Box(y=data, name="Datos", boxmean='sd', marker_color='lightblue'))
+    fig.add_trace(go.Box(
+        x=["Datos"], name="Datos", marker_color='lightblue',
+        q1=[caja['q1']], median=[caja['mediana']], q3=[caja['q3']],
+        lowerfence=[caja['bigote_inferior']], upperfence=[caja['bigote_superior']],
+        mean=[caja['media']], sd=[caja['desv_std']], boxmean='sd'
+    ))
+    if len(caja['atipicos']) > 0:
+        fig.add_trace(go.Scatter(
+            x=["Datos"] * len(caja['atipicos']), y=caja['atipicos'], mode='markers',
+            name="Atípicos", marker=dict(color='lightblue', line=dict(color='steelblue', width=1))
+        ))
     fig.update_layout(
         title=title,
         yaxis_title="Valores",
@@ -49,12 +57,15 @@ def crear_histograma_con_medidas(data, medidas):
     """Crea histograma con líneas de tendencia central"""
     fig = go.Figure()
     
-    fig.add_trace(go.Histogram(
-        x=data,
+    # Conteos por clase calculados aquí: el gráfico no depende del tamaño de los datos
+    conteos, bordes = np.histogram(data, bins=BINS_HISTOGRAMA)
+    fig.add_trace(go.Bar(
+        x=(bordes[:-1] + bordes[1:]) / 2,
+        y=conteos,
+        width=np.diff(bordes),
         name="Frecuencia",
         opacity=0.7,
-        marker_color='lightblue',
-        nbinsx=20
+        marker_color='lightblue'
     ))
     
     fig.add_vline(x=medidas['media'], line_dash="dash", line_color="red", 
@@ -70,7 +81,7 @@ def crear_histograma_con_medidas(data, medidas):
     )
     return fig
 
-@st.cache_data
+@st.cache_resource
 def load_datasets():
     """Carga datasets de ejemplo"""
     np.random.seed(42)
@@ -102,12 +113,10 @@ def load_datasets():
             "tipo": "Simétrico"
         }
     }
+    for info in datasets.values():
+        info["data"] = solo_lectura(info["data"])
     return datasets
 
-# === INICIALIZACIÓN ===
-if 'ejercicio_actual' not in st.session_state:
-    st.session_state['ejercicio_actual'] = None
-
 # === SIDEBAR ===
 with st.sidebar:
     st.title("🎯 Navegación")
@@ -119,10 +128,12 @@ with st.sidebar:
         datasets = load_datasets()
         dataset_name = st.selectbox("Elige dataset:", list(datasets.keys()))
         data = datasets[dataset_name]['data']
+        clave_data = (dataset_name,)
         st.info(datasets[dataset_name]['descripcion'])
     else:
         st.markdown("**Ingresa datos (separados por comas):**")
         datos_input = st.text_area("Datos:", "12, 15, 18, 20, 22, 25, 28, 30, 35, 40, 45, 50")
+        clave_data = None
         try:
             data = np.array([float(x.strip()) for x in datos_input.split(',')])
             st.success(f"✅ {len(data)} datos cargados")
@@ -143,12 +154,13 @@ with st.sidebar:
         "📈 Casos Reales",
         "❓ Cuestionario"
     ], label_visibility="collapsed")
+    perfil.seccion(page)
 
 st.title("📊 Medidas Descriptivas: El Arte de Resumir Datos")
 st.markdown("---")
 
 # Calcular medidas
-medidas = calcular_medidas(data)
+medidas = calcular_medidas(data, clave_data)
 
 # === INICIO ===
 if page == "🏠 Inicio":
@@ -424,6 +436,7 @@ elif page == "📍 Tendencia Central":
 
 # === DISPERSIÓN ===
 elif page == "📏 Dispersión":
+    stats = importar('scipy.stats')
     st.header("📏 Medidas de Dispersión")
 
     st.markdown("""
@@ -785,6 +798,19 @@ elif page == "📊 Posición":
         el percentil es el promedio entre ese dato y el siguiente.
         """)
  
+        # Exploración con los datos de la barra lateral (índice ordenado una sola vez)
+        st.markdown("### 🎚️ Explora los percentiles de tus datos")
+        indice = indice_cuantiles(data, clave_data)
+ 
+        col1, col2 = st.columns(2)
+        with col1:
+            k_percentil = st.slider("Percentil k:", 1, 99, 55, key="k_percentil")
+            st.metric(f"P{k_percentil}", f"{indice.percentil(k_percentil):.2f}")
+        with col2:
+            valor_consulta = st.number_input("Valor a ubicar:", value=float(medidas['mediana']), key="valor_percentil")
+            st.metric("Rango percentil", f"{indice.rango_percentil(valor_consulta):.1f}%",
+                      help="Porcentaje de datos menores o iguales al valor")
+ 
     # =========================================================
     # TAB 2 — CUARTILES
     # =========================================================
@@ -863,6 +889,17 @@ elif page == "📊 Posición":
         - Describe el “corazón” de la distribución
         """)
 
+        indice = indice_cuantiles(data, clave_data)
+        q1, _, q3 = indice.cuartiles()
+        limite_inferior, limite_superior = indice.limites_atipicos()
+
+        st.markdown("### 📊 Con tus datos")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Q₁", f"{q1:.2f}")
+        col2.metric("Q₃", f"{q3:.2f}")
+        col3.metric("IQR", f"{indice.iqr():.2f}")
+        st.markdown(f"Límites de atípicos (Q₁ − 1.5·IQR, Q₃ + 1.5·IQR): **[{limite_inferior:.2f}, {limite_superior:.2f}]**")
+
     # =========================================================
     # TAB 4 — EQUIVALENCIAS
     # =========================================================
@@ -888,6 +925,7 @@ elif page == "📊 Posición":
 
 # === FORMA (VERSIÓN PEDAGÓGICA COMPLETA) ===
 elif page == "🎭 Forma":
+    stats = importar('scipy.stats')
     st.header("🎭 Medidas de Forma: ¿Cómo Se Ve Tu Distribución?")
     
     st.markdown("""
@@ -942,8 +980,7 @@ elif page == "🎭 Forma":
         
         with col1:
             # Crear distribución simétrica
-            np.random.seed(42)
-            datos_simetricos = np.random.normal(50, 10, 1000)
+            datos_simetricos = obtener('simetrica', semilla=42, tamano=1000)
             
             fig_sim = go.Figure()
             fig_sim.add_trace(go.Histogram(
@@ -1002,7 +1039,7 @@ elif page == "🎭 Forma":
         
         with col1:
             # Crear distribución asimétrica derecha
-            datos_derecha = np.random.gamma(2, 2, 1000) * 1000 + 2000
+            datos_derecha = obtener('asimetrica_derecha', semilla=42, tamano=1000)
             
             fig_der = go.Figure()
             fig_der.add_trace(go.Histogram(
@@ -1094,7 +1131,7 @@ elif page == "🎭 Forma":
         
         with col1:
             # Crear distribución asimétrica izquierda
-            datos_izq = 100 - np.random.gamma(2, 2, 1000) * 5
+            datos_izq = obtener('asimetrica_izquierda', semilla=42, tamano=1000)
             datos_izq = datos_izq[datos_izq > 0]  # Eliminar negativos
             
             fig_izq = go.Figure()
@@ -1944,7 +1981,7 @@ elif page == "📦 Boxplot":
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig_anatomia = crear_boxplot(data, "Anatomía del Boxplot")
+            fig_anatomia = crear_boxplot(data, "Anatomía del Boxplot", clave_data)
             st.plotly_chart(fig_anatomia, use_container_width=True)
         
         with col2:
@@ -1980,8 +2017,8 @@ elif page == "📦 Boxplot":
             st.markdown("#### 🎯 Mediana Centrada")
             
             # Simétrico
-            datos_sim_ej = np.random.normal(50, 10, 100)
-            fig_sim_ej = crear_boxplot(datos_sim_ej, "Simétrico")
+            datos_sim_ej = obtener('simetrica', semilla=7, tamano=100)
+            fig_sim_ej = crear_boxplot(datos_sim_ej, "Simétrico", ('simetrica', 7, 100))
             st.plotly_chart(fig_sim_ej, use_container_width=True)
             
             st.info("""
@@ -2000,8 +2037,8 @@ elif page == "📦 Boxplot":
             st.markdown("#### ➡️ Mediana Abajo")
             
             # Asimétrica derecha
-            datos_der_ej = np.random.gamma(2, 10, 100)
-            fig_der_ej = crear_boxplot(datos_der_ej, "Asimétrica Derecha")
+            datos_der_ej = obtener('caja_derecha', semilla=7, tamano=100)
+            fig_der_ej = crear_boxplot(datos_der_ej, "Asimétrica Derecha", ('caja_derecha', 7, 100))
             st.plotly_chart(fig_der_ej, use_container_width=True)
             
             st.warning("""
@@ -2022,9 +2059,9 @@ elif page == "📦 Boxplot":
             st.markdown("#### ⬅️ Mediana Arriba")
             
             # Asimétrica izquierda
-            datos_izq_ej = 100 - np.random.gamma(2, 5, 100)
+            datos_izq_ej = obtener('caja_izquierda', semilla=7, tamano=100)
             datos_izq_ej = datos_izq_ej[datos_izq_ej > 0]
-            fig_izq_ej = crear_boxplot(datos_izq_ej, "Asimétrica Izquierda")
+            fig_izq_ej = crear_boxplot(datos_izq_ej, "Asimétrica Izquierda", ('caja_izquierda', 7, 100))
             st.plotly_chart(fig_izq_ej, use_container_width=True)
             
             st.warning("""
@@ -2089,9 +2126,9 @@ elif page == "📦 Boxplot":
         """)
         
         # Calcular outliers del dataset actual
-        limite_inferior = medidas['q1'] - 1.5 * medidas['iqr']
-        limite_superior = medidas['q3'] + 1.5 * medidas['iqr']
-        outliers_actuales = data[(data < limite_inferior) | (data > limite_superior)]
+        indice = indice_cuantiles(data, clave_data)
+        limite_inferior, limite_superior = indice.limites_atipicos()
+        outliers_actuales = indice.atipicos()
         
         col1, col2 = st.columns([1, 1])
         
@@ -2133,7 +2170,7 @@ elif page == "📦 Boxplot":
                 """)
         
         with col2:
-            fig_outliers = crear_boxplot(data, "Outliers Marcados")
+            fig_outliers = crear_boxplot(data, "Outliers Marcados", clave_data)
             st.plotly_chart(fig_outliers, use_container_width=True)
         
         st.markdown("---")
@@ -2214,7 +2251,7 @@ elif page == "🎮 Laboratorio":
             st.plotly_chart(fig_hist, use_container_width=True)
         
         with col2:
-            fig_box = crear_boxplot(data)
+            fig_box = crear_boxplot(data, clave=clave_data)
             st.plotly_chart(fig_box, use_container_width=True)
 
         st.dataframe(df_resumen.style.format({'Valor': '{:.2f}'}, na_rep='N/A'), 
@@ -2223,70 +2260,80 @@ elif page == "🎮 Laboratorio":
     with tab2:
         st.markdown("### 🎲 Simulador de Distribuciones")
 
-        n_datos = st.slider("Cantidad de datos:", 50, 500, 100)
-        media_sim = st.slider("Media:", 0, 100, 50)
-        std_sim = st.slider("Desv. Est.:", 1, 30, 10)
+        @perfil.fragmento
+        def simulador():
+            """Genera datos normales con la media y desviación elegidas y los resume."""
+            n_datos = st.slider("Cantidad de datos:", 50, 500, 100)
+            media_sim = st.slider("Media:", 0, 100, 50)
+            std_sim = st.slider("Desv. Est.:", 1, 30, 10)
+
+            datos_sim = np.random.normal(media_sim, std_sim, n_datos)
 
-        datos_sim = np.random.normal(media_sim, std_sim, n_datos)
+            medidas_sim = calcular_medidas(datos_sim)
 
-        medidas_sim = calcular_medidas(datos_sim)
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Media", f"{medidas_sim['media']:.2f}")
+            col2.metric("Mediana", f"{medidas_sim['mediana']:.2f}")
+            col3.metric("Desv. Est.", f"{medidas_sim['desv_std']:.2f}")
+            col4.metric("Asimetría", f"{medidas_sim['asimetria']:.3f}")
 
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Media", f"{medidas_sim['media']:.2f}")
-        col2.metric("Mediana", f"{medidas_sim['mediana']:.2f}")
-        col3.metric("Desv. Est.", f"{medidas_sim['desv_std']:.2f}")
-        col4.metric("Asimetría", f"{medidas_sim['asimetria']:.3f}")
+            fig_sim = crear_histograma_con_medidas(datos_sim, medidas_sim)
 
-        fig_sim = crear_histograma_con_medidas(datos_sim, medidas_sim)
+            # 🔒 FIJAR EJES PARA COMPARAR CAMBIOS
+            fig_sim.update_layout(
+                xaxis=dict(range=[0, 100]),        # ajusta si lo deseas
+                yaxis=dict(range=[0, 120]),    # escala estable
+                bargap=0.05
+            )
 
-        # 🔒 FIJAR EJES PARA COMPARAR CAMBIOS
-        fig_sim.update_layout(
-            xaxis=dict(range=[0, 100]),        # ajusta si lo deseas
-            yaxis=dict(range=[0, 120]),    # escala estable
-            bargap=0.05
-        )
+            st.plotly_chart(fig_sim, use_container_width=True)
+
+        simulador()
 
-        st.plotly_chart(fig_sim, use_container_width=True)
-    
     with tab3:
         st.markdown("### ⚖️ Comparador de Datasets")
-        
-        datasets = load_datasets()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            dataset1 = st.selectbox("Dataset 1:", list(datasets.keys()), index=0)
-            data1 = datasets[dataset1]['data']
-            med1 = calcular_medidas(data1)
-            
-            st.metric("Media", f"{med1['media']:.2f}")
-            st.metric("Desv.Est", f"{med1['desv_std']:.2f}")
-            st.metric("CV", f"{med1['cv']:.2f}%")
-        
-        with col2:
-            dataset2 = st.selectbox("Dataset 2:", list(datasets.keys()), index=1)
-            data2 = datasets[dataset2]['data']
-            med2 = calcular_medidas(data2)
-            
-            st.metric("Media", f"{med2['media']:.2f}")
-            st.metric("Desv.Est", f"{med2['desv_std']:.2f}")
-            st.metric("CV", f"{med2['cv']:.2f}%")
-        
-        # Comparación visual
-        fig_comp = go.Figure()
-        fig_comp.add_trace(go.Box(y=data1, name=dataset1.split('(')[0]))
-        fig_comp.add_trace(go.Box(y=data2, name=dataset2.split('(')[0]))
-        fig_comp.update_layout(title="Comparación", height=400)
-        st.plotly_chart(fig_comp, use_container_width=True)
-        
-        # Análisis
-        st.markdown("### 📊 Análisis Comparativo")
-        
-        if med1['cv'] > med2['cv']:
-            st.info(f"{dataset1} tiene **mayor variabilidad relativa** ({med1['cv']:.1f}% vs {med2['cv']:.1f}%)")
-        else:
-            st.info(f"{dataset2} tiene **mayor variabilidad relativa** ({med2['cv']:.1f}% vs {med1['cv']:.1f}%)")
+
+        @perfil.fragmento
+        def comparador():
+            """Compara las medidas y la forma de dos datasets."""
+            datasets = load_datasets()
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                dataset1 = st.selectbox("Dataset 1:", list(datasets.keys()), index=0)
+                data1 = datasets[dataset1]['data']
+                med1 = calcular_medidas(data1, (dataset1,))
+
+                st.metric("Media", f"{med1['media']:.2f}")
+                st.metric("Desv.Est", f"{med1['desv_std']:.2f}")
+                st.metric("CV", f"{med1['cv']:.2f}%")
+
+            with col2:
+                dataset2 = st.selectbox("Dataset 2:", list(datasets.keys()), index=1)
+                data2 = datasets[dataset2]['data']
+                med2 = calcular_medidas(data2, (dataset2,))
+
+                st.metric("Media", f"{med2['media']:.2f}")
+                st.metric("Desv.Est", f"{med2['desv_std']:.2f}")
+                st.metric("CV", f"{med2['cv']:.2f}%")
+
+            # Comparación visual
+            fig_comp = go.Figure()
+            fig_comp.add_trace(go.Box(y=data1, name=dataset1.split('(')[0]))
+            fig_comp.add_trace(go.Box(y=data2, name=dataset2.split('(')[0]))
+            fig_comp.update_layout(title="Comparación", height=400)
+            st.plotly_chart(fig_comp, use_container_width=True)
+
+            # Análisis
+            st.markdown("### 📊 Análisis Comparativo")
+
+            if med1['cv'] > med2['cv']:
+                st.info(f"{dataset1} tiene **mayor variabilidad relativa** ({med1['cv']:.1f}% vs {med2['cv']:.1f}%)")
+            else:
+                st.info(f"{dataset2} tiene **mayor variabilidad relativa** ({med2['cv']:.1f}% vs {med1['cv']:.1f}%)")
+
+        comparador()
 
 # === REEMPLAZO PARA CASOS REALES Y CUESTIONARIO ===
 # Reemplaza estas secciones en la Parte 2
@@ -2788,8 +2835,8 @@ elif page == "❓ Cuestionario":
     
     st.markdown("---")
     
-    if 'quiz_respuestas' not in st.session_state:
-        st.session_state['quiz_respuestas'] = {}
+    # Una posición por pregunta: 1 correcta, 0 incorrecta, SIN_RESPONDER si falta
+    quiz_respuestas = sesion.respuestas(st.session_state, 'quiz_respuestas', len(preguntas))
     
     for i, p in enumerate(preguntas, 1):
         st.markdown(f"### {p['nivel']} - Pregunta {i}")
@@ -2800,7 +2847,7 @@ elif page == "❓ Cuestionario":
             submitted = st.form_submit_button("✅ Verificar")
             
             if submitted:
-                st.session_state['quiz_respuestas'][i] = (resp == p['resp'])
+                quiz_respuestas[i - 1] = (resp == p['resp'])
                 
                 if resp == p['resp']:
                     st.success("🎉 ¡Correcto!")
@@ -2812,11 +2859,12 @@ elif page == "❓ Cuestionario":
         st.markdown("---")
     
     # Resumen final
-    if len(st.session_state['quiz_respuestas']) > 0:
+    respondidas = quiz_respuestas[quiz_respuestas != sesion.SIN_RESPONDER]
+    if respondidas.size > 0:
         st.markdown("## 📈 Tu Desempeño")
         
-        correctas = sum(st.session_state['quiz_respuestas'].values())
-        total = len(st.session_state['quiz_respuestas'])
+        correctas = int(respondidas.sum())
+        total = respondidas.size
         porcentaje = (correctas / total) * 100
         
         col1, col2, col3 = st.columns(3)
@@ -2834,7 +2882,7 @@ elif page == "❓ Cuestionario":
             col3.error("🔄 Repasa")
         
         if st.button("🔄 Reiniciar Cuestionario"):
-            st.session_state['quiz_respuestas'] = {}
+            quiz_respuestas[:] = sesion.SIN_RESPONDER
             st.rerun()
 
 # === FOOTER ===
@@ -1,65 +1,62 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from scipy import stats
 import random
+from estadistica import perfil
+from estadistica.bivariada import calcular_regresion
+from estadistica.datos import obtener, solo_lectura
+
+calcular_regresion = perfil.medido(calcular_regresion)
 
 # === CONFIGURACIÓN ===
 st.set_page_config(page_title="Análisis Bivariado", page_icon="📈", layout="wide")
 
 # === FUNCIONES AUXILIARES ===
-def calcular_regresion(x, y):
-    """Calcula regresión lineal y métricas"""
-    n = len(x)
-    x_mean = np.mean(x)
-    y_mean = np.mean(y)
-    
-    # Pendiente (b1)
-    numerador = np.sum((x - x_mean) * (y - y_mean))
-    denominador = np.sum((x - x_mean)**2)
-    b1 = numerador / denominador
-    
-    # Intercepto (b0)
-    b0 = y_mean - b1 * x_mean
-    
-    # Correlación
-    r = np.corrcoef(x, y)[0, 1]
-    
-    # R²
-    r2 = r**2
-    
-    # Covarianza
-    cov = np.cov(x, y)[0, 1]
-    
-    return {
-        'b0': b0,
-        'b1': b1,
-        'r': r,
-        'r2': r2,
-        'cov': cov,
-        'y_pred': b0 + b1 * x
-    }
+# Desde cuántos puntos la dispersión usa WebGL y desde cuántos una malla de densidad
+UMBRAL_WEBGL = 5_000
+UMBRAL_DENSIDAD = 200_000
+BINS_DENSIDAD = 120
 
-def crear_dispersion(x, y, titulo, mostrar_linea=False, x_label="X", y_label="Y"):
-    """Crea gráfico de dispersión"""
+def crear_dispersion(x, y, titulo, mostrar_linea=False, x_label="X", y_label="Y", reg=None):
+    """Crea gráfico de dispersión (reg: regresión ya calculada para x, y)"""
     fig = go.Figure()
+    n = len(x)
     
     # Puntos
-    fig.add_trace(go.Scatter(
-        x=x, y=y,
-        mode='markers',
-        marker=dict(size=10, color='lightblue', line=dict(width=1, color='darkblue')),
-        name='Datos',
-        hovertemplate=f'{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<extra></extra>'
-    ))
+    if n >= UMBRAL_DENSIDAD:
+        # Muchos puntos: se envían los conteos de una malla, no los datos
+        conteos, bordes_x, bordes_y = np.histogram2d(x, y, bins=BINS_DENSIDAD)
+        conteos = np.where(conteos > 0, conteos, np.nan)
+        fig.add_trace(go.Heatmap(
+            x=(bordes_x[:-1] + bordes_x[1:]) / 2,
+            y=(bordes_y[:-1] + bordes_y[1:]) / 2,
+            z=conteos.T,
+            colorscale='Blues',
+            colorbar=dict(title="Puntos"),
+            name='Datos',
+            hovertemplate=f'{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<br>Puntos: %{{z:.0f}}<extra></extra>'
+        ))
+    else:
+        trazo = go.Scattergl if n >= UMBRAL_WEBGL else go.Scatter
+        marcador = (dict(size=4, color='steelblue', opacity=0.5) if n >= UMBRAL_WEBGL
+                    else dict(size=10, color='lightblue', line=dict(width=1, color='darkblue')))
+        fig.add_trace(trazo(
+            x=x, y=y,
+            mode='markers',
+            marker=marcador,
+            name='Datos',
+            hovertemplate=f'{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<extra></extra>'
+        ))
     
     # Línea de regresión
     if mostrar_linea:
-        reg = calcular_regresion(x, y)
+        if reg is None:
+            reg = calcular_regresion(x, y)
+        # Basta con los extremos para dibujar la recta
+        x_linea = np.array([reg['x_min'], reg['x_max']])
         fig.add_trace(go.Scatter(
-            x=x, y=reg['y_pred'],
+            x=x_linea, y=reg['b0'] + reg['b1'] * x_linea,
             mode='lines',
             line=dict(color='red', width=2),
             name=f'Regresión: y = {reg["b0"]:.2f} + {reg["b1"]:.2f}x'
@@ -74,7 +71,7 @@ def crear_dispersion(x, y, titulo, mostrar_linea=False, x_label="X", y_label="Y"
     
     return fig
 
-@st.cache_data
+@st.cache_resource
 def load_datasets_bivariados():
     """Carga datasets bivariados de ejemplo"""
     np.random.seed(42)
@@ -117,14 +114,10 @@ def load_datasets_bivariados():
         }
     }
     
+    for info in datasets.values():
+        info["x"], info["y"] = solo_lectura(info["x"]), solo_lectura(info["y"])
     return datasets
 
-# === INICIALIZACIÓN ===
-if 'ejercicio_actual' not in st.session_state:
-    st.session_state['ejercicio_actual'] = None
-if 'quiz_respuestas' not in st.session_state:
-    st.session_state['quiz_respuestas'] = {}
-
 # === SIDEBAR ===
 with st.sidebar:
     st.title("🎯 Navegación")
@@ -151,6 +144,7 @@ with st.sidebar:
         "🎮 Ejercicios",
         "❓ Cuestionario"
     ], label_visibility="collapsed")
+    perfil.seccion(page)
 
 st.title("📊 Análisis Bivariado: Relaciones entre Variables")
 st.markdown("---")
@@ -208,7 +202,7 @@ if page == "🏠 Inicio":
         st.metric("R² (Bondad de ajuste)", f"{reg_actual['r2']:.3f}")
     
     fig_preview = crear_dispersion(x_data, y_data, "Vista Previa", True,
-                                   data_info['x_label'], data_info['y_label'])
+                                   data_info['x_label'], data_info['y_label'], reg=reg_actual)
     st.plotly_chart(fig_preview, use_container_width=True)
 
     st.markdown("---")
@@ -259,7 +253,7 @@ elif page == "📊 Gráfico de Dispersión":
     with col1:
         st.markdown("### ➡️ Positiva Fuerte")
         x_pos = np.linspace(0, 10, 20)
-        y_pos = 2*x_pos + np.random.normal(0, 1, 20)
+        y_pos = 2*x_pos + obtener('ruido_normal', semilla=1, tamano=20)
         fig_pos = crear_dispersion(x_pos, y_pos, "r ≈ +0.9", True, "X", "Y")
         st.plotly_chart(fig_pos, use_container_width=True)
         st.info("""
@@ -272,7 +266,7 @@ elif page == "📊 Gráfico de Dispersión":
     with col2:
         st.markdown("### ⬅️ Negativa Fuerte")
         x_neg = np.linspace(0, 10, 20)
-        y_neg = -2*x_neg + 20 + np.random.normal(0, 1, 20)
+        y_neg = -2*x_neg + 20 + obtener('ruido_normal', semilla=2, tamano=20)
         fig_neg = crear_dispersion(x_neg, y_neg, "r ≈ -0.9", True, "X", "Y")
         st.plotly_chart(fig_neg, use_container_width=True)
         st.info("""
@@ -284,8 +278,8 @@ elif page == "📊 Gráfico de Dispersión":
     
     with col3:
         st.markdown("### ⭕ Sin Relación")
-        x_sin = np.random.uniform(0, 10, 20)
-        y_sin = np.random.uniform(0, 10, 20)
+        x_sin = obtener('uniforme_0_10', semilla=3, tamano=20)
+        y_sin = obtener('uniforme_0_10', semilla=4, tamano=20)
         fig_sin = crear_dispersion(x_sin, y_sin, "r ≈ 0", False, "X", "Y")
         st.plotly_chart(fig_sin, use_container_width=True)
         st.info("""
@@ -306,7 +300,7 @@ elif page == "📊 Gráfico de Dispersión":
         fig_analisis = crear_dispersion(x_data, y_data,
                                         f"Análisis: {dataset_name}",
                                         True,
-                                        data_info['x_label'], data_info['y_label'])
+                                        data_info['x_label'], data_info['y_label'], reg=reg_actual)
         st.plotly_chart(fig_analisis, use_container_width=True)
     
     with col2:
@@ -604,7 +598,7 @@ elif page == "📈 Correlación":
         fig_corr = crear_dispersion(x_data, y_data,
                                     f"Correlación r = {reg_actual['r']:.3f}",
                                     True,
-                                    data_info['x_label'], data_info['y_label'])
+                                    data_info['x_label'], data_info['y_label'], reg=reg_actual)
         st.plotly_chart(fig_corr, use_container_width=True)
     
     st.markdown("---")
@@ -814,7 +808,7 @@ elif page == "📈 Correlación":
     fig_corr = crear_dispersion(x_data, y_data,
                                     f"r = {reg_actual['r']:.3f}, R² = {reg_actual['r2']:.3f}",
                                     True,
-                                    data_info['x_label'], data_info['y_label'])
+                                    data_info['x_label'], data_info['y_label'], reg=reg_actual)
     st.plotly_chart(fig_corr, use_container_width=True)
 
     st.warning("""
@@ -877,7 +871,7 @@ elif page == "📉 Regresión Lineal":
         fig_regresion = crear_dispersion(x_data, y_data,
                                          f"Regresión: ŷ = {reg_actual['b0']:.2f} + {reg_actual['b1']:.2f}x",
                                          True,
-                                         data_info['x_label'], data_info['y_label'])
+                                         data_info['x_label'], data_info['y_label'], reg=reg_actual)
         st.plotly_chart(fig_regresion, use_container_width=True)
     
     st.markdown("""
@@ -1125,8 +1119,8 @@ elif page == "🤔 Correlación Espuria":
     
     # Crear ejemplo de tendencias
     years3 = np.arange(2000, 2020)
-    internet = 10 * np.exp(0.15 * (years3 - 2000)) + np.random.normal(0, 5, len(years3))
-    obesity = 20 + 0.5 * (years3 - 2000) + np.random.normal(0, 2, len(years3))
+    internet = 10 * np.exp(0.15 * (years3 - 2000)) + 5 * obtener('ruido_normal', semilla=5, tamano=len(years3))
+    obesity = 20 + 0.5 * (years3 - 2000) + 2 * obtener('ruido_normal', semilla=6, tamano=len(years3))
     
     fig_trend = go.Figure()
     
@@ -1303,7 +1297,7 @@ elif page == "🎮 Ejercicios":
             "titulo": "👁️ Ejercicio 6: Lectura de Gráfico",
             "pregunta": "Observa el gráfico de dispersión. ¿Cuál es la correlación aproximada?",
             "data_x": np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]),
-            "data_y": np.array([10, 12, 14, 16, 18, 20, 22, 24, 26, 28]) + np.random.normal(0, 1, 10),
+            "data_y": np.array([10, 12, 14, 16, 18, 20, 22, 24, 26, 28]) + obtener('ruido_normal', semilla=8, tamano=10),
             "opciones": ["r ≈ -0.9", "r ≈ 0", "r ≈ +0.5", "r ≈ +0.95"],
             "respuesta": "r ≈ +0.95",
             "explicacion": "Los puntos forman una línea casi perfecta ascendente, indicando correlación positiva muy fuerte (cercana a +1)"
@@ -3,58 +3,58 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from itertools import permutations, combinations, combinations_with_replacement, product
+from itertools import permutations, combinations, combinations_with_replacement
 import math
 import random
+from estadistica import perfil, sesion
+from estadistica.conteo import (
+    EspacioMuestral, factorial, permutacion, combinacion, combinacion_repeticion, con_reemplazo_con_orden,
+    fila_pascal, log10_factorial, log10_permutacion, log10_combinacion
+)
 
 # --- CONFIGURACIÓN DE PÁGINA ---
 st.set_page_config(layout="wide", page_title="Técnicas de Conteo - Probabilidad", page_icon="🎲")
 
 # --- FUNCIONES AUXILIARES ---
 
-def factorial(n):
-    """Calcula el factorial de n"""
-    if n <= 1:
-        return 1
-    return math.factorial(n)
-
-def permutacion(n, r):
-    """Calcula P(n,r) = n!/(n-r)!"""
-    if r > n:
-        return 0
-    return factorial(n) // factorial(n - r)
+# Por encima de este número de cifras los conteos se muestran en notación científica
+MAX_DIGITOS_EXACTOS = 1000
+# Número máximo de factores que se escriben al expandir un producto
+MAX_TERMINOS_EXPANSION = 12
+# Límite de n y r en la Calculadora Universal
+MAX_N_CALCULADORA = 1_000_000
 
-def combinacion(n, r):
-    """Calcula C(n,r) = n!/(r!(n-r)!)"""
-    if r > n:
-        return 0
-    return factorial(n) // (factorial(r) * factorial(n - r))
+def signo_conteo(log10_valor):
+    """Signo LaTeX que precede a un conteo formateado: exacto (=) o aproximado"""
+    return "=" if log10_valor < MAX_DIGITOS_EXACTOS else "\\approx"
 
-def combinacion_repeticion(n, r):
-    """Calcula C_r(n,r) = C(n+r-1, r)"""
-    return combinacion(n + r - 1, r)
-
-def con_reemplazo_con_orden(n, r):
-    """Calcula n^r"""
-    return n ** r
+def formatear_conteo(log10_valor, funcion, n, r):
+    """Formatea funcion(n, r): exacto si es manejable, m × 10^e (log-gamma) si es astronómico"""
+    if log10_valor < MAX_DIGITOS_EXACTOS:
+        return f"{funcion(n, r):,}"
+    exponente = math.floor(log10_valor)
+    mantisa = 10 ** (log10_valor - exponente)
+    return f"{mantisa:.4f} \\times 10^{{{exponente}}}"
 
 def generar_arbol_monedas(num_monedas):
     """Genera todas las combinaciones de lanzar monedas"""
-    opciones = ['C', 'S']
-    resultados = list(product(opciones, repeat=num_monedas))
-    return resultados
+    return EspacioMuestral.monedas(num_monedas)
 
 def generar_arbol_dados(num_dados):
     """Genera todas las combinaciones de lanzar dados"""
-    opciones = list(range(1, 7))
-    resultados = list(product(opciones, repeat=num_dados))
-    return resultados
+    return EspacioMuestral.dados(num_dados)
+
+def expandir_producto(desde, hasta):
+    """Retorna desde × (desde-1) × ... × (hasta+1) como string, abreviado si es largo"""
+    if desde - hasta <= MAX_TERMINOS_EXPANSION:
+        return " × ".join([str(i) for i in range(desde, hasta, -1)])
+    return f"{desde} × {desde - 1} × {desde - 2} × ... × {hasta + 1}"
 
 def expandir_factorial(n):
     """Retorna la expansión de n! como string"""
     if n <= 1:
         return "1"
-    return " × ".join([str(i) for i in range(n, 0, -1)])
+    return expandir_producto(n, 0)
 
 # --- BANCO DE PROBLEMAS DEL MUNDO REAL ---
 BANCO_PROBLEMAS = {
@@ -341,6 +341,7 @@ page = st.sidebar.radio("📚 Navegar a:", [
     "9. ❓ Cuestionario Final",
     "10. 📚 Tabla de Referencia"
 ], index=0)
+perfil.seccion(page)
 
 # --- PÁGINA 1: INICIO ---
 
@@ -487,7 +488,7 @@ elif page == "2. 🌳 Diagramas de Árbol":
             st.warning(f"⚠️ Con {num_items} monedas, el árbol tiene **{total} ramas finales**. ¡Es demasiado complejo para dibujarlo! Por eso usamos **fórmulas**.")
     
     else:  # Dados
-        num_items = st.slider("Número de dados:", 1, 3, 2)
+        num_items = st.slider("Número de dados:", 1, 15, 2)
         
         st.markdown(f"### Lanzando {num_items} dado(s)")
         st.markdown("""
@@ -1380,7 +1381,7 @@ elif page == "5. 🔢 Las 4 Técnicas":
             
             # Visualización
             if n_comb <= 20:
-                valores_c = [combinacion(n_comb, i) for i in range(0, n_comb + 1)]
+                valores_c = list(fila_pascal(n_comb))
                 df_triangulo = pd.DataFrame({
                     'r': list(range(0, n_comb + 1)),
                     f'C({n_comb},r)': valores_c
@@ -1683,22 +1684,25 @@ elif page == "7. 🎲 Práctica Interactiva":
     st.markdown("Practica identificando y resolviendo problemas")
     st.markdown("---")
     
-    # Inicializar session state
-    if 'ejercicio_actual' not in st.session_state:
-        st.session_state.ejercicio_actual = None
+    # Inicializar session state: el ejercicio se guarda como (índice de carrera, índice de problema)
+    if 'puntaje' not in st.session_state:
         st.session_state.puntaje = 0
         st.session_state.intentos = 0
+    if 'ejercicio_conteo' not in st.session_state:
+        st.session_state.ejercicio_conteo = None
+    carreras = list(BANCO_PROBLEMAS)
     
     # Botón para generar nuevo ejercicio
-    if st.button("🎲 Generar Nuevo Ejercicio") or st.session_state.ejercicio_actual is None:
+    if st.button("🎲 Generar Nuevo Ejercicio") or st.session_state.ejercicio_conteo is None:
         # Seleccionar carrera y problema aleatorio
-        carrera_random = random.choice(list(BANCO_PROBLEMAS.keys()))
-        problema_random = random.choice(BANCO_PROBLEMAS[carrera_random])
-        st.session_state.ejercicio_actual = problema_random
+        i_carrera = random.randrange(len(carreras))
+        i_problema = random.randrange(len(BANCO_PROBLEMAS[carreras[i_carrera]]))
+        st.session_state.ejercicio_conteo = (i_carrera, i_problema)
         st.session_state.respondido = False
         st.rerun()
     
-    ejercicio = st.session_state.ejercicio_actual
+    i_carrera, i_problema = st.session_state.ejercicio_conteo
+    ejercicio = BANCO_PROBLEMAS[carreras[i_carrera]][i_problema]
     
     # Mostrar puntaje
     col_p1, col_p2 = st.columns(2)
@@ -1819,13 +1823,15 @@ elif page == "8. 🧮 Calculadora Universal":
         
         col1, col2 = st.columns(2)
         with col1:
-            n = st.number_input("n (opciones disponibles):", min_value=1, value=10, key="n_var_calc")
+            n = st.number_input("n (opciones disponibles):", min_value=1, max_value=MAX_N_CALCULADORA, value=10, key="n_var_calc")
         with col2:
-            r = st.number_input("r (selecciones a realizar):", min_value=1, value=4, key="r_var_calc")
+            r = st.number_input("r (selecciones a realizar):", min_value=1, max_value=MAX_N_CALCULADORA, value=4, key="r_var_calc")
         
-        resultado = n ** r
+        log10_resultado = r * math.log10(n)
+        signo = signo_conteo(log10_resultado)
+        resultado = formatear_conteo(log10_resultado, con_reemplazo_con_orden, n, r)
         
-        st.success(f"## Resultado: $${n}^{{{r}}} = {resultado:,}$$")
+        st.success(f"## Resultado: $${n}^{{{r}}} {signo} {resultado}$$")
         
         with st.expander("📖 Ver explicación paso a paso"):
             st.markdown(f"""
@@ -1839,7 +1845,7 @@ elif page == "8. 🧮 Calculadora Universal":
             
             **Paso 3:** Calcular
             - ${n} \\times {n} \\times ... \\times {n}$ ({r} veces)
-            - $= {n}^{{{r}}} = {resultado:,}$
+            - $= {n}^{{{r}}} {signo} {resultado}$
             """)
     
     elif "Permutaciones" in tecnica_calc:
@@ -1848,19 +1854,21 @@ elif page == "8. 🧮 Calculadora Universal":
         
         col1, col2 = st.columns(2)
         with col1:
-            n = st.number_input("n (elementos totales):", min_value=1, value=10, key="n_perm_calc")
+            n = st.number_input("n (elementos totales):", min_value=1, max_value=MAX_N_CALCULADORA, value=10, key="n_perm_calc")
         with col2:
-            r = st.number_input("r (posiciones a llenar):", min_value=1, value=3, key="r_perm_calc")
+            r = st.number_input("r (posiciones a llenar):", min_value=1, max_value=MAX_N_CALCULADORA, value=3, key="r_perm_calc")
         
         if r > n:
             st.error("❌ Error: r no puede ser mayor que n")
         else:
-            resultado = permutacion(n, r)
+            log10_resultado = log10_permutacion(n, r)
+            signo = signo_conteo(log10_resultado)
+            resultado = formatear_conteo(log10_resultado, permutacion, n, r)
             
-            st.success(f"## Resultado: $$P({n},{r}) = {resultado:,}$$")
+            st.success(f"## Resultado: $$P({n},{r}) {signo} {resultado}$$")
             
             with st.expander("📖 Ver explicación paso a paso"):
-                factores_str = ' \\times '.join([str(i) for i in range(n, n-r, -1)])
+                factores_str = expandir_producto(n, n - r).replace('×', '\\times')
                 
                 st.markdown(f"""
                 **Paso 1:** Expandir la fórmula
@@ -1872,7 +1880,7 @@ elif page == "8. 🧮 Calculadora Universal":
                 
                 **Paso 3:** Cancelar términos comunes
                 - $= {factores_str}$
-                - $= {resultado:,}$
+                - ${signo} {resultado}$
                 
                 **Interpretación:**
                 - Para la primera posición: {n} opciones
@@ -1887,13 +1895,15 @@ elif page == "8. 🧮 Calculadora Universal":
             
             col1, col2 = st.columns(2)
             with col1:
-                n = st.number_input("n (tipos disponibles):", min_value=1, value=5, key="n_cr_calc")
+                n = st.number_input("n (tipos disponibles):", min_value=1, max_value=MAX_N_CALCULADORA, value=5, key="n_cr_calc")
             with col2:
-                r = st.number_input("r (selecciones):", min_value=1, value=3, key="r_cr_calc")
+                r = st.number_input("r (selecciones):", min_value=1, max_value=MAX_N_CALCULADORA, value=3, key="r_cr_calc")
             
-            resultado = combinacion_repeticion(n, r)
+            log10_resultado = log10_combinacion(n + r - 1, r)
+            signo = signo_conteo(log10_resultado)
+            resultado = formatear_conteo(log10_resultado, combinacion_repeticion, n, r)
             
-            st.success(f"## Resultado: $$CR({n},{r}) = C({n+r-1},{r}) = {resultado:,}$$")
+            st.success(f"## Resultado: $$CR({n},{r}) = C({n+r-1},{r}) {signo} {resultado}$$")
             
             with st.expander("📖 Ver explicación paso a paso"):
                 st.markdown(f"""
@@ -1905,7 +1915,7 @@ elif page == "8. 🧮 Calculadora Universal":
                 - $C({n+r-1},{r}) = \\frac{{({n+r-1})!}}{{{r}! \\times ({n-1})!}}$
                 
                 **Paso 3:** Calcular
-                - $= {resultado:,}$
+                - ${signo} {resultado}$
                 
                 **Interpretación:**
                 Es como distribuir {r} elementos idénticos en {n} categorías diferentes.
@@ -1917,17 +1927,23 @@ elif page == "8. 🧮 Calculadora Universal":
         
         col1, col2 = st.columns(2)
         with col1:
-            n = st.number_input("n (elementos totales):", min_value=1, value=10, key="n_comb_calc")
+            n = st.number_input("n (elementos totales):", min_value=1, max_value=MAX_N_CALCULADORA, value=10, key="n_comb_calc")
         with col2:
-            r = st.number_input("r (elementos a elegir):", min_value=1, value=4, key="r_comb_calc")
+            r = st.number_input("r (elementos a elegir):", min_value=1, max_value=MAX_N_CALCULADORA, value=4, key="r_comb_calc")
         
         if r > n:
             st.error("❌ Error: r no puede ser mayor que n")
         else:
-            resultado = combinacion(n, r)
-            resultado_perm = permutacion(n, r)
+            log10_resultado = log10_combinacion(n, r)
+            log10_perm = log10_permutacion(n, r)
+            log10_factor = log10_factorial(r)
+            signo = signo_conteo(log10_resultado)
+            resultado = formatear_conteo(log10_resultado, combinacion, n, r)
+            resultado_perm = formatear_conteo(log10_perm, permutacion, n, r)
+            # r! = P(r, r)
+            factor = formatear_conteo(log10_factor, permutacion, r, r)
             
-            st.success(f"## Resultado: $$C({n},{r}) = {resultado:,}$$")
+            st.success(f"## Resultado: $$C({n},{r}) {signo} {resultado}$$")
             
             with st.expander("📖 Ver explicación paso a paso"):
                 st.markdown(f"""
@@ -1935,15 +1951,15 @@ elif page == "8. 🧮 Calculadora Universal":
                 - $C({n},{r}) = \\frac{{{n}!}}{{{r}! \\times ({n-r})!}}$
                 
                 **Paso 2:** Calcular numerador (como Permutación)
-                - $P({n},{r}) = {resultado_perm:,}$
+                - $P({n},{r}) {signo_conteo(log10_perm)} {resultado_perm}$
                 
                 **Paso 3:** Dividir entre r! para eliminar orden
-                - ${r}! = {factorial(r)}$
-                - $\\frac{{{resultado_perm:,}}}{{{factorial(r)}}} = {resultado:,}$
+                - ${r}! {signo_conteo(log10_factor)} {factor}$
+                - $\\frac{{{resultado_perm}}}{{{factor}}} {signo} {resultado}$
                 
                 **Interpretación:**
-                Hay {resultado_perm:,} formas ordenadas, pero como el orden NO importa,
-                dividimos entre {factorial(r)} (formas de ordenar {r} elementos).
+                Hay ${resultado_perm}$ formas ordenadas, pero como el orden NO importa,
+                dividimos entre ${factor}$ (formas de ordenar {r} elementos).
                 """)
 
 # --- PÁGINA 9: CUESTIONARIO FINAL ---
@@ -2067,9 +2083,9 @@ elif page == "9. ❓ Cuestionario Final":
         }
     ]
     
-    # Inicializar estado
-    if 'respuestas_quiz' not in st.session_state:
-        st.session_state.respuestas_quiz = {}
+    # Inicializar estado: índice de la opción elegida en cada pregunta
+    respuestas_quiz = sesion.respuestas(st.session_state, 'respuestas_quiz', len(preguntas))
+    if 'quiz_enviado' not in st.session_state:
         st.session_state.quiz_enviado = False
     
     if not st.session_state.quiz_enviado:
@@ -2082,10 +2098,10 @@ elif page == "9. ❓ Cuestionario Final":
                 "Selecciona tu respuesta:",
                 q['opciones'],
                 key=f"q_{i}",
-                index=st.session_state.respuestas_quiz.get(i, 0)
+                index=max(int(respuestas_quiz[i]), 0)
             )
             
-            st.session_state.respuestas_quiz[i] = q['opciones'].index(respuesta)
+            respuestas_quiz[i] = q['opciones'].index(respuesta)
             st.markdown("---")
         
         # Botón enviar
@@ -2099,7 +2115,7 @@ elif page == "9. ❓ Cuestionario Final":
         
         correctas = 0
         for i, q in enumerate(preguntas):
-            respuesta_usuario = st.session_state.respuestas_quiz.get(i, -1)
+            respuesta_usuario = int(respuestas_quiz[i])
             es_correcta = (respuesta_usuario == q['correcta'])
             
             if es_correcta:
@@ -2132,7 +2148,7 @@ elif page == "9. ❓ Cuestionario Final":
         
         # Botón reiniciar
         if st.button("🔄 Reiniciar Cuestionario"):
-            st.session_state.respuestas_quiz = {}
+            respuestas_quiz[:] = sesion.SIN_RESPONDER
             st.session_state.quiz_enviado = False
             st.rerun()
 
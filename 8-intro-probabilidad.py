@@ -1,13 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import random
-from matplotlib import pyplot as plt
-from matplotlib_venn import venn2, venn3
-import io
+from itertools import product
+from estadistica import perfil
+from estadistica.conteo import EspacioMuestral
+from estadistica.figuras import figura_a_bytes
+from estadistica.importaciones import importar
+from estadistica.probabilidad import simular_lanzamientos, simular_convergencia
+
+simular_convergencia = perfil.medido(simular_convergencia)
 
 # --- CONFIGURACIÓN DE PÁGINA ---
 st.set_page_config(layout="wide", page_title="Introducción a la Probabilidad", page_icon="🎲")
@@ -24,81 +27,74 @@ def generar_espacio_muestral_dado(num_dados=1):
     """Genera espacio muestral para dados."""
     if num_dados == 1:
         return list(range(1, 7))
-    elif num_dados == 2:
-        return [(i, j) for i in range(1, 7) for j in range(1, 7)]
-    return []
+    return EspacioMuestral.dados(num_dados)
 
 def generar_espacio_muestral_moneda(num_monedas=1):
     """Genera espacio muestral para monedas."""
     if num_monedas == 1:
         return ['Cara', 'Sello']
-    elif num_monedas == 2:
-        return [('C', 'C'), ('C', 'S'), ('S', 'C'), ('S', 'S')]
-    elif num_monedas == 3:
-        return [('C', 'C', 'C'), ('C', 'C', 'S'), ('C', 'S', 'C'), ('C', 'S', 'S'),
-                ('S', 'C', 'C'), ('S', 'C', 'S'), ('S', 'S', 'C'), ('S', 'S', 'S')]
-    return []
+    return EspacioMuestral.monedas(num_monedas)
 
-def simular_lanzamientos(tipo, num_elementos, num_lanzamientos):
-    """Simula lanzamientos de monedas o dados."""
-    resultados = []
-    if tipo == "Moneda":
-        for _ in range(num_lanzamientos):
-            if num_elementos == 1:
-                resultados.append(random.choice(['Cara', 'Sello']))
-            else:
-                resultados.append(tuple(random.choice(['C', 'S']) for _ in range(num_elementos)))
-    elif tipo == "Dado":
-        for _ in range(num_lanzamientos):
-            if num_elementos == 1:
-                resultados.append(random.randint(1, 6))
-            else:
-                resultados.append(tuple(random.randint(1, 6) for _ in range(num_elementos)))
-    return resultados
+# Diagramas de Venn distintos que se guardan en caché (la calculadora admite conjuntos libres)
+MAX_DIAGRAMAS_VENN = 128
 
+@perfil.medido
 def crear_diagrama_venn_2(set_a, set_b, label_a="A", label_b="B", highlight=None):
     """Crea un diagrama de Venn para 2 conjuntos usando matplotlib."""
+    # matplotlib y matplotlib_venn solo se cargan en las páginas que dibujan diagramas
+    plt = importar('matplotlib.pyplot')
+    venn2 = importar('matplotlib_venn').venn2
     fig, ax = plt.subplots(figsize=(8, 6))
     
-    # Crear el diagrama
-    v = venn2([set_a, set_b], set_labels=(label_a, label_b), ax=ax)
-    
-    # Colorear según lo que queremos resaltar
-    if highlight == "union":
-        if v.get_patch_by_id('10'):
-            v.get_patch_by_id('10').set_color('lightblue')
-            v.get_patch_by_id('10').set_alpha(0.7)
-        if v.get_patch_by_id('01'):
-            v.get_patch_by_id('01').set_color('lightblue')
-            v.get_patch_by_id('01').set_alpha(0.7)
-        if v.get_patch_by_id('11'):
-            v.get_patch_by_id('11').set_color('lightblue')
-            v.get_patch_by_id('11').set_alpha(0.7)
-    elif highlight == "intersection":
-        if v.get_patch_by_id('11'):
-            v.get_patch_by_id('11').set_color('orange')
-            v.get_patch_by_id('11').set_alpha(0.7)
-    elif highlight == "A":
-        if v.get_patch_by_id('10'):
-            v.get_patch_by_id('10').set_color('lightgreen')
-            v.get_patch_by_id('10').set_alpha(0.7)
-        if v.get_patch_by_id('11'):
-            v.get_patch_by_id('11').set_color('lightgreen')
-            v.get_patch_by_id('11').set_alpha(0.7)
-    elif highlight == "B":
-        if v.get_patch_by_id('01'):
-            v.get_patch_by_id('01').set_color('lightcoral')
-            v.get_patch_by_id('01').set_alpha(0.7)
-        if v.get_patch_by_id('11'):
-            v.get_patch_by_id('11').set_color('lightcoral')
-            v.get_patch_by_id('11').set_alpha(0.7)
-    elif highlight == "A-B":
-        if v.get_patch_by_id('10'):
-            v.get_patch_by_id('10').set_color('purple')
-            v.get_patch_by_id('10').set_alpha(0.7)
-    
+    # Dibujar y colorear (si algo falla, la figura se cierra en vez de quedar abierta en pyplot)
+    try:
+        v = venn2([set_a, set_b], set_labels=(label_a, label_b), ax=ax)
+
+        # Colorear según lo que queremos resaltar
+        if highlight == "union":
+            if v.get_patch_by_id('10'):
+                v.get_patch_by_id('10').set_color('lightblue')
+                v.get_patch_by_id('10').set_alpha(0.7)
+            if v.get_patch_by_id('01'):
+                v.get_patch_by_id('01').set_color('lightblue')
+                v.get_patch_by_id('01').set_alpha(0.7)
+            if v.get_patch_by_id('11'):
+                v.get_patch_by_id('11').set_color('lightblue')
+                v.get_patch_by_id('11').set_alpha(0.7)
+        elif highlight == "intersection":
+            if v.get_patch_by_id('11'):
+                v.get_patch_by_id('11').set_color('orange')
+                v.get_patch_by_id('11').set_alpha(0.7)
+        elif highlight == "A":
+            if v.get_patch_by_id('10'):
+                v.get_patch_by_id('10').set_color('lightgreen')
+                v.get_patch_by_id('10').set_alpha(0.7)
+            if v.get_patch_by_id('11'):
+                v.get_patch_by_id('11').set_color('lightgreen')
+                v.get_patch_by_id('11').set_alpha(0.7)
+        elif highlight == "B":
+            if v.get_patch_by_id('01'):
+                v.get_patch_by_id('01').set_color('lightcoral')
+                v.get_patch_by_id('01').set_alpha(0.7)
+            if v.get_patch_by_id('11'):
+                v.get_patch_by_id('11').set_color('lightcoral')
+                v.get_patch_by_id('11').set_alpha(0.7)
+        elif highlight == "A-B":
+            if v.get_patch_by_id('10'):
+                v.get_patch_by_id('10').set_color('purple')
+                v.get_patch_by_id('10').set_alpha(0.7)
+    except Exception:
+        plt.close(fig)
+        raise
+
     return fig
 
+@perfil.medido
+@st.cache_data(max_entries=MAX_DIAGRAMAS_VENN)
+def diagrama_venn_2_png(set_a, set_b, label_a="A", label_b="B", highlight=None):
+    """PNG del diagrama de Venn; se dibuja una vez por conjuntos, etiquetas y resaltado."""
+    return figura_a_bytes(crear_diagrama_venn_2(set_a, set_b, label_a, label_b, highlight))
+
 # --- BARRA LATERAL ---
 st.sidebar.title("🎲 Menú de Contenido")
 st.sidebar.markdown("### Navegación")
@@ -116,6 +112,7 @@ page = st.sidebar.radio("Ir a:", [
     "10. ❓ Cuestionario Final",
     "11. 📖 Resumen y Fórmulas"
 ], index=0)
+perfil.seccion(page)
 
 # --- PÁGINAS ---
 
@@ -432,7 +429,7 @@ elif page == "2. 🎯 Conceptos Fundamentales":
             st.success(f"**Tamaño del Espacio Muestral:** $|S| = {len(S)}$ resultados posibles")
             
             # Mostrar en tabla
-            df_dados = pd.DataFrame(S, columns=['Dado 1', 'Dado 2'])
+            df_dados = pd.DataFrame(list(S), columns=['Dado 1', 'Dado 2'])
             df_dados['Suma'] = df_dados['Dado 1'] + df_dados['Dado 2']
             
             col_tab, col_graf = st.columns(2)
@@ -677,8 +674,8 @@ elif page == "3. 🔵 Diagramas de Venn":
         st.code(f"S = {S_ejemplo}\nA = {A_ejemplo}")
         
         try:
-            fig_A = crear_diagrama_venn_2(A_ejemplo, set(), label_a="A", label_b="", highlight="A")
-            st.pyplot(fig_A)
+            png_A = diagrama_venn_2_png(A_ejemplo, set(), label_a="A", label_b="", highlight="A")
+            st.image(png_A, width="stretch")
         except:
             st.info("Visualización del evento A (números pares del 1 al 10)")
         
@@ -725,8 +722,8 @@ elif page == "3. 🔵 Diagramas de Venn":
         st.code(f"A = {A_union}\nB = {B_union}\nA ∪ B = {A_union.union(B_union)}")
         
         try:
-            fig_union = crear_diagrama_venn_2(A_union, B_union, label_a="A", label_b="B", highlight="union")
-            st.pyplot(fig_union)
+            png_union = diagrama_venn_2_png(A_union, B_union, label_a="A", label_b="B", highlight="union")
+            st.image(png_union, width="stretch")
         except:
             st.info("La unión incluye todos los elementos que están en A, en B, o en ambos")
         
@@ -774,8 +771,8 @@ elif page == "3. 🔵 Diagramas de Venn":
         st.code(f"A = {A_inter}\nB = {B_inter}\nA ∩ B = {A_inter.intersection(B_inter)}")
         
         try:
-            fig_inter = crear_diagrama_venn_2(A_inter, B_inter, label_a="A", label_b="B", highlight="intersection")
-            st.pyplot(fig_inter)
+            png_inter = diagrama_venn_2_png(A_inter, B_inter, label_a="A", label_b="B", highlight="intersection")
+            st.image(png_inter, width="stretch")
         except:
             st.info("La intersección incluye solo los elementos que están en AMBOS conjuntos")
         
@@ -836,8 +833,8 @@ elif page == "3. 🔵 Diagramas de Venn":
         st.code(f"A = {A_dif}\nB = {B_dif}\nA - B = {A_dif.difference(B_dif)}")
         
         try:
-            fig_dif = crear_diagrama_venn_2(A_dif, B_dif, label_a="A", label_b="B", highlight="A-B")
-            st.pyplot(fig_dif)
+            png_dif = diagrama_venn_2_png(A_dif, B_dif, label_a="A", label_b="B", highlight="A-B")
+            st.image(png_dif, width="stretch")
         except:
             st.info("La diferencia A - B incluye solo los elementos exclusivos de A")
         
@@ -1041,14 +1038,14 @@ elif page == "3. 🔵 Diagramas de Venn":
             if highlight_type in ["A-B", "B-A"]:
                 # Para diferencias, ajustar el highlight
                 if highlight_type == "A-B":
-                    fig_custom = crear_diagrama_venn_2(A_custom, B_custom, label_a="A", label_b="B", highlight="A-B")
+                    png_custom = diagrama_venn_2_png(A_custom, B_custom, label_a="A", label_b="B", highlight="A-B")
                 else:
                     # Para B-A, invertir los conjuntos y usar el highlight A-B
-                    fig_custom = crear_diagrama_venn_2(B_custom, A_custom, label_a="B", label_b="A", highlight="A-B")
+                    png_custom = diagrama_venn_2_png(B_custom, A_custom, label_a="B", label_b="A", highlight="A-B")
             else:
-                fig_custom = crear_diagrama_venn_2(A_custom, B_custom, label_a="A", label_b="B", highlight=highlight_type)
+                png_custom = diagrama_venn_2_png(A_custom, B_custom, label_a="A", label_b="B", highlight=highlight_type)
             
-            st.pyplot(fig_custom)
+            st.image(png_custom, width="stretch")
         except Exception as e:
             st.warning("No se pudo generar el diagrama de Venn para estos conjuntos. Verifica que haya intersección o diferencias.")
         
@@ -1332,17 +1329,18 @@ elif page == "4. 📊 Probabilidad Simple":
                 ]
             )
             
+            # Cada resultado aporta su número de caras
             if evento_moneda == "Exactamente 3 caras":
-                A = {('C', 'C', 'C')}
+                favorables = S_moneda.contar(lambda caras: caras == 3, valor=lambda x: x == 'C')
             elif evento_moneda == "Al menos 2 caras":
-                A = {('C', 'C', 'C'), ('C', 'C', 'S'), ('C', 'S', 'C'), ('S', 'C', 'C')}
+                favorables = S_moneda.contar(lambda caras: caras >= 2, valor=lambda x: x == 'C')
             else:
-                A = {('C', 'C', 'S'), ('C', 'S', 'C'), ('S', 'C', 'C')}
+                favorables = S_moneda.contar(lambda caras: caras == 2, valor=lambda x: x == 'C')
             
-            prob = len(A) / len(S_moneda)
+            prob = favorables / len(S_moneda)
             
-            st.code(f"|A| = {len(A)}")
-            st.latex(f"P(A) = \\frac{{{len(A)}}}{{{len(S_moneda)}}} = {prob:.4f} = {prob*100:.2f}\\%")
+            st.code(f"|A| = {favorables}")
+            st.latex(f"P(A) = \\frac{{{favorables}}}{{{len(S_moneda)}}} = {prob:.4f} = {prob*100:.2f}\\%")
             st.success(f"### ✅ Probabilidad: **{prob*100:.2f}%**")
     
     elif ejemplo_basico == "🃏 Baraja de 52 cartas":
@@ -2549,7 +2547,7 @@ elif page == "6. 🎮 Simulador de Experimentos":
         with col_config2:
             num_lanzamientos = st.select_slider(
                 "Número de lanzamientos:",
-                options=[10, 50, 100, 500, 1000, 5000, 10000],
+                options=[10, 50, 100, 500, 1000, 5000, 10000, 100000, 1000000, 10000000],
                 value=100
             )
         
@@ -2587,31 +2585,27 @@ elif page == "6. 🎮 Simulador de Experimentos":
         if st.button("🎲 Realizar Simulación", key="sim_moneda"):
             with st.spinner("Simulando lanzamientos..."):
                 # Realizar simulación
-                resultados = simular_lanzamientos("Moneda", num_monedas, num_lanzamientos)
-                
-                # Calcular frecuencias acumuladas
-                frecuencias_acumuladas = []
-                count = 0
-                
-                for i, resultado in enumerate(resultados, 1):
-                    if num_monedas == 1:
-                        if resultado == evento_moneda:
-                            count += 1
-                    else:
-                        if evento_moneda == "2 Caras" and resultado == ('C', 'C'):
-                            count += 1
-                        elif evento_moneda == "2 Sellos" and resultado == ('S', 'S'):
-                            count += 1
-                        elif evento_moneda == "1 Cara y 1 Sello" and resultado in [('C', 'S'), ('S', 'C')]:
-                            count += 1
-                    
-                    frecuencias_acumuladas.append(count / i)
+                caras_evento = {
+                    "Cara": 1, "Sello": 0,
+                    "2 Caras": 2, "1 Cara y 1 Sello": 1, "2 Sellos": 0
+                }[evento_moneda]
+                # Cada resultado se codifica como número binario (C = 0, S = 1)
+                pesos = 2 ** np.arange(num_monedas - 1, -1, -1)
+                
+                def generar_bloque(rng, m):
+                    resultados = simular_lanzamientos("Moneda", num_monedas, m, rng)
+                    num_caras = num_monedas - resultados.sum(axis=1, dtype=np.int64)
+                    return num_caras == caras_evento, resultados @ pesos
+                
+                x_lanzamientos, frecuencias_acumuladas, conteo_codigos = simular_convergencia(
+                    generar_bloque, num_lanzamientos, 2 ** num_monedas
+                )
                 
                 # Crear gráfico de convergencia
                 fig_convergencia = go.Figure()
                 
                 fig_convergencia.add_trace(go.Scatter(
-                    x=list(range(1, num_lanzamientos + 1)),
+                    x=x_lanzamientos,
                     y=frecuencias_acumuladas,
                     mode='lines',
                     name='Frecuencia Relativa Observada',
@@ -2661,11 +2655,10 @@ elif page == "6. 🎮 Simulador de Experimentos":
                 st.markdown("### 📊 Distribución de Resultados")
                 
                 if num_monedas == 1:
-                    conteo = pd.Series(resultados).value_counts()
+                    etiquetas = ['Cara', 'Sello']
                 else:
-                    # Convertir tuplas a strings para contar
-                    resultados_str = [str(r) for r in resultados]
-                    conteo = pd.Series(resultados_str).value_counts()
+                    etiquetas = [str(r) for r in product(['C', 'S'], repeat=num_monedas)]
+                conteo = pd.Series(conteo_codigos, index=etiquetas)
                 
                 fig_dist = go.Figure(data=[go.Bar(
                     x=conteo.index,
@@ -2695,7 +2688,7 @@ elif page == "6. 🎮 Simulador de Experimentos":
         with col_config2:
             num_lanzamientos = st.select_slider(
                 "Número de lanzamientos:",
-                options=[10, 50, 100, 500, 1000, 5000, 10000],
+                options=[10, 50, 100, 500, 1000, 5000, 10000, 100000, 1000000, 10000000],
                 value=100
             )
         
@@ -2738,27 +2731,21 @@ elif page == "6. 🎮 Simulador de Experimentos":
         if st.button("🎲 Realizar Simulación", key="sim_dado"):
             with st.spinner("Simulando lanzamientos..."):
                 # Realizar simulación
-                resultados = simular_lanzamientos("Dado", num_dados, num_lanzamientos)
-                
-                # Calcular frecuencias acumuladas
-                frecuencias_acumuladas = []
-                count = 0
-                
-                for i, resultado in enumerate(resultados, 1):
+                def generar_bloque(rng, m):
+                    sumas = simular_lanzamientos("Dado", num_dados, m, rng).sum(axis=1, dtype=np.int64)
                     if num_dados == 1:
-                        if resultado in valores_evento:
-                            count += 1
-                    else:
-                        if sum(resultado) == suma_objetivo:
-                            count += 1
-                    
-                    frecuencias_acumuladas.append(count / i)
+                        return np.isin(sumas, list(valores_evento)), sumas
+                    return sumas == suma_objetivo, sumas
+                
+                x_lanzamientos, frecuencias_acumuladas, conteo_sumas = simular_convergencia(
+                    generar_bloque, num_lanzamientos, 6 * num_dados + 1
+                )
                 
                 # Crear gráfico de convergencia
                 fig_convergencia_dado = go.Figure()
                 
                 fig_convergencia_dado.add_trace(go.Scatter(
-                    x=list(range(1, num_lanzamientos + 1)),
+                    x=x_lanzamientos,
                     y=frecuencias_acumuladas,
                     mode='lines',
                     name='Frecuencia Relativa Observada',
@@ -2809,12 +2796,8 @@ elif page == "6. 🎮 Simulador de Experimentos":
                 # Distribución de resultados
                 st.markdown("### 📊 Distribución de Todos los Resultados")
                 
-                if num_dados == 1:
-                    conteo = pd.Series(resultados).value_counts().sort_index()
-                else:
-                    # Para 2 dados, mostrar distribución de sumas
-                    sumas = [sum(r) for r in resultados]
-                    conteo = pd.Series(sumas).value_counts().sort_index()
+                # Con 1 dado se cuentan las caras; con 2, la distribución de sumas
+                conteo = pd.Series(conteo_sumas).iloc[num_dados:]
                 
                 fig_dist_dado = go.Figure()
                 
@@ -2917,7 +2900,7 @@ elif page == "6. 🎮 Simulador de Experimentos":
         # Simulación
         num_giros = st.select_slider(
             "Número de giros:",
-            options=[10, 50, 100, 500, 1000, 5000, 10000],
+            options=[10, 50, 100, 500, 1000, 5000, 10000, 100000, 1000000, 10000000],
             value=100
         )
         
@@ -2927,22 +2910,21 @@ elif page == "6. 🎮 Simulador de Experimentos":
         if st.button("🎯 Girar la Rueda", key="sim_rueda"):
             with st.spinner("Girando la rueda..."):
                 # Realizar simulación
-                resultados_rueda = np.random.choice(sectores, size=num_giros, p=probabilidades_norm)
+                indice_rastrear = sectores.index(sector_rastrear)
                 
-                # Calcular frecuencias acumuladas
-                frecuencias_acumuladas_rueda = []
-                count = 0
+                def generar_bloque(rng, m):
+                    resultados_rueda = rng.choice(num_sectores, size=m, p=probabilidades_norm)
+                    return resultados_rueda == indice_rastrear, resultados_rueda
                 
-                for i, resultado in enumerate(resultados_rueda, 1):
-                    if resultado == sector_rastrear:
-                        count += 1
-                    frecuencias_acumuladas_rueda.append(count / i)
+                x_giros, frecuencias_acumuladas_rueda, conteo_sectores = simular_convergencia(
+                    generar_bloque, num_giros, num_sectores
+                )
                 
                 # Gráfico de convergencia
                 fig_conv_rueda = go.Figure()
                 
                 fig_conv_rueda.add_trace(go.Scatter(
-                    x=list(range(1, num_giros + 1)),
+                    x=x_giros,
                     y=frecuencias_acumuladas_rueda,
                     mode='lines',
                     name='Frecuencia Relativa Observada',
@@ -2983,7 +2965,7 @@ elif page == "6. 🎮 Simulador de Experimentos":
                 # Distribución de todos los sectores
                 st.markdown("### 📊 Distribución de Todos los Sectores")
                 
-                conteo_rueda = pd.Series(resultados_rueda).value_counts()
+                conteo_rueda = pd.Series(conteo_sectores, index=sectores)
                 
                 fig_dist_rueda = go.Figure()
                 
@@ -1,11 +1,14 @@
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from scipy import stats
+from estadistica import anova, perfil
+from estadistica.anova import compute_anova, anova_transformada, f_replicas, potencia_anova, ALPHA_MC
+from estadistica.importaciones import importar
+
+compute_anova = perfil.medido(compute_anova)
+potencia_anova = perfil.medido(potencia_anova)
 
 # ─────────────────────────────────────────
 # CONFIGURACIÓN DE PÁGINA
@@ -54,6 +57,7 @@ page = st.sidebar.radio("📌 Navegar a:", [
     "2. 🤔 ¿Por qué no solo comparar medias?",
     "3. 🔬 Varianza Entre vs. Dentro",
 ])
+perfil.seccion(page)
 
 COLORS = ["#4361ee", "#f72585", "#4cc9f0", "#7209b7"]
 GROUP_NAMES = ["Grupo A", "Grupo B", "Grupo C", "Grupo D"]
@@ -61,33 +65,17 @@ GROUP_NAMES = ["Grupo A", "Grupo B", "Grupo C", "Grupo D"]
 # ─────────────────────────────────────────
 # FUNCIONES AUXILIARES
 # ─────────────────────────────────────────
-def compute_anova(groups):
-    """Calcula todos los componentes de ANOVA de una sola vía."""
-    all_data  = np.concatenate(groups)
-    grand_mean = np.mean(all_data)
-    N          = len(all_data)
-    k          = len(groups)
-    ns         = [len(g) for g in groups]
-    means      = [np.mean(g) for g in groups]
-
-    SSF = sum(ns[i] * (means[i] - grand_mean)**2 for i in range(k))
-    SSE = sum(np.sum((g - means[i])**2) for i, g in enumerate(groups))
-    SST = SSF + SSE
-
-    dfB  = k - 1
-    dfW  = N - k
-    MSB  = SSF / dfB
-    MSW  = SSE / dfW if dfW > 0 else np.nan
-    F    = MSB / MSW if MSW and MSW > 0 else np.nan
-    p    = 1 - stats.f.cdf(F, dfB, dfW) if not np.isnan(F) else np.nan
-
-    return {
-        "grand_mean": grand_mean, "N": N, "k": k,
-        "ns": ns, "means": means,
-        "SSF": SSF, "SSE": SSE, "SST": SST,
-        "dfB": dfB, "dfW": dfW,
-        "MSB": MSB, "MSW": MSW, "F": F, "p": p
-    }
+@st.cache_resource
+def base_experimento(k, n, semilla=99):
+    """Datos N(0, 1) del experimento (k × n) y sus estadísticos suficientes por grupo: n, Σz y Σz²."""
+    return anova.base_experimento(k, n, semilla)
+
+REPLICAS_MC = 2000   # experimentos simulados por la simulación Monte Carlo
+
+@st.cache_resource
+def replicas_normales(replicas, k, n, semilla=0):
+    """Medias por grupo y SSE de `replicas` experimentos N(0, 1), generados como un arreglo replicas × k × n."""
+    return anova.replicas_normales(replicas, k, n, semilla)
 
 def violin_plot(groups, title="", show_grand_mean=True):
     fig = go.Figure()
@@ -283,80 +271,85 @@ elif page == "2. 🤔 ¿Por qué no solo comparar medias?":
     Lo único que cambia es la **dispersión de los datos**.
     """)
 
-    np.random.seed(7)
-
-    sigma_compact = st.slider(
-        "Dispersión interna de los grupos (σ)",
-        min_value=1.0,
-        max_value=15.0,
-        value=3.0,
-        step=0.5,
-        help="Controla qué tan dispersos son los datos dentro de cada grupo."
-    )
-
-    g_compact = [
-        np.random.normal(m, sigma_compact, 40)
-        for m in medias_ejemplo
-    ]
-
-    g_spread = [
-        np.random.normal(m, 12, 40)
-        for m in medias_ejemplo
-    ]
-
-    col1, col2 = st.columns(2)
-
-    # -----------------------
-    # Caso 1
-    # -----------------------
-    with col1:
-
-        st.subheader(f"📦 Grupos compactos (σ = {sigma_compact:.1f})")
-
-        fig = violin_plot(g_compact, "")
-        st.plotly_chart(fig, use_container_width=True)
-
-        res = compute_anova(g_compact)
-
-        st.metric("F", f"{res['F']:.2f}")
-        st.metric("p-valor", f"{res['p']:.4f}")
-
-        if res["p"] < 0.05:
-            st.success(
-                "Con poca variabilidad interna, las diferencias entre medias "
-                "destacan claramente."
-            )
-        else:
-            st.warning(
-                "Aunque la dispersión es pequeña, en esta simulación no hay "
-                "evidencia suficiente para rechazar H₀."
-            )
-
-    # -----------------------
-    # Caso 2
-    # -----------------------
-    with col2:
-
-        st.subheader("🌊 Grupos muy dispersos (σ = 12)")
-
-        fig = violin_plot(g_spread, "")
-        st.plotly_chart(fig, use_container_width=True)
-
-        res = compute_anova(g_spread)
-
-        st.metric("F", f"{res['F']:.2f}")
-        st.metric("p-valor", f"{res['p']:.4f}")
-
-        if res["p"] < 0.05:
-            st.success(
-                "A pesar de la gran dispersión, la diferencia entre medias sigue "
-                "siendo suficientemente grande."
-            )
-        else:
-            st.error(
-                "La variabilidad dentro de los grupos oculta las diferencias "
-                "entre las medias."
-            )
+    @perfil.fragmento
+    def comparar_dispersion():
+        """Mismas medias con poca y con mucha dispersión (σ del slider)."""
+        np.random.seed(7)
+
+        sigma_compact = st.slider(
+            "Dispersión interna de los grupos (σ)",
+            min_value=1.0,
+            max_value=15.0,
+            value=3.0,
+            step=0.5,
+            help="Controla qué tan dispersos son los datos dentro de cada grupo."
+        )
+
+        g_compact = [
+            np.random.normal(m, sigma_compact, 40)
+            for m in medias_ejemplo
+        ]
+
+        g_spread = [
+            np.random.normal(m, 12, 40)
+            for m in medias_ejemplo
+        ]
+
+        col1, col2 = st.columns(2)
+
+        # -----------------------
+        # Caso 1
+        # -----------------------
+        with col1:
+
+            st.subheader(f"📦 Grupos compactos (σ = {sigma_compact:.1f})")
+
+            fig = violin_plot(g_compact, "")
+            st.plotly_chart(fig, use_container_width=True)
+
+            res = compute_anova(g_compact)
+
+            st.metric("F", f"{res['F']:.2f}")
+            st.metric("p-valor", f"{res['p']:.4f}")
+
+            if res["p"] < 0.05:
+                st.success(
+                    "Con poca variabilidad interna, las diferencias entre medias "
+                    "destacan claramente."
+                )
+            else:
+                st.warning(
+                    "Aunque la dispersión es pequeña, en esta simulación no hay "
+                    "evidencia suficiente para rechazar H₀."
+                )
+
+        # -----------------------
+        # Caso 2
+        # -----------------------
+        with col2:
+
+            st.subheader("🌊 Grupos muy dispersos (σ = 12)")
+
+            fig = violin_plot(g_spread, "")
+            st.plotly_chart(fig, use_container_width=True)
+
+            res = compute_anova(g_spread)
+
+            st.metric("F", f"{res['F']:.2f}")
+            st.metric("p-valor", f"{res['p']:.4f}")
+
+            if res["p"] < 0.05:
+                st.success(
+                    "A pesar de la gran dispersión, la diferencia entre medias sigue "
+                    "siendo suficientemente grande."
+                )
+            else:
+                st.error(
+                    "La variabilidad dentro de los grupos oculta las diferencias "
+                    "entre las medias."
+                )
+
+    comparar_dispersion()
 
     st.markdown("---")
 
@@ -434,72 +427,140 @@ elif page == "3. 🔬 Varianza Entre vs. Dentro":
     st.markdown("---")
     st.markdown("### 🎛️ Experimenta con los datos")
 
-    np.random.seed(99)
-    col_s1, col_s2 = st.columns(2)
-    with col_s1:
-        sep   = st.slider("Separación entre grupos (señal)", 0.0, 20.0, 8.0, 0.5)
-    with col_s2:
-        noise = st.slider("Dispersión dentro de grupos (ruido)", 0.5, 15.0, 3.0, 0.5)
-
-    base_means = np.array([0, 1, 2, 3]) * sep / 3 + 50
-    groups = [np.random.normal(m, noise, 30) for m in base_means]
-    res    = compute_anova(groups)
-
-    # ── GRÁFICO PRINCIPAL ──────────────────────────────
-    fig = make_subplots(rows=1, cols=2,
-                        subplot_titles=("Distribución de los Grupos", "Descomposición de la Varianza"),
-                        column_widths=[0.6, 0.4])
+    @perfil.fragmento
+    def experimento_varianza():
+        """ANOVA de grupos simulados con la señal y el ruido elegidos."""
+        col_s1, col_s2 = st.columns(2)
+        with col_s1:
+            sep   = st.slider("Separación entre grupos (señal)", 0.0, 20.0, 8.0, 0.5)
+        with col_s2:
+            noise = st.slider("Dispersión dentro de grupos (ruido)", 0.5, 15.0, 3.0, 0.5)
+
+        base_means = np.array([0, 1, 2, 3]) * sep / 3 + 50
+        z_base, ns_base, suma_z, cuadrados_z = base_experimento(len(base_means), 30)
+        res    = anova_transformada(base_means, noise, ns_base, suma_z, cuadrados_z)
+        groups = list(base_means[:, None] + noise * z_base)
+
+        # ── GRÁFICO PRINCIPAL ──────────────────────────────
+        fig = make_subplots(rows=1, cols=2,
+                            subplot_titles=("Distribución de los Grupos", "Descomposición de la Varianza"),
+                            column_widths=[0.6, 0.4])
+
+        for i, g in enumerate(groups):
+            fig.add_trace(go.Violin(
+                y=g, name=GROUP_NAMES[i],
+                box_visible=True, meanline_visible=True,
+                fillcolor=COLORS[i], opacity=0.65,
+                line_color="white", showlegend=True,
+                points="all", pointpos=0,
+                marker=dict(size=3, opacity=0.4)
+            ), row=1, col=1)
+
+        fig.add_hline(y=res["grand_mean"], line_dash="dash", line_color="#ff6b6b",
+                      line_width=2.5, row=1, col=1,
+                      annotation_text=f"Gran Media={res['grand_mean']:.1f}",
+                      annotation_position="top right")
 
-    for i, g in enumerate(groups):
-        fig.add_trace(go.Violin(
-            y=g, name=GROUP_NAMES[i],
-            box_visible=True, meanline_visible=True,
-            fillcolor=COLORS[i], opacity=0.65,
-            line_color="white", showlegend=True,
-            points="all", pointpos=0,
-            marker=dict(size=3, opacity=0.4)
-        ), row=1, col=1)
-
-    fig.add_hline(y=res["grand_mean"], line_dash="dash", line_color="#ff6b6b",
-                  line_width=2.5, row=1, col=1,
-                  annotation_text=f"Gran Media={res['grand_mean']:.1f}",
-                  annotation_position="top right")
-
-    fig.add_trace(go.Bar(
-        x=["SSF (Factor)", "SSE (Error)", "SST (Total)"],
-        y=[res["SSF"], res["SSE"], res["SST"]],
-        marker_color=["#4361ee", "#f72585", "#7209b7"],
-        text=[f"{res['SSF']:.1f}", f"{res['SSE']:.1f}", f"{res['SST']:.1f}"],
-        textposition="outside",
-        showlegend=False
-    ), row=1, col=2)
-
-    fig.update_layout(height=430, plot_bgcolor="white", paper_bgcolor="white",
-                      font=dict(family="Arial", size=12),
-                      legend=dict(orientation="h", y=-0.18))
-    fig.update_yaxes(gridcolor="#e0e0e0")
-    st.plotly_chart(fig, use_container_width=True)
-
-    # ── MÉTRICAS ──────────────────────────────────────
-    c1, c2, c3, c4, c5 = st.columns(5)
-    c1.metric("SSF (Entre)", f"{res['SSF']:.1f}")
-    c2.metric("SSE (Dentro)", f"{res['SSE']:.1f}")
-    c3.metric("SST (Total)", f"{res['SST']:.1f}")
-    c4.metric("Estadístico F", f"{res['F']:.2f}")
-    c5.metric("p-valor", f"{res['p']:.4f}")
+        fig.add_trace(go.Bar(
+            x=["SSF (Factor)", "SSE (Error)", "SST (Total)"],
+            y=[res["SSF"], res["SSE"], res["SST"]],
+            marker_color=["#4361ee", "#f72585", "#7209b7"],
+            text=[f"{res['SSF']:.1f}", f"{res['SSE']:.1f}", f"{res['SST']:.1f}"],
+            textposition="outside",
+            showlegend=False
+        ), row=1, col=2)
+
+        fig.update_layout(height=430, plot_bgcolor="white", paper_bgcolor="white",
+                          font=dict(family="Arial", size=12),
+                          legend=dict(orientation="h", y=-0.18))
+        fig.update_yaxes(gridcolor="#e0e0e0")
+        st.plotly_chart(fig, use_container_width=True)
 
-    st.markdown("---")
+        # ── MÉTRICAS ──────────────────────────────────────
+        c1, c2, c3, c4, c5 = st.columns(5)
+        c1.metric("SSF (Entre)", f"{res['SSF']:.1f}")
+        c2.metric("SSE (Dentro)", f"{res['SSE']:.1f}")
+        c3.metric("SST (Total)", f"{res['SST']:.1f}")
+        c4.metric("Estadístico F", f"{res['F']:.2f}")
+        c5.metric("p-valor", f"{res['p']:.4f}")
+
+        st.markdown("---")
+
+        # ── SIMULACIÓN MONTE CARLO ────────────────────────
+        st.markdown("### 🎲 ¿Qué pasaría si repitiéramos el experimento miles de veces?")
+        st.markdown(f"""
+        Simulamos **{REPLICAS_MC:,} experimentos** con la misma señal y el mismo ruido. Bajo H₀ (sin separación)
+        los valores de F siguen la distribución F teórica; la **potencia** es la proporción de experimentos
+        en los que ANOVA detecta la diferencia (p < {ALPHA_MC}).
+        """)
+
+        stats      = importar('scipy.stats')
+        n_grupo    = len(groups[0])
+        k_grupos   = len(groups)
+        medias_z, sse_z = replicas_normales(REPLICAS_MC, k_grupos, n_grupo)
+        df1, df2   = k_grupos - 1, k_grupos * (n_grupo - 1)
+        f_critico  = stats.f.ppf(1 - ALPHA_MC, df1, df2)
+        F_nula     = f_replicas(np.full(k_grupos, 50.0), noise, n_grupo, medias_z, sse_z)
+        F_actual   = f_replicas(base_means, noise, n_grupo, medias_z, sse_z)
+
+        fig_mc = make_subplots(rows=1, cols=2,
+                               subplot_titles=("Distribución de F simulada", "Potencia de la prueba"),
+                               column_widths=[0.5, 0.5])
+
+        f_max = max(np.percentile(F_actual, 99), f_critico * 2)
+        bins  = dict(start=0, end=f_max, size=f_max / 60)
+        fig_mc.add_trace(go.Histogram(x=F_nula, xbins=bins, histnorm="probability density",
+                                      name="F bajo H₀ (simulada)", marker_color="#adb5bd", opacity=0.7),
+                         row=1, col=1)
+        if sep > 0:
+            fig_mc.add_trace(go.Histogram(x=F_actual, xbins=bins, histnorm="probability density",
+                                          name="F con la separación actual", marker_color="#4361ee", opacity=0.6),
+                             row=1, col=1)
+        x_f = np.linspace(0.01, f_max, 300)
+        fig_mc.add_trace(go.Scatter(x=x_f, y=stats.f.pdf(x_f, df1, df2), mode="lines",
+                                    name=f"F({df1}, {df2}) teórica", line=dict(color="#ff6b6b", width=2.5)),
+                         row=1, col=1)
+        fig_mc.add_vline(x=f_critico, line_dash="dot", line_color="#2d3748", row=1, col=1,
+                         annotation_text=f"F crítico = {f_critico:.2f}", annotation_position="top right")
+
+        seps_grid   = np.linspace(0, 20, 21)
+        noises_grid = np.linspace(0.5, 15, 21)
+        pot_sep   = [potencia_anova(np.array([0, 1, 2, 3]) * sep_i / 3 + 50, noise, n_grupo, medias_z, sse_z)
+                     for sep_i in seps_grid]
+        pot_noise = [potencia_anova(base_means, noise_i, n_grupo, medias_z, sse_z) for noise_i in noises_grid]
+        fig_mc.add_trace(go.Scatter(x=seps_grid, y=pot_sep, mode="lines+markers",
+                                    name=f"vs. separación (ruido = {noise})", line=dict(color="#4361ee")),
+                         row=1, col=2)
+        fig_mc.add_trace(go.Scatter(x=noises_grid, y=pot_noise, mode="lines+markers",
+                                    name=f"vs. ruido (separación = {sep})", line=dict(color="#f72585")),
+                         row=1, col=2)
+        fig_mc.add_hline(y=ALPHA_MC, line_dash="dot", line_color="#adb5bd", row=1, col=2)
+
+        fig_mc.update_layout(height=420, barmode="overlay", plot_bgcolor="white", paper_bgcolor="white",
+                             font=dict(family="Arial", size=12), legend=dict(orientation="h", y=-0.2))
+        fig_mc.update_xaxes(title_text="F", row=1, col=1)
+        fig_mc.update_xaxes(title_text="Separación / Ruido", row=1, col=2)
+        fig_mc.update_yaxes(title_text="Potencia", range=[0, 1.05], row=1, col=2)
+        fig_mc.update_yaxes(gridcolor="#e0e0e0")
+        st.plotly_chart(fig_mc, use_container_width=True)
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Potencia con la configuración actual", f"{np.mean(F_actual > f_critico):.1%}")
+        m2.metric("Rechazos bajo H₀ (tasa de error tipo I)", f"{np.mean(F_nula > f_critico):.1%}")
+        m3.metric("F crítico (α = 0.05)", f"{f_critico:.2f}")
+
+        st.markdown("---")
+        st.markdown("### 🧠 Regla Intuitiva")
+        ratio = res["SSF"] / res["SST"] * 100 if res["SST"] > 0 else 0
+        st.markdown(f"""
+        <div class="concept-box">
+        En este ejemplo, el <b>{ratio:.1f}%</b> de la variabilidad total se explica por las diferencias
+        <b>entre grupos</b> (SSF), y el <b>{100-ratio:.1f}%</b> restante es variabilidad <i>dentro</i> de los grupos (SSE).<br><br>
+        👉 <b>Cuanto mayor sea SSF respecto a SSE, más evidencia tenemos de que los grupos son realmente distintos.</b>
+        </div>
+        """, unsafe_allow_html=True)
 
-    st.markdown("---")
-    st.markdown("### 🧠 Regla Intuitiva")
-    ratio = res["SSF"] / res["SST"] * 100 if res["SST"] > 0 else 0
-    st.markdown(f"""
-    <div class="concept-box">
-    En este ejemplo, el <b>{ratio:.1f}%</b> de la variabilidad total se explica por las diferencias
-    <b>entre grupos</b> (SSF), y el <b>{100-ratio:.1f}%</b> restante es variabilidad <i>dentro</i> de los grupos (SSE).<br><br>
-    👉 <b>Cuanto mayor sea SSF respecto a SSE, más evidencia tenemos de que los grupos son realmente distintos.</b>
-    </div>
-    """, unsafe_allow_html=True)
+    experimento_varianza()
 
 
 # ─────────────────────────────────────────
@@ -0,0 +1,35 @@
+import streamlit as st
+from estadistica import perfil, sesion
+
+# Punto de entrada único del curso: streamlit run curso.py
+# Los nueve módulos corren en el mismo servidor, así que numpy, pandas y plotly
+# se cargan una sola vez y los datasets en st.cache_resource se comparten entre
+# todas las páginas y sesiones. Cada módulo se puede seguir ejecutando por separado.
+
+paginas = {
+    "Estadística Descriptiva": [
+        st.Page("1-fundamentos.py", title="Conceptos Básicos", icon="📈", url_path="fundamentos", default=True),
+        st.Page("2_tipos_de_datos.py", title="Tipos de Datos", icon="📊", url_path="tipos-de-datos"),
+        st.Page("3-datos_no_agrupados.py", title="Datos No Agrupados", icon="📋", url_path="datos-no-agrupados"),
+        st.Page("4-datos_agrupados.py", title="Datos Agrupados", icon="📦", url_path="datos-agrupados"),
+        st.Page("5-univariado.py", title="Medidas Descriptivas", icon="📏", url_path="univariado"),
+        st.Page("6-Bivariado.py", title="Análisis Bivariado", icon="🔗", url_path="bivariado"),
+    ],
+    "Probabilidad": [
+        st.Page("7-Tecnicas de conteo.py", title="Técnicas de Conteo", icon="🎲", url_path="tecnicas-de-conteo"),
+        st.Page("8-intro-probabilidad.py", title="Introducción a la Probabilidad", icon="🎯", url_path="probabilidad"),
+    ],
+    "Inferencia": [
+        st.Page("9-ANOVA.py", title="ANOVA", icon="📐", url_path="anova"),
+    ],
+}
+
+# Perfil opcional de cada rerun (ESTADISTICA_PERFIL=perfil.jsonl o perfil.prom)
+perfil.instrumentar_streamlit()
+pagina = st.navigation(paginas)
+with perfil.rerun(pagina.title, st.session_state):
+    try:
+        pagina.run()
+    finally:
+        # Presupuesto de memoria por sesión (ESTADISTICA_PRESUPUESTO_SESION)
+        sesion.aplicar_presupuesto(st.session_state)
@@ -0,0 +1,62 @@
+"""Núcleo de cálculo del curso de Fundamentos de Estadística.
+
+Funciones y clases sin Streamlit ni librerías de gráficos, para usarlas desde
+las páginas, scripts, pruebas de rendimiento o procesos de trabajo. Los
+submódulos se importan la primera vez que se usan, por ejemplo:
+
+    from estadistica import calcular_regresion   # solo importa estadistica.bivariada
+"""
+import importlib
+
+SUBMODULOS = ('agrupadas', 'anova', 'bivariada', 'carga', 'conteo', 'datos', 'descriptiva', 'figuras',
+              'frecuencias', 'importaciones', 'perfil', 'probabilidad', 'rendimiento', 'sesion')
+
+# Nombre público -> submódulo que lo define
+_EXPORTACIONES = {
+    'sturges_rule': 'agrupadas',
+    'calculate_amplitude': 'agrupadas',
+    'calcular_bordes': 'agrupadas',
+    'contar_por_intervalos': 'agrupadas',
+    'tabla_desde_conteos': 'agrupadas',
+    'estilo_tabla_agrupada': 'agrupadas',
+    'generar_tabla_agrupada': 'agrupadas',
+    'generar_tabla_agrupada_desde_archivo': 'agrupadas',
+    'anova_por_etiquetas': 'anova',
+    'anova_desde_grupos': 'anova',
+    'anova_desde_sumas': 'anova',
+    'anova_desde_dataframe': 'anova',
+    'compute_anova': 'anova',
+    'SumasRegresion': 'bivariada',
+    'calcular_regresion': 'bivariada',
+    'calcular_regresion_por_bloques': 'bivariada',
+    'EspacioMuestral': 'conteo',
+    'factorial': 'conteo',
+    'permutacion': 'conteo',
+    'combinacion': 'conteo',
+    'SketchCuantiles': 'descriptiva',
+    'IndiceCuantiles': 'descriptiva',
+    'AcumuladorDescriptivo': 'descriptiva',
+    'calcular_medidas': 'descriptiva',
+    'calcular_medidas_por_bloques': 'descriptiva',
+    'figura_a_bytes': 'figuras',
+    'AcumuladorFrecuencias': 'frecuencias',
+    'generar_tabla_frecuencia': 'frecuencias',
+    'generar_tabla_frecuencia_por_bloques': 'frecuencias',
+    'simular_lanzamientos': 'probabilidad',
+    'simular_convergencia': 'probabilidad',
+}
+
+__all__ = list(SUBMODULOS) + list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+    if nombre in SUBMODULOS:
+        return importlib.import_module(f'{__name__}.{nombre}')
+    if nombre in _EXPORTACIONES:
+        modulo = importlib.import_module(f'{__name__}.{_EXPORTACIONES[nombre]}')
+        return getattr(modulo, nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__():
+    return __all__
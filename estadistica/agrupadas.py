@@ -0,0 +1,217 @@
+"""Tablas de frecuencia para datos agrupados en intervalos, en memoria o desde archivos."""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+def sturges_rule(n):
+    """Calcula el número de intervalos sugerido por la Regla de Sturges."""
+    if n <= 1:
+        return 1
+    return int(1 + 3.322 * math.log10(n))
+
+def calculate_amplitude(min_val, max_val, k):
+    """Calcula la amplitud de clase."""
+    if k <= 0:
+        return 1.0
+    return (max_val - min_val) / k
+
+# Filas por bloque al leer archivos grandes (memoria acotada)
+TAM_BLOQUE_ARCHIVO = 1_000_000
+
+# Único directorio desde el que la app lee archivos propios; lo fija quien la despliega.
+# Sin él, la opción de archivo propio no se ofrece.
+DIRECTORIO_DATOS = os.environ.get('ESTADISTICA_DATOS', '')
+EXTENSIONES_ARCHIVO = ('.csv', '.parquet')
+
+# Formato de presentación (se aplica con un Styler, los datos quedan numéricos)
+FORMATO_TABLA_AGRUPADA = {
+    'Frecuencia Absoluta': '{:.0f}',
+    'Límite Inferior': '{:g}',
+    'Límite Superior': '{:g}',
+    'Marca de Clase ($x_i$)': '{:g}',
+    'Frecuencia Relativa': '{:.4f}',
+    'Porcentaje (%)': '{:.2f}',
+    'Frecuencia Acumulada': '{:.0f}',
+    'Frecuencia Relativa Acumulada': '{:.4f}'
+}
+
+def calcular_bordes(data_min, data_max, n, k=None, amplitud=None):
+    """
+    Calcula los bordes de los intervalos a partir del mínimo, el máximo y n.
+    
+    Solo necesita estos tres resúmenes, así que sirve tanto para datos en memoria
+    como para datos leídos por bloques. Devuelve (bordes, amplitud).
+    """
+    if k is None:
+        k = sturges_rule(n)
+    
+    rango = data_max - data_min
+    
+    if amplitud is None:
+        amplitud = calculate_amplitude(data_min, data_max, k)
+        # Redondear la amplitud a una cifra conveniente (ej: 1 decimal más que el dato)
+        if rango > 0:
+            decimal_places = max(0, -int(math.floor(math.log10(amplitud)))) + 1
+            amplitud = round(amplitud, decimal_places)
+    
+    # Los bins parten del mínimo y avanzan de amplitud en amplitud hasta cubrir el máximo
+    bins = np.arange(data_min, data_max + amplitud, amplitud)
+    
+    # Corregir la definición de los bins si es necesario
+    if bins[-1] < data_max:
+        bins = np.append(bins, bins[-1] + amplitud)
+    
+    # Asegurar que los bins son únicos y ordenados
+    return np.unique(bins), amplitud
+
+def contar_por_intervalos(data, bordes):
+    """
+    Cuenta cuántos datos caen en cada intervalo [a, b) en una sola pasada.
+    
+    La clase de cada dato se obtiene con búsqueda binaria sobre los bordes y los
+    conteos con np.bincount. Un dato igual al último borde cuenta en la última clase.
+    """
+    data = np.asarray(data, dtype=float).ravel()
+    k = len(bordes) - 1
+    clases = np.searchsorted(bordes, data, side='right') - 1
+    clases = clases[(clases >= 0) & ((clases < k) | (data == bordes[-1]))]
+    return np.bincount(np.minimum(clases, k - 1), minlength=k)
+
+def tabla_desde_conteos(bordes, conteos, n=None):
+    """Arma la tabla de frecuencias a partir de los bordes y los conteos por intervalo."""
+    if n is None:
+        n = conteos.sum()
+    # Se limpia el ruido de punto flotante de np.arange para mostrar los límites
+    limites = np.round(bordes, 10)
+    inferiores, superiores = limites[:-1], limites[1:]
+    
+    tabla = pd.DataFrame({
+        'Clase/Intervalo': [f"[{a:g}, {b:g})" for a, b in zip(inferiores, superiores)],
+        'Frecuencia Absoluta': conteos,
+        'Límite Inferior': inferiores,
+        'Límite Superior': superiores,
+        'Marca de Clase ($x_i$)': (inferiores + superiores) / 2
+    })
+    
+    # Calcular Frecuencias Relativas y Porcentajes
+    tabla['Frecuencia Relativa'] = tabla['Frecuencia Absoluta'] / n
+    tabla['Porcentaje (%)'] = tabla['Frecuencia Relativa'] * 100
+    
+    # Calcular Frecuencias Acumuladas
+    tabla['Frecuencia Acumulada'] = tabla['Frecuencia Absoluta'].cumsum()
+    tabla['Frecuencia Relativa Acumulada'] = tabla['Frecuencia Relativa'].cumsum()
+    return tabla
+
+def estilo_tabla_agrupada(tabla, total=True):
+    """Styler para mostrar la tabla: agrega la fila de totales y da formato sin copiar celda por celda."""
+    if total:
+        fila_total = pd.DataFrame({
+            'Clase/Intervalo': ['TOTAL'],
+            'Frecuencia Absoluta': [tabla['Frecuencia Absoluta'].sum()],
+            'Frecuencia Relativa': [1.0],
+            'Porcentaje (%)': [100.0]
+        }, index=['Total'])
+        tabla = pd.concat([tabla, fila_total])
+        # Índice de texto para que la fila 'Total' conviva con los números de fila
+        tabla.index = tabla.index.astype(str)
+    formato = {col: fmt for col, fmt in FORMATO_TABLA_AGRUPADA.items() if col in tabla.columns}
+    return tabla.style.format(formato, na_rep='')
+
+def generar_tabla_agrupada(data, k=None, amplitud=None):
+    """
+    Genera la tabla de frecuencia para datos agrupados.
+    
+    Los intervalos son [a, b) y parten del mínimo; el máximo siempre queda
+    dentro del último intervalo. Devuelve la tabla numérica, su versión para
+    mostrar (Styler), la amplitud y el número real de intervalos.
+    """
+    data = np.asarray(data, dtype=float)
+    n = len(data)
+    
+    bordes, amplitud = calcular_bordes(data.min(), data.max(), n, k, amplitud)
+    tabla = tabla_desde_conteos(bordes, contar_por_intervalos(data, bordes), n)
+    
+    return tabla, estilo_tabla_agrupada(tabla), amplitud, len(bordes) - 1
+
+def archivos_datos(directorio=DIRECTORIO_DATOS):
+    """Nombres de los CSV y Parquet del directorio de datos (vacío si no hay directorio)."""
+    if not directorio or not os.path.isdir(directorio):
+        return []
+    nombres = []
+    for nombre in sorted(os.listdir(directorio)):
+        try:
+            resolver_ruta_datos(nombre, directorio)
+        except ValueError:
+            continue
+        nombres.append(nombre)
+    return nombres
+
+def resolver_ruta_datos(nombre, directorio=DIRECTORIO_DATOS):
+    """Ruta real de un archivo del directorio de datos; ValueError si queda fuera de él o no es CSV/Parquet."""
+    if not directorio:
+        raise ValueError("No hay un directorio de datos configurado (ESTADISTICA_DATOS).")
+    base = os.path.realpath(directorio)
+    ruta = os.path.realpath(os.path.join(base, nombre))
+    # realpath resuelve '..' y enlaces simbólicos antes de comparar
+    if os.path.commonpath([base, ruta]) != base:
+        raise ValueError(f"El archivo debe estar dentro del directorio de datos: {nombre}")
+    if not ruta.lower().endswith(EXTENSIONES_ARCHIVO) or not os.path.isfile(ruta):
+        raise ValueError(f"No se encontró el archivo CSV o Parquet: {nombre}")
+    return ruta
+
+def columnas_archivo(ruta):
+    """Nombres de columna de un CSV o Parquet sin leer los datos."""
+    if str(ruta).lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.read_schema(ruta).names
+    return pd.read_csv(ruta, nrows=0).columns.tolist()
+
+def leer_columna_por_bloques(ruta, columna, tam_bloque=TAM_BLOQUE_ARCHIVO):
+    """Recorre una columna de un CSV o Parquet en bloques de tam_bloque filas (sin valores vacíos)."""
+    if str(ruta).lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        lotes = (lote.column(0).to_numpy(zero_copy_only=False)
+                 for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tam_bloque, columns=[columna]))
+    else:
+        lotes = (bloque[columna].to_numpy()
+                 for bloque in pd.read_csv(ruta, usecols=[columna], chunksize=tam_bloque))
+    for valores in lotes:
+        valores = np.asarray(pd.to_numeric(valores, errors='coerce'), dtype=float)
+        yield valores[~np.isnan(valores)]
+
+def resumen_por_bloques(bloques):
+    """Primera pasada: mínimo, máximo y n de datos que llegan por bloques."""
+    data_min, data_max, n = np.inf, -np.inf, 0
+    for bloque in bloques:
+        if len(bloque) == 0:
+            continue
+        data_min = min(data_min, bloque.min())
+        data_max = max(data_max, bloque.max())
+        n += len(bloque)
+    return data_min, data_max, n
+
+def generar_tabla_agrupada_desde_archivo(ruta, columna, k=None, amplitud=None,
+                                         tam_bloque=TAM_BLOQUE_ARCHIVO, resumen=None):
+    """
+    Genera la tabla de frecuencia agrupada de una columna de un CSV o Parquet.
+    
+    Recorre el archivo dos veces por bloques, sin cargarlo completo: la primera
+    pasada obtiene mínimo, máximo y n para elegir los bordes (Sturges y amplitud)
+    y la segunda suma los conteos de cada bloque. Si ya se tiene el resumen
+    (mínimo, máximo, n) se puede pasar para ahorrar la primera pasada.
+    """
+    if resumen is None:
+        resumen = resumen_por_bloques(leer_columna_por_bloques(ruta, columna, tam_bloque))
+    data_min, data_max, n = resumen
+    if n == 0:
+        raise ValueError(f"La columna '{columna}' no tiene datos numéricos.")
+    
+    bordes, amplitud = calcular_bordes(data_min, data_max, n, k, amplitud)
+    conteos = np.zeros(len(bordes) - 1, dtype=np.int64)
+    for bloque in leer_columna_por_bloques(ruta, columna, tam_bloque):
+        conteos += contar_por_intervalos(bloque, bordes)
+    
+    tabla = tabla_desde_conteos(bordes, conteos, n)
+    return tabla, estilo_tabla_agrupada(tabla), amplitud, len(bordes) - 1
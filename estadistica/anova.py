@@ -0,0 +1,149 @@
+"""ANOVA de una vía a partir de estadísticos suficientes por grupo."""
+import numpy as np
+import pandas as pd
+
+from estadistica.importaciones import importar
+
+ALPHA_MC = 0.05
+
+def _distribucion_f():
+    """Distribución F de scipy, importada solo cuando se necesita un valor p o un valor crítico."""
+    return importar('scipy.stats').f
+
+def anova_por_etiquetas(valores, etiquetas):
+    """ANOVA de una vía sobre un arreglo plano de valores y sus etiquetas de grupo.
+
+    Las etiquetas se factorizan a códigos 0..k-1 (en orden de aparición) y las
+    reducciones por grupo se hacen con np.bincount, sin bucles de Python. El
+    resultado trae las etiquetas en "grupos", en el mismo orden que "ns" y "means".
+    """
+    valores = np.asarray(valores, dtype=float).ravel()
+    etiquetas = np.asarray(etiquetas).ravel()
+    if etiquetas.size != valores.size:
+        raise ValueError("valores y etiquetas deben tener el mismo tamaño.")
+
+    # Las etiquetas faltantes (código -1) no pertenecen a ningún grupo
+    codigos, grupos = pd.factorize(etiquetas)
+    if (codigos < 0).any():
+        valores, codigos = valores[codigos >= 0], codigos[codigos >= 0]
+    return _anova_codigos(valores, codigos, grupos)
+
+def _anova_codigos(valores, codigos, grupos):
+    """ANOVA con códigos de grupo 0..len(grupos)-1 en dos pasadas de np.bincount.
+
+    Primero las medias de cada grupo y luego Σ(x - x̄ᵢ)², que no pierde
+    precisión cuando las medias son grandes frente a la dispersión.
+    """
+    if valores.size == 0:
+        raise ValueError("ANOVA necesita al menos un valor.")
+    k       = len(grupos)
+    ns      = np.bincount(codigos, minlength=k)
+    sumas   = np.bincount(codigos, weights=valores, minlength=k)
+    medias  = np.divide(sumas, ns, out=np.full(k, np.nan), where=ns > 0)
+    desvios = valores - medias[codigos]
+    sse     = np.bincount(codigos, weights=desvios * desvios, minlength=k)
+    return anova_desde_grupos(ns, medias, sse, grupos)
+
+def anova_desde_grupos(ns, medias, sse, grupos=None):
+    """ANOVA de una vía a partir de n, la media y Σ(x - x̄ᵢ)² de cada grupo; el costo es O(k).
+
+    SSF se calcula como Σ nᵢ·(x̄ᵢ - x̄)² y SST = SSF + SSE, así que ninguna suma
+    de cuadrados sale de restar dos números grandes. Los grupos vacíos (n = 0)
+    se conservan en "ns" y "means" (con media NaN) pero no cuentan en k ni en
+    los grados de libertad.
+    """
+    ns, medias, sse = np.asarray(ns), np.asarray(medias, dtype=float), np.asarray(sse, dtype=float)
+    grupos = np.arange(len(ns)) if grupos is None else np.asarray(grupos)
+
+    presentes = ns > 0
+    if not presentes.any():
+        raise ValueError("ANOVA necesita al menos un grupo con observaciones.")
+    medias = np.where(presentes, medias, np.nan)
+
+    N          = int(ns.sum())
+    k          = int(presentes.sum())
+    grand_mean = np.sum(ns[presentes] * medias[presentes]) / N
+
+    SSF = np.sum(ns[presentes] * (medias[presentes] - grand_mean) ** 2)
+    SSE = np.sum(sse[presentes])
+    SST = SSF + SSE
+
+    dfB  = k - 1
+    dfW  = N - k
+    MSB  = SSF / dfB if dfB > 0 else np.nan
+    MSW  = SSE / dfW if dfW > 0 else np.nan
+    F    = MSB / MSW if MSW and MSW > 0 else np.nan
+    p    = _distribucion_f().sf(F, dfB, dfW) if not np.isnan(F) else np.nan
+
+    return {
+        "grand_mean": grand_mean, "N": N, "k": k,
+        "grupos": grupos, "ns": ns, "means": medias,
+        "SSF": SSF, "SSE": SSE, "SST": SST,
+        "dfB": dfB, "dfW": dfW,
+        "MSB": MSB, "MSW": MSW, "F": F, "p": p
+    }
+
+def anova_desde_sumas(ns, sumas, cuadrados, centro=0.0):
+    """ANOVA de una vía a partir de los estadísticos suficientes por grupo: n, Σx y Σx².
+
+    Las sumas pueden ser de los datos desplazados (x - centro). Σ(x - x̄ᵢ)² se
+    obtiene como Σx² - (Σx)²/n dentro de cada grupo, que solo es preciso si el
+    centro está cerca de los datos; con los datos a mano, mejor anova_por_etiquetas.
+    """
+    ns, sumas, cuadrados = np.asarray(ns), np.asarray(sumas, dtype=float), np.asarray(cuadrados, dtype=float)
+    presentes = ns > 0
+    medias = centro + np.divide(sumas, ns, out=np.full(len(ns), np.nan), where=presentes)
+    sse = np.where(presentes, np.maximum(cuadrados - np.divide(sumas ** 2, ns, out=np.zeros(len(ns)), where=presentes), 0.0), 0.0)
+    return anova_desde_grupos(ns, medias, sse)
+
+def anova_desde_dataframe(df, valor, grupo):
+    """ANOVA de una vía sobre un DataFrame en formato largo (una fila por observación)."""
+    return anova_por_etiquetas(df[valor].to_numpy(), df[grupo].to_numpy())
+
+def compute_anova(groups):
+    """Calcula todos los componentes de ANOVA de una sola vía ("ns" y "means" en el orden de groups)."""
+    ns = [len(g) for g in groups]
+    valores = np.concatenate([np.asarray(g, dtype=float).ravel() for g in groups]) if groups else np.empty(0)
+    return _anova_codigos(valores, np.repeat(np.arange(len(groups)), ns), np.arange(len(groups)))
+
+def base_experimento(k, n, semilla=99):
+    """Datos N(0, 1) del experimento (k × n) y sus estadísticos suficientes por grupo: n, Σz y Σz²."""
+    z = np.random.RandomState(semilla).standard_normal((k, n))
+    return z, np.full(k, n), z.sum(axis=1), (z * z).sum(axis=1)
+
+def anova_transformada(medias_pob, sigma, ns, suma_z, cuadrados_z):
+    """ANOVA de los grupos x = media + σ·z usando solo los estadísticos suficientes de z, en O(k).
+
+    Mover la separación o el ruido es una transformación afín de z: la media de
+    cada grupo es media + σ·z̄ᵢ y su suma de cuadrados interna es σ²·Σ(z - z̄ᵢ)²,
+    así que no hace falta tocar los datos.
+    """
+    ns = np.asarray(ns)
+    medias = np.asarray(medias_pob, dtype=float) + sigma * suma_z / ns
+    sse = sigma ** 2 * np.maximum(cuadrados_z - suma_z ** 2 / ns, 0.0)
+    return anova_desde_grupos(ns, medias, sse)
+
+def replicas_normales(replicas, k, n, semilla=0):
+    """Medias por grupo y SSE de `replicas` experimentos N(0, 1), generados como un arreglo replicas × k × n."""
+    z = np.random.default_rng(semilla).standard_normal((replicas, k, n))
+    medias_z = z.mean(axis=2)
+    sse_z = ((z - medias_z[..., None]) ** 2).sum(axis=(1, 2))
+    return medias_z, sse_z
+
+def f_replicas(medias_pob, sigma, n, medias_z, sse_z):
+    """Estadístico F de cada réplica con medias poblacionales y σ dadas, en una pasada vectorizada.
+
+    Cada réplica es medias_pob + σ·Z, así que sus medias son medias_pob + σ·Z̄
+    y su SSE es σ²·SSE(Z): no hace falta volver a generar los datos.
+    """
+    medias = np.asarray(medias_pob)[None, :] + sigma * medias_z
+    k = medias.shape[1]
+    SSF = n * ((medias - medias.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    SSE = sigma ** 2 * sse_z
+    return (SSF / (k - 1)) / (SSE / (k * (n - 1)))
+
+def potencia_anova(medias_pob, sigma, n, medias_z, sse_z, alpha=ALPHA_MC):
+    """Proporción de réplicas en las que ANOVA rechaza H₀ al nivel alpha."""
+    k = medias_z.shape[1]
+    f_critico = _distribucion_f().ppf(1 - alpha, k - 1, k * (n - 1))
+    return np.mean(f_replicas(medias_pob, sigma, n, medias_z, sse_z) > f_critico)
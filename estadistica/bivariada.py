@@ -0,0 +1,77 @@
+"""Regresión lineal simple a partir de estadísticos suficientes combinables."""
+import numpy as np
+
+class SumasRegresion:
+    """Estadísticos suficientes de una regresión lineal simple, combinables por bloques.
+
+    Guarda n, las medias de x e y y las sumas centradas Sxx, Syy y Sxy. Contienen
+    la misma información que (n, Σx, Σy, Σx², Σy², Σxy) pero se combinan sin
+    cancelación numérica (fórmula de Chan), así que sirven para millones de
+    pares leídos por bloques o repartidos entre procesos.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.x_mean = self.y_mean = 0.0
+        self.sxx = self.syy = self.sxy = 0.0
+
+    def actualizar(self, x, y):
+        """Agrega un bloque de pares (x, y)."""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) == 0:
+            return self
+        x_mean, y_mean = x.mean(), y.mean()
+        dx, dy = x - x_mean, y - y_mean
+        self._combinar(len(x), x_mean, y_mean, np.dot(dx, dx), np.dot(dy, dy), np.dot(dx, dy))
+        return self
+
+    def combinar(self, otro):
+        """Combina con los estadísticos de otro bloque."""
+        self._combinar(otro.n, otro.x_mean, otro.y_mean, otro.sxx, otro.syy, otro.sxy)
+        return self
+
+    def _combinar(self, nb, x_mean_b, y_mean_b, sxx_b, syy_b, sxy_b):
+        if nb == 0:
+            return
+        na = self.n
+        n = na + nb
+        dx = x_mean_b - self.x_mean
+        dy = y_mean_b - self.y_mean
+        factor = na * nb / n
+        self.sxx += sxx_b + dx * dx * factor
+        self.syy += syy_b + dy * dy * factor
+        self.sxy += sxy_b + dx * dy * factor
+        self.x_mean += dx * nb / n
+        self.y_mean += dy * nb / n
+        self.n = n
+
+    def resultado(self):
+        """Coeficientes y métricas de la recta de mínimos cuadrados."""
+        n = self.n
+        b1 = self.sxy / self.sxx if self.sxx > 0 else np.nan
+        b0 = self.y_mean - b1 * self.x_mean
+        r = self.sxy / np.sqrt(self.sxx * self.syy) if self.sxx > 0 and self.syy > 0 else np.nan
+        sse = max(self.syy - b1 * self.sxy, 0.0) if self.sxx > 0 else np.nan
+        return {
+            'b0': b0,
+            'b1': b1,
+            'r': r,
+            'r2': r**2,
+            'cov': self.sxy / (n - 1) if n > 1 else np.nan,
+            'se': np.sqrt(sse / (n - 2)) if n > 2 else np.nan,
+            'n': n
+        }
+
+def calcular_regresion(x, y):
+    """Calcula regresión lineal y métricas"""
+    reg = SumasRegresion().actualizar(x, y).resultado()
+    reg['x_min'], reg['x_max'] = np.min(x), np.max(x)
+    return reg
+
+def calcular_regresion_por_bloques(bloques):
+    """Calcula la regresión de pares (x, y) que llegan por bloques"""
+    sumas = SumasRegresion()
+    for x, y in bloques:
+        sumas.actualizar(x, y)
+    return sumas.resultado()
@@ -0,0 +1,229 @@
+"""Prueba de carga sin navegador: reproduce interacciones de estudiantes con AppTest.
+
+Cada sesión simulada abre curso.py, pasa a su página con switch_page y recorre
+su ESCENARIO (cambiar de sección en el menú lateral, mover sliders, pulsar
+botones). Así el perfil y el presupuesto de memoria de estadistica.sesion corren
+como en el servidor. AppTest vuelve a ejecutar todo el script en cada
+interacción, incluso dentro de un fragmento, así que cada paso es un rerun
+completo: los reruns de un solo fragmento no se pueden simular aquí.
+
+AppTest reemplaza el Runtime global de Streamlit en cada ejecución, de modo que
+dos AppTest no pueden correr a la vez en hilos del mismo proceso. Las sesiones
+se reparten entre varios procesos que trabajan en paralelo; dentro de cada
+proceso todas las sesiones están abiertas al mismo tiempo y avanzan por turnos,
+como los reruns que un servidor atiende con el GIL. Al final se reporta la
+latencia por rerun (p50/p95/p99) y la memoria por sesión (RSS actual, de /proc):
+
+    python -m estadistica.carga --sesiones 30
+    python -m estadistica.carga 8-intro-probabilidad.py 9-ANOVA.py --sesiones 100 --procesos 4 --salida carga.json
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from estadistica.importaciones import importar
+from estadistica.perfil import tamano_estado
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CURSO = os.path.join(RAIZ, 'curso.py')
+
+# Segundos máximos que puede tardar un rerun antes de darlo por fallido
+TIEMPO_LIMITE = 180
+PERCENTILES = (50, 95, 99)
+
+# Página -> pasos (tipo de widget, etiqueta, valor); valor None en un botón es un clic
+ESCENARIOS = {
+    '3-datos_no_agrupados.py': [
+        ('radio', '', '📊 Explorador de Datos'),
+        ('radio', '', '🔄 Comparador de Gráficos'),
+        ('radio', '', '🎲 Generador de Ejercicios y Validación'),
+    ],
+    '4-datos_agrupados.py': [
+        ('radio', 'Navegar a:', '5. Explorador de Datos Agrupados'),
+        ('slider', 'Número de Intervalos ($k$):', 5),
+        ('slider', 'Número de Intervalos ($k$):', 8),
+        ('slider', 'Número de Intervalos ($k$):', 12),
+        ('radio', 'Navegar a:', '6. Comparador de Gráficos'),
+    ],
+    '5-univariado.py': [
+        ('radio', '', '📏 Dispersión'),
+        ('radio', '', '🎮 Laboratorio'),
+        ('slider', 'Cantidad de datos:', 250),
+        ('slider', 'Cantidad de datos:', 500),
+        ('radio', '', '📦 Boxplot'),
+    ],
+    '6-Bivariado.py': [
+        ('radio', '', '📊 Gráfico de Dispersión'),
+        ('radio', '', '📈 Correlación'),
+        ('radio', '', '📉 Regresión Lineal'),
+    ],
+    '7-Tecnicas de conteo.py': [
+        ('radio', '📚 Navegar a:', '5. 🔢 Las 4 Técnicas'),
+        ('radio', '📚 Navegar a:', '8. 🧮 Calculadora Universal'),
+        ('radio', '📚 Navegar a:', '10. 📚 Tabla de Referencia'),
+    ],
+    '8-intro-probabilidad.py': [
+        ('radio', 'Ir a:', '3. 🔵 Diagramas de Venn'),
+        ('radio', 'Ir a:', '6. 🎮 Simulador de Experimentos'),
+        ('select_slider', 'Número de lanzamientos:', 1000),
+        ('button', '🎲 Realizar Simulación', None),
+        ('select_slider', 'Número de lanzamientos:', 100000),
+        ('button', '🎲 Realizar Simulación', None),
+        ('radio', 'Ir a:', '8. 🧮 Calculadora de Probabilidades'),
+    ],
+    '9-ANOVA.py': [
+        ('radio', '📌 Navegar a:', '2. 🤔 ¿Por qué no solo comparar medias?'),
+        ('slider', 'Dispersión interna de los grupos (σ)', 6.0),
+        ('slider', 'Dispersión interna de los grupos (σ)', 10.0),
+        ('radio', '📌 Navegar a:', '3. 🔬 Varianza Entre vs. Dentro'),
+        ('slider', 'Separación entre grupos (señal)', 12.0),
+        ('slider', 'Dispersión dentro de grupos (ruido)', 6.0),
+    ],
+}
+
+def rss_mb():
+    """Memoria residente actual del proceso en MB (segundo campo de /proc/self/statm, en páginas)."""
+    with open('/proc/self/statm') as archivo:
+        paginas = int(archivo.read().split()[1])
+    return paginas * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def _widget(app, tipo, etiqueta):
+    for widget in app.get(tipo):
+        if widget.label == etiqueta:
+            return widget
+    raise LookupError(f"No hay un {tipo} con la etiqueta {etiqueta!r}")
+
+def _paso(app, tipo, etiqueta, valor):
+    widget = _widget(app, tipo, etiqueta)
+    return widget.click() if tipo == 'button' else widget.set_value(valor)
+
+def _medir_run(app):
+    inicio = time.perf_counter()
+    app.run(timeout=TIEMPO_LIMITE)
+    segundos = time.perf_counter() - inicio
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return segundos
+
+def simular_grupo(paginas, repeticiones=1):
+    """Sesiones que comparten un proceso: se abren todas y avanzan un paso por turno."""
+    if not paginas:
+        raise ValueError("simular_grupo necesita al menos una página.")
+    AppTest = importar('streamlit.testing.v1').AppTest
+    # Solo errores: los avisos de Streamlit en cada rerun tapan el reporte
+    importar('streamlit.logger').set_log_level('error')
+    sesiones = []
+    for pagina in paginas:
+        app = AppTest.from_file(CURSO, default_timeout=TIEMPO_LIMITE)
+        # switch_page necesita un primer run para conocer las páginas de st.navigation;
+        # ese run carga la página de inicio y no se cuenta en las latencias
+        app.run(timeout=TIEMPO_LIMITE)
+        app.switch_page(pagina)
+        sesiones.append({'pagina': pagina, 'app': app, 'pasos': ESCENARIOS[pagina] * repeticiones,
+                         'latencias': [_medir_run(app)]})
+        if len(sesiones) == 1:
+            # Memoria del proceso con las librerías ya cargadas y una sesión abierta
+            rss_base = rss_mb()
+    for turno in range(max(len(sesion['pasos']) for sesion in sesiones)):
+        for sesion in sesiones:
+            if turno < len(sesion['pasos']):
+                _paso(sesion['app'], *sesion['pasos'][turno])
+                sesion['latencias'].append(_medir_run(sesion['app']))
+    return {
+        'rss_base_mb': rss_base,
+        'rss_final_mb': rss_mb(),
+        'sesiones': [{'pagina': sesion['pagina'], 'latencias': sesion['latencias'],
+                      'bytes_estado': tamano_estado(sesion['app'].session_state)} for sesion in sesiones],
+    }
+
+def resumen_latencias(latencias):
+    """Percentiles (en segundos) y total de reruns."""
+    valores = np.asarray(latencias)
+    resumen = {f'p{p}': float(np.percentile(valores, p)) for p in PERCENTILES}
+    resumen.update({'media': float(valores.mean()), 'maximo': float(valores.max()), 'reruns': int(valores.size)})
+    return resumen
+
+def ejecutar(paginas=None, sesiones=10, repeticiones=1, procesos=None):
+    """Corre `sesiones` sesiones simultáneas repartidas entre páginas y procesos y resume los resultados."""
+    if sesiones < 1:
+        raise ValueError("Se necesita al menos una sesión.")
+    paginas = list(paginas or ESCENARIOS)
+    procesos = max(1, min(procesos or os.cpu_count() or 1, sesiones))
+    grupos = [[paginas[i % len(paginas)] for i in range(j, sesiones, procesos)] for j in range(procesos)]
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        procesados = list(ejecutor.map(simular_grupo, grupos, [repeticiones] * procesos))
+    duracion = time.perf_counter() - inicio
+    resultados = [sesion for grupo in procesados for sesion in grupo['sesiones']]
+    # La primera sesión de cada proceso carga las librerías; el resto es lo que cuesta cada sesión extra
+    extras = sum(len(grupo['sesiones']) - 1 for grupo in procesados)
+    crecimiento = sum(grupo['rss_final_mb'] - grupo['rss_base_mb'] for grupo in procesados)
+
+    por_pagina = {}
+    for resultado in resultados:
+        por_pagina.setdefault(resultado['pagina'], []).append(resultado)
+    return {
+        'sesiones': sesiones,
+        'procesos': procesos,
+        'repeticiones': repeticiones,
+        'segundos': duracion,
+        'reruns_por_segundo': sum(len(r['latencias']) for r in resultados) / duracion,
+        'latencia': resumen_latencias([s for r in resultados for s in r['latencias']]),
+        'memoria': {
+            'rss_base_mb': max(grupo['rss_base_mb'] for grupo in procesados),
+            'rss_final_mb': max(grupo['rss_final_mb'] for grupo in procesados),
+            'rss_por_sesion_mb': crecimiento / extras if extras else None,
+            'bytes_estado_por_sesion': float(np.mean([r['bytes_estado'] for r in resultados])),
+        },
+        'paginas': {
+            pagina: dict(resumen_latencias([s for r in grupo for s in r['latencias']]),
+                         sesiones=len(grupo),
+                         bytes_estado_por_sesion=float(np.mean([r['bytes_estado'] for r in grupo])))
+            for pagina, grupo in por_pagina.items()
+        },
+    }
+
+def _imprimir(reporte):
+    lat = reporte['latencia']
+    print(f"{reporte['sesiones']} sesiones en {reporte['procesos']} procesos, "
+          f"{lat['reruns']} reruns en {reporte['segundos']:.1f} s "
+          f"({reporte['reruns_por_segundo']:.1f} reruns/s)")
+    print(f"{'página':<28}{'ses.':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'estado KB':>11}")
+    for pagina, datos in sorted(reporte['paginas'].items()):
+        print(f"{pagina:<28}{datos['sesiones']:>5}{datos['p50'] * 1000:>10.0f}{datos['p95'] * 1000:>10.0f}"
+              f"{datos['p99'] * 1000:>10.0f}{datos['bytes_estado_por_sesion'] / 1024:>11.1f}")
+    print(f"{'total':<28}{reporte['sesiones']:>5}{lat['p50'] * 1000:>10.0f}{lat['p95'] * 1000:>10.0f}"
+          f"{lat['p99'] * 1000:>10.0f}{reporte['memoria']['bytes_estado_por_sesion'] / 1024:>11.1f}")
+    memoria = reporte['memoria']
+    por_sesion = memoria['rss_por_sesion_mb']
+    print(f"RSS por proceso: {memoria['rss_base_mb']:.0f} MB con una sesión, {memoria['rss_final_mb']:.0f} MB al final"
+          + (f"; {por_sesion:.1f} MB por sesión adicional" if por_sesion is not None else ""))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Prueba de carga de las páginas del curso con AppTest.")
+    parser.add_argument('paginas', nargs='*', metavar='pagina',
+                        help=f"páginas a probar (por defecto todas): {', '.join(ESCENARIOS)}")
+    parser.add_argument('--sesiones', type=int, default=10, help="sesiones simultáneas")
+    parser.add_argument('--procesos', type=int, help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument('--repeticiones', type=int, default=1, help="veces que cada sesión repite su escenario")
+    parser.add_argument('--salida', help="archivo JSON donde guardar el reporte")
+    args = parser.parse_args()
+    desconocidas = set(args.paginas) - set(ESCENARIOS)
+    if desconocidas:
+        parser.error(f"páginas sin escenario: {', '.join(sorted(desconocidas))}")
+    if args.sesiones < 1:
+        parser.error("--sesiones debe ser al menos 1")
+    if args.procesos is not None and args.procesos < 1:
+        parser.error("--procesos debe ser al menos 1")
+    if args.repeticiones < 1:
+        parser.error("--repeticiones debe ser al menos 1")
+
+    reporte = ejecutar(args.paginas, args.sesiones, args.repeticiones, args.procesos)
+    _imprimir(reporte)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
@@ -0,0 +1,148 @@
+"""Técnicas de conteo y espacios muestrales de experimentos compuestos."""
+import math
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import product
+
+# Resultados que EspacioMuestral.contar recorre como máximo con un predicado sobre cada resultado
+MAX_RECORRIDO = 10_000_000
+
+@lru_cache(maxsize=1024)
+def factorial(n):
+    """Calcula el factorial de n"""
+    if n <= 1:
+        return 1
+    return math.factorial(n)
+
+@lru_cache(maxsize=4096)
+def permutacion(n, r):
+    """Calcula P(n,r) = n!/(n-r)! como producto n × (n-1) × ... × (n-r+1)"""
+    if r > n:
+        return 0
+    return math.perm(n, r)
+
+@lru_cache(maxsize=4096)
+def combinacion(n, r):
+    """Calcula C(n,r) = n!/(r!(n-r)!) con la fórmula multiplicativa"""
+    if r > n:
+        return 0
+    return math.comb(n, r)
+
+def combinacion_repeticion(n, r):
+    """Calcula C_r(n,r) = C(n+r-1, r)"""
+    return combinacion(n + r - 1, r)
+
+def con_reemplazo_con_orden(n, r):
+    """Calcula n^r"""
+    return n ** r
+
+@lru_cache(maxsize=64)
+def fila_pascal(n):
+    """Fila n del triángulo de Pascal: C(n,0), C(n,1), ..., C(n,n)"""
+    fila = [1]
+    for k in range(n):
+        fila.append(fila[-1] * (n - k) // (k + 1))
+    return tuple(fila)
+
+def log10_factorial(n):
+    """Calcula log10(n!) con la función log-gamma"""
+    return math.lgamma(n + 1) / math.log(10)
+
+def log10_permutacion(n, r):
+    """Calcula log10(P(n,r)) sin construir el entero"""
+    return log10_factorial(n) - log10_factorial(n - r)
+
+def log10_combinacion(n, r):
+    """Calcula log10(C(n,r)) sin construir el entero"""
+    return log10_factorial(n) - log10_factorial(r) - log10_factorial(n - r)
+
+class EspacioMuestral(Sequence):
+    """Espacio muestral de un experimento compuesto, sin construir el producto cartesiano.
+
+    Cada resultado es una tupla con un elemento de cada alfabeto, en el mismo
+    orden que itertools.product. El resultado número i se obtiene decodificando
+    i en base mixta, así que len(), el acceso por índice, los cortes, index()
+    y count() no necesitan recorrer el espacio.
+    """
+
+    def __init__(self, alfabetos):
+        self.alfabetos = [tuple(alfabeto) for alfabeto in alfabetos]
+        self.tamano = math.prod(len(alfabeto) for alfabeto in self.alfabetos)
+
+    @classmethod
+    def monedas(cls, num_monedas, caras=('C', 'S')):
+        """Espacio muestral de lanzar num_monedas monedas."""
+        return cls([caras] * num_monedas)
+
+    @classmethod
+    def dados(cls, num_dados, caras=6):
+        """Espacio muestral de lanzar num_dados dados."""
+        return cls([range(1, caras + 1)] * num_dados)
+
+    def __len__(self):
+        return self.tamano
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self.tamano))]
+        if indice < 0:
+            indice += self.tamano
+        if not 0 <= indice < self.tamano:
+            raise IndexError("índice fuera del espacio muestral")
+        resultado = []
+        for alfabeto in reversed(self.alfabetos):
+            indice, digito = divmod(indice, len(alfabeto))
+            resultado.append(alfabeto[digito])
+        return tuple(reversed(resultado))
+
+    def __iter__(self):
+        return product(*self.alfabetos)
+
+    def __contains__(self, resultado):
+        return (len(resultado) == len(self.alfabetos)
+                and all(x in alfabeto for x, alfabeto in zip(resultado, self.alfabetos)))
+
+    def index(self, resultado, inicio=0, fin=None):
+        """Índice de la primera aparición de resultado, codificándolo en base mixta."""
+        if resultado not in self:
+            raise ValueError(f"{resultado!r} no está en el espacio muestral")
+        indice = 0
+        for x, alfabeto in zip(resultado, self.alfabetos):
+            indice = indice * len(alfabeto) + alfabeto.index(x)
+        inicio, fin, _ = slice(inicio, fin).indices(self.tamano)
+        if not inicio <= indice < fin:
+            raise ValueError(f"{resultado!r} no está en el espacio muestral entre {inicio} y {fin}")
+        return indice
+
+    def count(self, resultado):
+        """Veces que aparece resultado: 0 o 1, salvo que algún alfabeto repita elementos."""
+        if resultado not in self:
+            return 0
+        return math.prod(alfabeto.count(x) for x, alfabeto in zip(resultado, self.alfabetos))
+
+    def distribucion_suma(self, valor=lambda x: x):
+        """Número de resultados por cada valor de la suma de valor(x), por convolución."""
+        conteos = {0: 1}
+        for alfabeto in self.alfabetos:
+            nuevos = {}
+            for suma, conteo in conteos.items():
+                for x in alfabeto:
+                    clave = suma + valor(x)
+                    nuevos[clave] = nuevos.get(clave, 0) + conteo
+            conteos = nuevos
+        return dict(sorted(conteos.items()))
+
+    def contar(self, predicado, valor=None, limite=MAX_RECORRIDO):
+        """Cuenta los resultados de un evento definido por un predicado.
+
+        Sin `valor`, el predicado recibe cada resultado (recorrido perezoso), y
+        solo si el espacio tiene a lo sumo `limite` resultados (None: sin límite).
+        Con `valor`, el predicado recibe la suma de valor(x) de cada resultado y
+        el conteo se hace sobre distribucion_suma, sin recorrer el espacio.
+        """
+        if valor is None:
+            if limite is not None and self.tamano > limite:
+                raise ValueError(f"El espacio tiene {self.tamano:,} resultados y recorrerlo supera el límite "
+                                 f"de {limite:,}; usa `valor` para contar por la distribución de la suma.")
+            return sum(1 for resultado in self if predicado(resultado))
+        return sum(conteo for suma, conteo in self.distribucion_suma(valor).items() if predicado(suma))
@@ -0,0 +1,53 @@
+"""Registro de datasets simulados con semilla fija, generados una sola vez por proceso.
+
+Un dataset se identifica por (nombre, semilla, tamaño). La primera vez que se
+pide se genera con np.random.default_rng(semilla) y se guarda; después se
+entrega una vista de solo lectura del mismo arreglo, sin volver a sortear ni
+copiar en cada interacción. El estado global de np.random no se toca.
+
+Los datasets que las páginas guardan con st.cache_resource siguen la misma
+regla: son un solo objeto por proceso, compartido por todas las sesiones y
+páginas, así que se entregan envueltos con solo_lectura().
+"""
+import threading
+
+import numpy as np
+
+# Nombre -> función (rng, tamaño) que genera los datos
+GENERADORES = {
+    # 1-fundamentos: población y muestra de los histogramas de pregunta()
+    'ingresos_hogares': lambda rng, n: rng.gamma(3, 950000, n),
+    'muestra_ingresos': lambda rng, n: rng.choice(obtener('ingresos_hogares', 42, 10000), n),
+    'presion_arterial': lambda rng, n: rng.normal(155, 15, n),
+    'muestra_presion': lambda rng, n: rng.choice(obtener('presion_arterial', 42, 5000), n),
+    # 3-datos_no_agrupados
+    'tiempo_reaccion': lambda rng, n: rng.normal(40, 8, n).round(1),
+    # 5-univariado: ejemplos de forma y de boxplot
+    'simetrica': lambda rng, n: rng.normal(50, 10, n),
+    'asimetrica_derecha': lambda rng, n: rng.gamma(2, 2, n) * 1000 + 2000,
+    'asimetrica_izquierda': lambda rng, n: 100 - rng.gamma(2, 2, n) * 5,
+    'caja_derecha': lambda rng, n: rng.gamma(2, 10, n),
+    'caja_izquierda': lambda rng, n: 100 - rng.gamma(2, 5, n),
+    # 6-Bivariado: ruido de los ejemplos de dispersión
+    'ruido_normal': lambda rng, n: rng.standard_normal(n),
+    'uniforme_0_10': lambda rng, n: rng.uniform(0, 10, n),
+}
+
+_DATASETS = {}
+_CANDADO = threading.RLock()
+
+def solo_lectura(arreglo):
+    """Vista de solo lectura de un arreglo (no copia los datos)."""
+    vista = np.asarray(arreglo).view()
+    vista.flags.writeable = False
+    return vista
+
+def obtener(nombre, semilla=0, tamano=100):
+    """Vista de solo lectura del dataset (nombre, semilla, tamaño), generado la primera vez."""
+    clave = (nombre, semilla, tamano)
+    with _CANDADO:
+        if clave not in _DATASETS:
+            datos = np.asarray(GENERADORES[nombre](np.random.default_rng(semilla), tamano))
+            datos.flags.writeable = False
+            _DATASETS[clave] = datos
+    return _DATASETS[clave].view()
@@ -0,0 +1,253 @@
+"""Medidas descriptivas de una variable: momentos, cuantiles y boxplot."""
+import numpy as np
+
+# Capacidad por nivel del resumen de cuantiles (exacto mientras n <= K_CUANTILES)
+K_CUANTILES = 4096
+# Semilla de las compactaciones: los mismos datos dan siempre los mismos cuantiles
+SEMILLA_CUANTILES = 0
+# Atípicos que devuelve resumen_boxplot como máximo (los gráficos envían agregados)
+MAX_ATIPICOS_GRAFICO = 500
+
+class SketchCuantiles:
+    """Resumen de cuantiles con memoria acotada que se puede combinar (compactadores tipo KLL).
+
+    El nivel h guarda valores que representan 2**h datos cada uno. Cuando un
+    nivel supera k elementos se ordena y la mitad (posiciones pares o impares,
+    al azar) sube al nivel siguiente. Mientras no haya compactaciones los
+    cuantiles son exactos e iguales a np.percentile; después son aproximados,
+    pero con la semilla fija no cambian entre reruns.
+    """
+
+    def __init__(self, k=K_CUANTILES, rng=None):
+        self.k = k
+        self.rng = np.random.default_rng(SEMILLA_CUANTILES) if rng is None else rng
+        self.niveles = [np.empty(0)]
+
+    def actualizar(self, valores):
+        self.niveles[0] = np.concatenate([self.niveles[0], np.asarray(valores, dtype=float)])
+        self._compactar()
+        return self
+
+    def combinar(self, otro):
+        for h, nivel in enumerate(otro.niveles):
+            if h == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            self.niveles[h] = np.concatenate([self.niveles[h], nivel])
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        h = 0
+        while h < len(self.niveles):
+            nivel = self.niveles[h]
+            if len(nivel) > self.k:
+                nivel = np.sort(nivel)
+                # Con longitud impar, un elemento al azar se queda en el nivel
+                sobrante = np.empty(0)
+                if len(nivel) % 2:
+                    i = self.rng.integers(len(nivel))
+                    sobrante, nivel = nivel[i:i + 1], np.delete(nivel, i)
+                promovidos = nivel[self.rng.integers(2)::2]
+                self.niveles[h] = sobrante
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                self.niveles[h + 1] = np.concatenate([self.niveles[h + 1], promovidos])
+            h += 1
+
+    def percentil(self, q):
+        """Percentil(es) q en [0, 100], como np.percentile."""
+        if len(self.niveles) == 1:
+            return np.percentile(self.niveles[0], q)
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)])
+        orden = np.argsort(valores)
+        acumulado = np.cumsum(pesos[orden])
+        posicion = np.asarray(q, dtype=float) / 100 * acumulado[-1]
+        indices = np.minimum(np.searchsorted(acumulado, posicion), len(valores) - 1)
+        return valores[orden][indices]
+
+class IndiceCuantiles:
+    """Datos ordenados una sola vez para responder consultas de posición.
+
+    Percentiles, cuartiles e IQR se obtienen en O(1) por interpolación lineal
+    (igual que np.percentile) y el rango percentil de un valor y los límites
+    de atípicos en O(log n) con búsqueda binaria.
+    """
+
+    def __init__(self, data):
+        self.ordenados = np.sort(np.asarray(data, dtype=float).ravel())
+        self.ordenados.flags.writeable = False
+        self.n = len(self.ordenados)
+
+    def percentil(self, q):
+        """Percentil(es) q en [0, 100]."""
+        posicion = np.asarray(q, dtype=float) / 100 * (self.n - 1)
+        abajo = np.floor(posicion).astype(np.int64)
+        arriba = np.minimum(abajo + 1, self.n - 1)
+        fraccion = posicion - abajo
+        return self.ordenados[abajo] + fraccion * (self.ordenados[arriba] - self.ordenados[abajo])
+
+    def cuartiles(self):
+        """Q1, Q2 y Q3."""
+        return tuple(self.percentil([25, 50, 75]))
+
+    def iqr(self):
+        q1, _, q3 = self.cuartiles()
+        return q3 - q1
+
+    def rango_percentil(self, valor):
+        """Porcentaje de datos menores o iguales a valor."""
+        return np.searchsorted(self.ordenados, valor, side='right') / self.n * 100
+
+    def limites_atipicos(self, k=1.5):
+        """Límites Q1 - k·IQR y Q3 + k·IQR de la regla del boxplot."""
+        q1, _, q3 = self.cuartiles()
+        return q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+
+    def atipicos(self, k=1.5):
+        """Datos fuera de los límites de atípicos (ordenados)."""
+        limite_inferior, limite_superior = self.limites_atipicos(k)
+        desde = np.searchsorted(self.ordenados, limite_inferior, side='left')
+        hasta = np.searchsorted(self.ordenados, limite_superior, side='right')
+        return np.concatenate([self.ordenados[:desde], self.ordenados[hasta:]])
+
+    def bigotes(self, k=1.5):
+        """Extremos de los bigotes: dato más lejano dentro de los límites de atípicos."""
+        limite_inferior, limite_superior = self.limites_atipicos(k)
+        desde = np.searchsorted(self.ordenados, limite_inferior, side='left')
+        hasta = np.searchsorted(self.ordenados, limite_superior, side='right')
+        return self.ordenados[desde], self.ordenados[hasta - 1]
+
+class AcumuladorDescriptivo:
+    """Medidas descriptivas en una pasada, por bloques y combinables entre procesos.
+
+    Guarda n, mínimo, máximo y los momentos centrales M2, M3 y M4, que se
+    actualizan con las fórmulas de Welford/Pébay, más un SketchCuantiles para
+    los percentiles (k=None lo omite, p. ej. si se usa un IndiceCuantiles).
+    """
+
+    def __init__(self, k=K_CUANTILES, rng=None):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.cuantiles = SketchCuantiles(k, rng) if k is not None else None
+
+    def actualizar(self, valores):
+        """Agrega un bloque de datos."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        if len(valores) == 0:
+            return self
+        media = valores.mean()
+        desvios = valores - media
+        cuadrados = desvios * desvios
+        self._combinar_momentos(
+            len(valores), media, cuadrados.sum(), (cuadrados * desvios).sum(),
+            (cuadrados * cuadrados).sum(), valores.min(), valores.max()
+        )
+        if self.cuantiles is not None:
+            self.cuantiles.actualizar(valores)
+        return self
+
+    def combinar(self, otro):
+        """Combina con otro acumulador (p. ej. de otro bloque o proceso); si el otro no tiene sketch, se descarta el propio."""
+        self._combinar_momentos(otro.n, otro.media, otro.m2, otro.m3, otro.m4, otro.minimo, otro.maximo)
+        if self.cuantiles is not None:
+            if otro.cuantiles is not None:
+                self.cuantiles.combinar(otro.cuantiles)
+            elif otro.n > 0:
+                # Sin los datos del otro en un sketch, los cuantiles combinados no se conocen
+                self.cuantiles = None
+        return self
+
+    def _combinar_momentos(self, nb, media_b, m2_b, m3_b, m4_b, minimo_b, maximo_b):
+        na = self.n
+        if nb == 0:
+            return
+        n = na + nb
+        delta = media_b - self.media
+        delta_n = delta / n
+        m2 = self.m2 + m2_b + delta * delta_n * na * nb
+        m3 = (self.m3 + m3_b + delta * delta_n ** 2 * na * nb * (na - nb)
+              + 3 * delta_n * (na * m2_b - nb * self.m2))
+        m4 = (self.m4 + m4_b + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * delta_n ** 2 * (na * na * m2_b + nb * nb * self.m2)
+              + 4 * delta_n * (na * m3_b - nb * self.m3))
+        self.n = n
+        self.media = self.media + delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.minimo = min(self.minimo, minimo_b)
+        self.maximo = max(self.maximo, maximo_b)
+
+    def medidas(self):
+        """Medidas con las mismas claves que calcular_medidas (la moda no se acumula)."""
+        if self.n == 0:
+            return None
+        varianza = self.m2 / (self.n - 1) if self.n > 1 else np.nan
+        desv_std = np.sqrt(varianza)
+        m2_n = self.m2 / self.n
+        if self.cuantiles is not None:
+            q1, q2, q3 = self.cuantiles.percentil([25, 50, 75])
+        else:
+            q1 = q2 = q3 = np.nan
+        return {
+            'media': self.media,
+            'mediana': q2,
+            'moda': None,
+            'rango': self.maximo - self.minimo,
+            'varianza': varianza,
+            'desv_std': desv_std,
+            'cv': (desv_std / self.media * 100) if self.media != 0 else 0,
+            'q1': q1,
+            'q2': q2,
+            'q3': q3,
+            'iqr': q3 - q1,
+            'asimetria': (self.m3 / self.n) / m2_n ** 1.5 if m2_n > 0 else np.nan,
+            'curtosis': (self.m4 / self.n) / m2_n ** 2 - 3 if m2_n > 0 else np.nan,
+            'minimo': self.minimo,
+            'maximo': self.maximo,
+            'n': self.n
+        }
+
+def calcular_medidas(data, indice=None):
+    """Calcula todas las medidas descriptivas, con cuartiles exactos (indice: IndiceCuantiles ya construido para data)"""
+    if len(data) == 0:
+        return None
+    if indice is None:
+        indice = IndiceCuantiles(data)
+    medidas = AcumuladorDescriptivo(k=None).actualizar(data).medidas()
+    # Los datos están en memoria: cuartiles exactos del índice ordenado
+    q1, q2, q3 = indice.cuartiles()
+    medidas.update({'mediana': q2, 'q1': q1, 'q2': q2, 'q3': q3, 'iqr': q3 - q1})
+    # Moda: el valor más frecuente (el menor si hay empate) en el tipo de los datos,
+    # igual que scipy.stats.mode, que era lo que usaban las páginas
+    valores, conteos = np.unique(indice.ordenados, return_counts=True)
+    moda = valores[np.argmax(conteos)]
+    tipo = np.asarray(data).dtype
+    medidas['moda'] = moda.astype(tipo) if np.issubdtype(tipo, np.number) else moda
+    return medidas
+
+def calcular_medidas_por_bloques(bloques):
+    """Calcula las medidas descriptivas de datos que llegan por bloques (sin moda; cuartiles aproximados si n > K_CUANTILES)"""
+    acumulador = AcumuladorDescriptivo()
+    for bloque in bloques:
+        acumulador.actualizar(bloque)
+    return acumulador.medidas()
+
+def resumen_boxplot(data, max_atipicos=MAX_ATIPICOS_GRAFICO, indice=None):
+    """Estadísticos de la caja calculados en el servidor (atípicos limitados a max_atipicos)"""
+    if indice is None:
+        indice = IndiceCuantiles(data)
+    q1, q2, q3 = indice.cuartiles()
+    bigote_inferior, bigote_superior = indice.bigotes()
+    atipicos = indice.atipicos()
+    if len(atipicos) > max_atipicos:
+        # Muestra repartida por posición, conservando los extremos
+        atipicos = atipicos[np.linspace(0, len(atipicos) - 1, max_atipicos).astype(np.int64)]
+    return {
+        'q1': q1, 'mediana': q2, 'q3': q3,
+        'bigote_inferior': bigote_inferior, 'bigote_superior': bigote_superior,
+        'media': np.mean(data), 'desv_std': np.std(data, ddof=1) if len(data) > 1 else 0.0,
+        'atipicos': atipicos
+    }
@@ -0,0 +1,25 @@
+"""Conversión de figuras de matplotlib a bytes para guardarlas en caché.
+
+Las páginas dibujan una figura, la convierten con figura_a_bytes() dentro de
+una función con @st.cache_data y muestran el resultado con st.image(). Así la
+figura se dibuja una sola vez por combinación de parámetros y se cierra en
+cuanto se guarda, en vez de quedar abierta en pyplot en cada interacción.
+"""
+import io
+
+from estadistica.importaciones import importar
+
+# Mismos valores que usa st.pyplot al guardar la figura
+DPI = 200
+FORMATOS = ('png', 'svg')
+
+def figura_a_bytes(fig, formato='png', dpi=DPI):
+    """Guarda la figura en memoria (PNG o SVG), la cierra y devuelve los bytes."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato!r}. Usa uno de {FORMATOS}.")
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight')
+    finally:
+        importar('matplotlib.pyplot').close(fig)
+    return buffer.getvalue()
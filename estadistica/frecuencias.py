@@ -0,0 +1,87 @@
+"""Tablas de frecuencia para datos no agrupados (nominales, ordinales y discretos)."""
+import numpy as np
+import pandas as pd
+
+class AcumuladorFrecuencias:
+    """Conteos de frecuencia que se llenan por bloques y se combinan entre particiones.
+
+    Cada categoría recibe un código entero (mapa categoría -> código) y cada
+    bloque se cuenta con np.bincount sobre esos códigos, sin tener toda la Serie
+    en memoria. Si order es una lista, las categorías quedan fijas en ese orden y
+    los valores fuera de ella solo cuentan en N (igual que pd.Categorical).
+    """
+
+    def __init__(self, order=None):
+        self.order = order
+        self.categorias = list(order) if isinstance(order, list) else []
+        self.codigos = {categoria: i for i, categoria in enumerate(self.categorias)}
+        self.conteos = np.zeros(len(self.categorias), dtype=np.int64)
+        self.n = 0
+
+    def _codigo(self, categoria):
+        """Código de la categoría (-1 si no pertenece a un orden fijo)."""
+        if categoria not in self.codigos:
+            if isinstance(self.order, list):
+                return -1
+            self.codigos[categoria] = len(self.categorias)
+            self.categorias.append(categoria)
+        return self.codigos[categoria]
+
+    def _sumar(self, codigos, conteos):
+        """Suma conteos a los códigos indicados, ampliando el arreglo si hay categorías nuevas."""
+        if len(self.conteos) < len(self.categorias):
+            self.conteos = np.concatenate([self.conteos, np.zeros(len(self.categorias) - len(self.conteos), dtype=np.int64)])
+        validos = codigos >= 0
+        np.add.at(self.conteos, codigos[validos], conteos[validos])
+
+    def actualizar(self, valores):
+        """Agrega un bloque de observaciones (los valores vacíos solo cuentan en N)."""
+        self.n += len(valores)
+        codigos_bloque, unicos = pd.factorize(pd.Series(valores))
+        conteos_bloque = np.bincount(codigos_bloque[codigos_bloque >= 0], minlength=len(unicos))
+        self._sumar(np.array([self._codigo(u) for u in unicos], dtype=np.int64), conteos_bloque)
+        return self
+
+    def combinar(self, otro):
+        """Combina con los conteos de otro acumulador (p. ej. de otro archivo o proceso)."""
+        self.n += otro.n
+        self._sumar(np.array([self._codigo(c) for c in otro.categorias], dtype=np.int64), otro.conteos)
+        return self
+
+    def frecuencias(self):
+        """Frecuencias absolutas como Serie, en el orden de la tabla."""
+        if isinstance(self.order, list):
+            indice = pd.CategoricalIndex(self.categorias, categories=self.order, ordered=True)
+            return pd.Series(self.conteos, index=indice, name='count')
+        return pd.Series(self.conteos, index=pd.Index(self.categorias), name='count').sort_index()
+
+    def tabla(self):
+        """Tabla de frecuencia completa con las mismas columnas que generar_tabla_frecuencia."""
+        df = pd.DataFrame({'Frecuencia Absoluta': self.frecuencias()})
+        N = self.n
+
+        # 1. Frecuencia Acumulada
+        df['Frecuencia Acumulada'] = df['Frecuencia Absoluta'].cumsum()
+        # 2. Frecuencia Relativa
+        df['Frecuencia Relativa'] = df['Frecuencia Absoluta'] / N
+        # 3. Frecuencia Relativa Acumulada
+        df['Frecuencia Relativa Acumulada'] = df['Frecuencia Acumulada'] / N
+        # 4. Porcentaje
+        df['Porcentaje (%)'] = df['Frecuencia Relativa'] * 100
+
+        df = df.reset_index()
+        df = df.rename(columns={df.columns[0]: 'Clase/Categoría'})
+        return df
+
+def generar_tabla_frecuencia(data, order=None):
+    """Genera una DataFrame de tabla de frecuencia completa con orden de columnas corregido."""
+    if data is None or data.empty:
+        return pd.DataFrame()
+    return AcumuladorFrecuencias(order).actualizar(data).tabla()
+
+def generar_tabla_frecuencia_por_bloques(bloques, order=None):
+    """Genera la tabla de frecuencia de datos que llegan por bloques (archivos, particiones)."""
+    acumulador = AcumuladorFrecuencias(order)
+    for bloque in bloques:
+        acumulador.actualizar(bloque)
+    return acumulador.tabla()
@@ -0,0 +1,49 @@
+"""Importación diferida de librerías pesadas y reporte de cuánto cuesta cada una.
+
+Las páginas importan scipy, matplotlib o matplotlib_venn con importar() dentro
+de la rama que las usa, así que una sesión solo paga las que realmente
+necesita. Lo que tarda cada primera importación queda en TIEMPOS y el perfil
+(estadistica.perfil) lo registra en el rerun que la provocó. Para ver el costo
+en frío de cada librería:
+
+    python -m estadistica.importaciones
+"""
+import importlib
+import subprocess
+import sys
+import time
+
+# Librerías que las páginas cargan y que tardan en importarse
+PESADAS = (
+    'numpy', 'pandas', 'plotly.graph_objects', 'plotly.express',
+    'scipy.stats', 'matplotlib.pyplot', 'matplotlib_venn', 'streamlit'
+)
+
+# Módulo -> segundos que tardó su primera importación en este proceso
+TIEMPOS = {}
+
+def importar(nombre):
+    """Importa un módulo la primera vez que se pide y anota cuánto tardó."""
+    if nombre in sys.modules:
+        # import_module espera si otra sesión (otro hilo) aún está inicializando el módulo
+        return importlib.import_module(nombre)
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nombre)
+    TIEMPOS.setdefault(nombre, time.perf_counter() - inicio)
+    return modulo
+
+def tiempo_en_frio(nombre):
+    """Segundos que tarda importar el módulo en un intérprete nuevo."""
+    codigo = (f"import time; inicio = time.perf_counter(); import {nombre}; "
+              f"print(time.perf_counter() - inicio)")
+    salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+    return float(salida.stdout.strip())
+
+def reporte_importaciones(modulos=PESADAS):
+    """Tiempo de importación en frío de cada módulo, del más lento al más rápido."""
+    tiempos = {nombre: tiempo_en_frio(nombre) for nombre in modulos}
+    return dict(sorted(tiempos.items(), key=lambda par: par[1], reverse=True))
+
+if __name__ == '__main__':
+    for nombre, segundos in reporte_importaciones(sys.argv[1:] or PESADAS).items():
+        print(f"{nombre:<24}{segundos * 1000:>9.1f} ms")
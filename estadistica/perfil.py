@@ -0,0 +1,224 @@
+"""Perfil opcional de cada rerun: tiempos por página, sección y función, primeras
+importaciones hechas con importar(), bytes de los gráficos enviados al
+navegador y tamaño de st.session_state.
+
+Se activa con la variable de entorno ESTADISTICA_PERFIL, que indica el archivo
+de salida. Con extensión .prom se reescriben los agregados en el formato de
+texto de Prometheus; con cualquier otra se agrega una línea JSON por rerun:
+
+    ESTADISTICA_PERFIL=perfil.jsonl streamlit run curso.py
+    ESTADISTICA_PERFIL=perfil.prom streamlit run curso.py
+
+curso.py mide cada rerun con rerun(); las páginas marcan la sección elegida
+con seccion(), envuelven sus funciones pesadas con medido() justo después de
+importarlas (f = perfil.medido(f), así se registra su tiempo) y declaran sus
+fragmentos con fragmento() para que los reruns de un solo fragmento, que no
+pasan por curso.py, también se midan. Sin la variable de entorno medido()
+devuelve la misma función y lo demás no hace nada.
+"""
+import functools
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from estadistica.importaciones import TIEMPOS, importar
+
+RUTA = os.environ.get('ESTADISTICA_PERFIL', '')
+ACTIVO = bool(RUTA)
+PROMETHEUS = RUTA.endswith('.prom')
+
+# Rerun en curso de cada hilo (Streamlit ejecuta cada sesión en su propio hilo)
+_LOCAL = threading.local()
+_CANDADO = threading.Lock()
+
+# (métrica, etiquetas) -> [conteo, suma, máximo] para el archivo de Prometheus
+AGREGADOS = {}
+
+# Métrica -> texto de # HELP en el archivo de Prometheus
+AYUDAS = {
+    'rerun_segundos': 'Segundos de cada rerun',
+    'grafico_bytes': 'Bytes de gráficos enviados al navegador en cada rerun',
+    'estado_bytes': 'Bytes de st.session_state al terminar cada rerun',
+    'llamada_segundos': 'Segundos por rerun de cada función medida',
+    'importacion_segundos': 'Segundos de la primera importación de cada módulo',
+}
+
+# Sufijo de cada serie agregada -> tipo de Prometheus
+TIPOS = (('count', 'counter'), ('sum', 'counter'), ('max', 'gauge'))
+
+def _actual():
+    return getattr(_LOCAL, 'rerun', None)
+
+def tamano_valor(valor):
+    """Bytes aproximados de un valor (su pickle, o sys.getsizeof si no se puede serializar)."""
+    try:
+        return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(valor)
+
+def tamano_estado(estado):
+    """Bytes aproximados de st.session_state (pickle de cada valor)."""
+    return sum(tamano_valor(estado[clave]) for clave in list(estado.keys()))
+
+@contextmanager
+def rerun(pagina, estado=None):
+    """Mide un rerun completo de la página y lo exporta al terminar (estado: st.session_state)."""
+    if not ACTIVO:
+        yield None
+        return
+    datos = {'pagina': pagina, 'seccion': None, 'fragmento': None, 'llamadas': {}, 'graficos': 0, 'bytes_graficos': 0}
+    _LOCAL.rerun = datos
+    importados = set(TIEMPOS)
+    inicio = time.perf_counter()
+    try:
+        yield datos
+    finally:
+        datos['segundos'] = time.perf_counter() - inicio
+        # Módulos que importar() cargó por primera vez en el proceso durante este rerun
+        datos['importaciones'] = {m: s for m, s in list(TIEMPOS.items()) if m not in importados}
+        if estado is not None:
+            datos['bytes_estado'] = tamano_estado(estado)
+        _LOCAL.rerun = None
+        exportar(datos)
+
+def seccion(nombre):
+    """Anota la sección de la página (la opción del menú lateral) que se está mostrando."""
+    datos = _actual()
+    if datos is not None:
+        datos['seccion'] = nombre
+
+def anotar_llamada(nombre, segundos):
+    datos = _actual()
+    if datos is not None:
+        conteo, suma = datos['llamadas'].get(nombre, (0, 0.0))
+        datos['llamadas'][nombre] = (conteo + 1, suma + segundos)
+
+def anotar_grafico(num_bytes):
+    datos = _actual()
+    if datos is not None:
+        datos['graficos'] += 1
+        datos['bytes_graficos'] += num_bytes
+
+def medido(funcion):
+    """Decorador que suma el tiempo de cada llamada al rerun en curso (solo con el perfil activo)."""
+    if not ACTIVO:
+        return funcion
+    nombre = getattr(funcion, '__name__', repr(funcion))
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            anotar_llamada(nombre, time.perf_counter() - inicio)
+    return envoltura
+
+def rerun_de_fragmento():
+    """True si Streamlit está volviendo a ejecutar solo fragmentos (curso.py no corre)."""
+    ctx = importar('streamlit.runtime.scriptrunner').get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+def fragmento(funcion):
+    """st.fragment cuyos reruns propios se miden como un rerun de la página que lo define.
+
+    En un rerun completo el fragmento corre dentro del rerun() de curso.py; cuando
+    solo se vuelve a ejecutar el fragmento, el rerun() se abre aquí con la página
+    y la sección que había al definirlo, y al terminar se aplica el presupuesto
+    de memoria de la sesión igual que en curso.py.
+    """
+    st = importar('streamlit')
+    datos = _actual()
+    pagina, seccion_pagina = (datos['pagina'], datos['seccion']) if datos else (funcion.__module__, None)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not rerun_de_fragmento():
+            return funcion(*args, **kwargs)
+        with rerun(pagina, st.session_state) as datos_fragmento:
+            if datos_fragmento is not None:
+                datos_fragmento.update(seccion=seccion_pagina, fragmento=funcion.__name__)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                # estadistica.sesion importa este módulo: se carga al usarlo
+                importar('estadistica.sesion').aplicar_presupuesto(st.session_state)
+    return st.fragment(envoltura)
+
+def _bytes_plotly(figura):
+    return len(figura.to_json()) if hasattr(figura, 'to_json') else len(json.dumps(figura, default=str))
+
+def _bytes_imagen(imagen):
+    if isinstance(imagen, (bytes, bytearray)):
+        return len(imagen)
+    return getattr(imagen, 'nbytes', 0)
+
+def instrumentar_streamlit():
+    """Cuenta los bytes de cada st.plotly_chart y st.image (una sola vez por proceso)."""
+    if not ACTIVO:
+        return
+    st = importar('streamlit')
+    DeltaGenerator = importar('streamlit.delta_generator').DeltaGenerator
+    if getattr(DeltaGenerator, '_perfil_instrumentado', False):
+        return
+    for metodo, medir_bytes in (('plotly_chart', _bytes_plotly), ('image', _bytes_imagen)):
+        original = getattr(DeltaGenerator, metodo)
+
+        def envoltura(self, datos, *args, _original=original, _medir=medir_bytes, **kwargs):
+            anotar_grafico(_medir(datos))
+            return _original(self, datos, *args, **kwargs)
+        setattr(DeltaGenerator, metodo, functools.wraps(original)(envoltura))
+        # st.plotly_chart y st.image quedaron ligados al método original al importar streamlit
+        setattr(st, metodo, getattr(st._main, metodo))
+    DeltaGenerator._perfil_instrumentado = True
+
+def _agregar(metrica, etiquetas, valor):
+    clave = (metrica, tuple(sorted(etiquetas.items())))
+    conteo, suma, maximo = AGREGADOS.get(clave, (0, 0.0, valor))
+    AGREGADOS[clave] = (conteo + 1, suma + valor, max(maximo, valor))
+
+def _escapar_etiqueta(valor):
+    """Valor de etiqueta de Prometheus: escapa la barra invertida, el salto de línea y las comillas."""
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def texto_prometheus():
+    """Agregados en el formato de texto de Prometheus: familias _count, _sum y _max por métrica."""
+    series = {}
+    for (metrica, etiquetas), valores in sorted(AGREGADOS.items()):
+        texto = ','.join(f'{k}="{_escapar_etiqueta(v)}"' for k, v in etiquetas)
+        series.setdefault(metrica, []).append((texto, valores))
+    lineas = []
+    for metrica, filas in series.items():
+        for i, (sufijo, tipo) in enumerate(TIPOS):
+            nombre = f'estadistica_{metrica}_{sufijo}'
+            lineas.append(f'# HELP {nombre} {AYUDAS.get(metrica, metrica)} ({sufijo})')
+            lineas.append(f'# TYPE {nombre} {tipo}')
+            lineas.extend(f'{nombre}{{{texto}}} {valores[i]:.9g}' for texto, valores in filas)
+    return '\n'.join(lineas) + '\n'
+
+def exportar(datos):
+    """Guarda un rerun: agrega una línea JSONL o reescribe el archivo de Prometheus."""
+    with _CANDADO:
+        if not PROMETHEUS:
+            linea = dict(datos, fecha=time.time(),
+                         llamadas={k: {'n': n, 'segundos': s} for k, (n, s) in datos['llamadas'].items()})
+            with open(RUTA, 'a', encoding='utf-8') as archivo:
+                archivo.write(json.dumps(linea, ensure_ascii=False) + '\n')
+            return
+        etiquetas = {'pagina': datos['pagina'], 'seccion': datos['seccion'] or '', 'fragmento': datos['fragmento'] or ''}
+        _agregar('rerun_segundos', etiquetas, datos['segundos'])
+        _agregar('grafico_bytes', etiquetas, datos['bytes_graficos'])
+        if 'bytes_estado' in datos:
+            _agregar('estado_bytes', {'pagina': datos['pagina']}, datos['bytes_estado'])
+        for nombre, (conteo, suma) in datos['llamadas'].items():
+            _agregar('llamada_segundos', dict(etiquetas, funcion=nombre), suma)
+        for modulo, segundos in datos.get('importaciones', {}).items():
+            _agregar('importacion_segundos', {'pagina': datos['pagina'], 'modulo': modulo}, segundos)
+        temporal = RUTA + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto_prometheus())
+        os.replace(temporal, RUTA)
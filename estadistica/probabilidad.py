@@ -0,0 +1,53 @@
+"""Simulación de experimentos aleatorios (monedas, dados, ruletas) con memoria constante."""
+import numpy as np
+
+def simular_lanzamientos(tipo, num_elementos, num_lanzamientos, rng=None):
+    """Simula lanzamientos de monedas o dados de forma vectorizada.
+
+    Devuelve un arreglo de enteros de forma (num_lanzamientos, num_elementos).
+    Para monedas: 0 = Cara (C) y 1 = Sello (S). Para dados: caras de 1 a 6.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    forma = (num_lanzamientos, num_elementos)
+    if tipo == "Moneda":
+        return rng.integers(0, 2, size=forma, dtype=np.uint8)
+    elif tipo == "Dado":
+        return rng.integers(1, 7, size=forma, dtype=np.uint8)
+    return np.empty(forma, dtype=np.uint8)
+
+# Tamaño de bloque de la simulación y número de puntos enviados al gráfico
+TAM_BLOQUE = 1_000_000
+PUNTOS_GRAFICO = 2000
+
+def indices_submuestreo(n, num_puntos=PUNTOS_GRAFICO):
+    """Posiciones (de 1 a n) a graficar: mezcla de puntos log-espaciados y uniformes."""
+    mitad = max(num_puntos // 2, 2)
+    puntos = np.concatenate([np.geomspace(1, n, mitad), np.linspace(1, n, mitad)])
+    return np.unique(np.rint(puntos).astype(np.int64))
+
+def simular_convergencia(generar_bloque, num_lanzamientos, num_categorias,
+                         tam_bloque=TAM_BLOQUE, num_puntos=PUNTOS_GRAFICO, rng=None):
+    """Simula por bloques la frecuencia relativa acumulada con memoria constante.
+
+    `generar_bloque(rng, m)` devuelve (aciertos, categorias) para m lanzamientos.
+    Retorna las posiciones submuestreadas, la frecuencia relativa en esas
+    posiciones y el conteo total por categoría.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    x = indices_submuestreo(num_lanzamientos, num_puntos)
+    y = np.empty(len(x))
+    conteo = np.zeros(num_categorias, dtype=np.int64)
+    aciertos_previos = 0
+    for inicio in range(0, num_lanzamientos, tam_bloque):
+        m = min(tam_bloque, num_lanzamientos - inicio)
+        aciertos, categorias = generar_bloque(rng, m)
+        acumulados = np.cumsum(aciertos, dtype=np.int64)
+        # Puntos del gráfico que caen dentro de este bloque
+        desde, hasta = np.searchsorted(x, [inicio, inicio + m], side='right')
+        x_bloque = x[desde:hasta]
+        y[desde:hasta] = (aciertos_previos + acumulados[x_bloque - inicio - 1]) / x_bloque
+        aciertos_previos += int(acumulados[-1])
+        conteo += np.bincount(categorias, minlength=num_categorias)
+    return x, y, conteo
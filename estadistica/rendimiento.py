@@ -0,0 +1,194 @@
+"""Pruebas de rendimiento de los núcleos de cálculo para tamaños de 10^2 a 10^8.
+
+Cada caso se mide sin Streamlit: tiempo de reloj (el mejor de varias
+repeticiones), pico de memoria y bloques de memoria que quedan asignados
+según tracemalloc. Los resultados se guardan en JSON y se pueden comparar
+con una base guardada antes para detectar regresiones:
+
+    python -m estadistica.rendimiento --salida base.json
+    python -m estadistica.rendimiento --base base.json --salida actual.json
+
+Con --base el proceso termina con código 1 si algún caso empeoró más que la
+tolerancia. Por defecto se mide hasta 10^6; --max-exponente 8 hace el barrido
+completo (necesita varios GB de memoria).
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from estadistica.agrupadas import generar_tabla_agrupada
+from estadistica.anova import compute_anova
+from estadistica.bivariada import calcular_regresion
+from estadistica.conteo import factorial, permutacion, combinacion, log10_combinacion
+from estadistica.descriptiva import calcular_medidas
+from estadistica.frecuencias import generar_tabla_frecuencia
+from estadistica.probabilidad import simular_lanzamientos
+
+VERSION_FORMATO = 1
+
+# Tamaños de 10^MIN_EXPONENTE a 10^max_exponente
+MIN_EXPONENTE = 2
+MAX_EXPONENTE = 6
+
+# Repeticiones: se repite hasta sumar TIEMPO_MINIMO segundos o MAX_REPETICIONES
+TIEMPO_MINIMO = 0.2
+MAX_REPETICIONES = 7
+
+# Una medición empeora si supera a la base en más de esta fracción (el tiempo
+# varía bastante entre ejecuciones; el pico de memoria casi nada)...
+TOLERANCIA = 0.5
+TOLERANCIA_MEMORIA = 0.1
+# ...y por más de este margen absoluto (los tiempos muy cortos son ruidosos)
+MARGEN_SEGUNDOS = 1e-3
+MARGEN_BYTES = 64 * 1024
+
+# r de las técnicas de conteo exactas: el resultado tiene unos r·log10(n) dígitos
+R_CONTEO = 100
+
+def _normales(n, rng):
+    return (rng.normal(50, 10, n),)
+
+def _regresion(n, rng):
+    x = rng.uniform(0, 10, n)
+    return x, 2.5 * x + 3 + rng.normal(0, 2, n)
+
+def _grupos(n, rng):
+    tam = max(n // 4, 2)
+    return ([rng.normal(media, 5, tam) for media in (70, 72, 75, 78)],)
+
+def _categorias(n, rng):
+    return (pd.Series(rng.integers(1, 7, n)),)
+
+# Nombre -> (función a medir, preparar(n, rng) -> argumentos, exponente máximo)
+# Las funciones de conteo se miden sin su lru_cache (__wrapped__).
+CASOS = {
+    'calcular_medidas': (calcular_medidas, _normales, 8),
+    'generar_tabla_agrupada': (generar_tabla_agrupada, _normales, 8),
+    'generar_tabla_frecuencia': (generar_tabla_frecuencia, _categorias, 8),
+    'calcular_regresion': (calcular_regresion, _regresion, 8),
+    'compute_anova': (compute_anova, _grupos, 8),
+    'simular_lanzamientos': (simular_lanzamientos, lambda n, rng: ("Dado", 2, n, rng), 8),
+    'factorial': (factorial.__wrapped__, lambda n, rng: (n,), 5),
+    'permutacion': (permutacion.__wrapped__, lambda n, rng: (n, min(R_CONTEO, n)), 8),
+    'combinacion': (combinacion.__wrapped__, lambda n, rng: (n, min(R_CONTEO, n)), 8),
+    'log10_combinacion': (log10_combinacion, lambda n, rng: (n, n // 2), 8),
+}
+
+def medir_tiempo(funcion, argumentos, tiempo_minimo=TIEMPO_MINIMO, max_repeticiones=MAX_REPETICIONES):
+    """Mejor tiempo de reloj de varias repeticiones y número de repeticiones hechas."""
+    tiempos = []
+    while len(tiempos) < max_repeticiones and sum(tiempos) < tiempo_minimo:
+        inicio = time.perf_counter()
+        funcion(*argumentos)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), len(tiempos)
+
+def medir_memoria(funcion, argumentos):
+    """Pico de memoria (bytes) y bloques/bytes que siguen asignados tras una ejecución."""
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.take_snapshot()
+        inicial = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        resultado = funcion(*argumentos)
+        pico = tracemalloc.get_traced_memory()[1] - inicial
+        diferencias = tracemalloc.take_snapshot().compare_to(antes, 'filename')
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return {
+        'pico_bytes': pico,
+        'bloques': sum(d.count_diff for d in diferencias),
+        'bytes_retenidos': sum(d.size_diff for d in diferencias),
+    }
+
+def calentar(nombre, n=10 ** MIN_EXPONENTE):
+    """Ejecuta el caso una vez con pocos datos: las importaciones diferidas (scipy) no cuentan en la medición."""
+    funcion, preparar, _ = CASOS[nombre]
+    funcion(*preparar(n, np.random.default_rng()))
+
+def medir(nombre, n, semilla=0):
+    """Mide un caso de CASOS con n datos."""
+    funcion, preparar, _ = CASOS[nombre]
+    argumentos = preparar(n, np.random.default_rng(semilla))
+    segundos, repeticiones = medir_tiempo(funcion, argumentos)
+    return {'caso': nombre, 'n': n, 'segundos': segundos, 'repeticiones': repeticiones,
+            **medir_memoria(funcion, argumentos)}
+
+def ejecutar(casos=None, max_exponente=MAX_EXPONENTE, min_exponente=MIN_EXPONENTE, reporte=None):
+    """Mide los casos pedidos en cada tamaño 10^e (hasta el exponente máximo de cada caso)."""
+    resultados = []
+    for nombre in casos or CASOS:
+        tope = min(max_exponente, CASOS[nombre][2])
+        calentar(nombre)
+        for exponente in range(min_exponente, tope + 1):
+            resultado = medir(nombre, 10 ** exponente)
+            resultados.append(resultado)
+            if reporte:
+                reporte(resultado)
+    return {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'plataforma': platform.platform(), 'procesador': platform.processor() or platform.machine(),
+        },
+        'resultados': resultados,
+    }
+
+def comparar(actual, base, tolerancia=TOLERANCIA, tolerancia_memoria=TOLERANCIA_MEMORIA):
+    """Casos que empeoraron respecto a la base en tiempo o en pico de memoria."""
+    referencia = {(r['caso'], r['n']): r for r in base['resultados']}
+    regresiones = []
+    for r in actual['resultados']:
+        anterior = referencia.get((r['caso'], r['n']))
+        if anterior is None:
+            continue
+        for medida, fraccion, margen in (('segundos', tolerancia, MARGEN_SEGUNDOS),
+                                         ('pico_bytes', tolerancia_memoria, MARGEN_BYTES)):
+            limite = max(anterior[medida] * (1 + fraccion), anterior[medida] + margen)
+            if r[medida] > limite:
+                regresiones.append({'caso': r['caso'], 'n': r['n'], 'medida': medida,
+                                    'base': anterior[medida], 'actual': r[medida],
+                                    'razon': r[medida] / anterior[medida] if anterior[medida] else float('inf')})
+    return regresiones
+
+def _imprimir(resultado):
+    print(f"{resultado['caso']:<26}{resultado['n']:>11,}{resultado['segundos'] * 1000:>12.3f} ms"
+          f"{resultado['pico_bytes'] / 2**20:>11.1f} MB{resultado['bloques']:>8}", flush=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rendimiento de los núcleos de estadistica.")
+    parser.add_argument('casos', nargs='*', metavar='caso',
+                        help=f"casos a medir (por defecto todos): {', '.join(CASOS)}")
+    parser.add_argument('--max-exponente', type=int, default=MAX_EXPONENTE)
+    parser.add_argument('--min-exponente', type=int, default=MIN_EXPONENTE)
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--base', help="JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    parser.add_argument('--tolerancia-memoria', type=float, default=TOLERANCIA_MEMORIA)
+    args = parser.parse_args()
+    desconocidos = set(args.casos) - set(CASOS)
+    if desconocidos:
+        parser.error(f"casos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    actual = ejecutar(args.casos, args.max_exponente, args.min_exponente, reporte=_imprimir)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, indent=2)
+    if args.base:
+        with open(args.base, encoding='utf-8') as archivo:
+            regresiones = comparar(actual, json.load(archivo), args.tolerancia, args.tolerancia_memoria)
+        for r in regresiones:
+            print(f"REGRESIÓN {r['caso']} n={r['n']:,} {r['medida']}: "
+                  f"{r['base']:.6g} -> {r['actual']:.6g} (x{r['razon']:.2f})")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a la base.")
@@ -0,0 +1,74 @@
+"""Estado compacto de cada sesión y presupuesto de memoria por usuario.
+
+Las páginas guardan en st.session_state solo lo necesario para reconstruir un
+ejercicio (una semilla o un índice del banco de problemas) y las respuestas de
+los cuestionarios en arreglos int8 de tamaño fijo, con SIN_RESPONDER en las
+preguntas que faltan.
+
+curso.py llama a aplicar_presupuesto() al final de cada rerun, y
+perfil.fragmento() al final de los reruns de un solo fragmento, que no pasan
+por curso.py. Si el estado supera PRESUPUESTO_BYTES se liberan las claves de
+DESALOJABLES (una tabla fija, común a todas las sesiones), de la más grande a
+la más pequeña, hasta quedar bajo el límite:
+
+    ESTADISTICA_PRESUPUESTO_SESION=8192 streamlit run curso.py
+"""
+import os
+import sys
+from types import MappingProxyType
+
+import numpy as np
+
+from estadistica.perfil import tamano_valor
+
+# Bytes de st.session_state permitidos por sesión
+PRESUPUESTO_BYTES = int(os.environ.get('ESTADISTICA_PRESUPUESTO_SESION', 32 * 1024))
+
+SIN_RESPONDER = -1
+
+def respuestas(estado, clave, n):
+    """Arreglo int8 de n respuestas en estado[clave]; se crea (sin responder) si falta o cambió de tamaño."""
+    arreglo = estado.get(clave)
+    if not isinstance(arreglo, np.ndarray) or arreglo.shape != (n,):
+        arreglo = np.full(n, SIN_RESPONDER, dtype=np.int8)
+        estado[clave] = arreglo
+    return arreglo
+
+def _borrar(estado, clave):
+    del estado[clave]
+
+def _reiniciar_quiz(estado, clave):
+    # Sin respuestas guardadas se vuelve a mostrar el cuestionario
+    del estado[clave]
+    estado['quiz_enviado'] = False
+
+# Clave -> función (estado, clave) que la libera
+DESALOJABLES = MappingProxyType({
+    'quiz_respuestas': _borrar,           # 5-univariado
+    'ejercicio_conteo': _borrar,          # 7-Tecnicas de conteo
+    'respuestas_quiz': _reiniciar_quiz,   # 7-Tecnicas de conteo
+})
+
+def tamano(valor):
+    """Bytes aproximados de un valor: nbytes de los arreglos, sys.getsizeof de los escalares y el pickle del resto."""
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if valor is None or isinstance(valor, (bool, int, float, str, bytes)):
+        return sys.getsizeof(valor)
+    return tamano_valor(valor)
+
+def aplicar_presupuesto(estado, presupuesto=PRESUPUESTO_BYTES):
+    """Libera claves desalojables, las más grandes primero, mientras el estado supere el presupuesto."""
+    claves = list(estado.keys())
+    if not any(clave in DESALOJABLES for clave in claves):
+        return []
+    tamanos = {clave: tamano(estado[clave]) for clave in claves}
+    total = sum(tamanos.values())
+    desalojadas = []
+    for clave in sorted((c for c in tamanos if c in DESALOJABLES), key=tamanos.get, reverse=True):
+        if total <= presupuesto:
+            break
+        DESALOJABLES[clave](estado, clave)
+        total -= tamanos[clave]
+        desalojadas.append(clave)
+    return desalojadas